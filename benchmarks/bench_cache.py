@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Compare cold (parse) and warm (binary cache) loading of the ENZYME database with the previous JSON cache.
+
+Run with ``python benchmarks/bench_cache.py [enzyme.dat]``.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bio2bel_expasy.parser.cache import cache_statistics, read_cache, write_cache
+from bio2bel_expasy.parser.database import iter_expasy_database
+from bio2bel_expasy.parser.records import ExpasyEntry
+from synthetic import write_synthetic_release
+
+
+def _time(label, function, path=None):
+    start = time.perf_counter()
+    rv = function()
+    elapsed = time.perf_counter() - start
+    size = f'{os.path.getsize(path) / 2 ** 20:>6.1f} MiB on disk' if path else ''
+    print(f'{label:<14} {elapsed * 1000:>8.1f} ms {size}')
+    return rv
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        _, path = write_synthetic_release()
+
+    directory = tempfile.mkdtemp()
+    cache_path = os.path.join(directory, 'enzyme.cache')
+    json_path = os.path.join(directory, 'enzyme.json')
+
+    entries = _time('parse (cold)', lambda: list(iter_expasy_database(path=path)))
+
+    write_cache(cache_path, path, [entry.__getstate__() for entry in entries])
+    with open(json_path, 'w') as file:
+        json.dump({entry.expasy_id: entry.to_dict() for entry in entries}, file, indent=2, sort_keys=True)
+
+    def _load_json():
+        with open(json_path) as file:
+            return [ExpasyEntry.from_dict(data) for data in json.load(file).values()]
+
+    _time('json', _load_json, json_path)
+    _time('cache (warm)', lambda: [ExpasyEntry.from_state(state) for state in read_cache(cache_path, path)],
+          cache_path)
+    print(dict(cache_statistics))
+
+
+if __name__ == '__main__':
+    main()
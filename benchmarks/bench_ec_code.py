@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""Compare finding the parents of EC codes with :class:`ECCode` versus the previous string manipulation.
+
+Run with ``python benchmarks/bench_ec_code.py``.
+"""
+
+import random
+import timeit
+from operator import attrgetter
+
+from bio2bel_expasy.ec_code import ECCode
+
+
+def _normalize(expasy_id):
+    return expasy_id.replace(' ', '')
+
+
+def give_edge_strings(head_str):
+    """Find the parent of an EC code the way the tree parser used to."""
+    head_str = _normalize(head_str)
+    nums = head_str.split('.')
+    for i, obj in enumerate(nums):
+        nums[i] = obj.strip()
+
+    while '-' in nums:
+        nums.remove('-')
+
+    level = len(nums)
+
+    if level == 1:
+        return level, None, '{}.-.-.-'.format(nums[0])
+    if level == 2:
+        return level, _normalize('{}. -. -.-'.format(nums[0])), _normalize('{}.{:>2}. -.-'.format(nums[0], nums[1]))
+    if level == 3:
+        return (
+            level,
+            _normalize('{}.{:>2}. -.-'.format(nums[0], nums[1])),
+            _normalize('{}.{:>2}.{:>2}.-'.format(nums[0], nums[1], nums[2])),
+        )
+    return (
+        level,
+        _normalize('{}.{:>2}.{:>2}.-'.format(nums[0], nums[1], nums[2])),
+        _normalize('{}.{:>2}.{:>2}.{}'.format(nums[0], nums[1], nums[2], nums[3])),
+    )
+
+
+def main():
+    """Run the benchmark."""
+    rng = random.Random(0)
+    codes = [
+        f'{rng.randint(1, 7)}.{rng.randint(1, 20)}.{rng.randint(1, 20)}.{rng.randint(1, 400)}'
+        for _ in range(100_000)
+    ]
+    number = 5
+
+    strings = timeit.timeit(lambda: [give_edge_strings(code) for code in codes], number=number) / number
+    cold = timeit.timeit(lambda: [ECCode(code).parent for code in codes], number=1)
+    warm = timeit.timeit(lambda: [ECCode(code).parent for code in codes], number=number) / number
+    parsed = [ECCode(code) for code in codes]
+    attribute = timeit.timeit(lambda: [code.parent for code in parsed], number=number) / number
+
+    for label, elapsed in [('string', strings), ('ECCode (cold)', cold), ('ECCode (warm)', warm),
+                           ('ECCode.parent', attribute)]:
+        print(f'{label:<14} {elapsed / len(codes) * 1e9:>8.0f} ns per parent lookup')
+
+    start = timeit.default_timer()
+    sorted(parsed)
+    print(f'sort           {(timeit.default_timer() - start) * 1000:>8.1f} ms for {len(parsed)} codes')
+    start = timeit.default_timer()
+    sorted(parsed, key=attrgetter('sort_key'))
+    print(f'sort by key    {(timeit.default_timer() - start) * 1000:>8.1f} ms for {len(parsed)} codes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Compare expanding a whole enzyme class with its member proteins, entry by entry versus with one subtree query.
+
+Run with ``python benchmarks/bench_enrich_children.py [enzclass.txt enzyme.dat]``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from pybel import BELGraph
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Enzyme
+from bio2bel_expasy.utils import count_statements
+from synthetic import write_synthetic_release
+
+
+def _per_entry(manager, graph, node):
+    """Add the children, then the proteins of each enzyme in the subtree with its own lookup."""
+    manager.enrich_enzyme_children(graph, node)
+    for child in list(graph):
+        manager.enrich_enzyme_with_proteins(graph, child)
+
+
+def _time(label, manager, function):
+    graph = BELGraph()
+    node = graph.add_node_from_data(Enzyme.bel_from_expasy_id('1.-.-.-'))
+    manager.session.expire_all()
+    manager.read_cache.clear()
+    with count_statements(manager.engine) as counter:
+        start = time.perf_counter()
+        function(graph, node)
+        elapsed = time.perf_counter() - start
+    print(f'{label:<24} {elapsed * 1e3:>10.1f} ms, {counter.count:>6} statements, '
+          f'{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+    manager.populate(tree_path=tree_path, database_path=database_path)
+    manager.get_hierarchy()
+    snapshot = manager.snapshot()
+
+    _time('per entry', manager, lambda graph, node: _per_entry(manager, graph, node))
+    _time('subtree query', manager, lambda graph, node: manager.enrich_enzyme_children(graph, node, proteins=True))
+    _time('snapshot', manager, lambda graph, node: snapshot.enrich_enzyme_children(graph, node, proteins=True))
+
+
+if __name__ == '__main__':
+    main()
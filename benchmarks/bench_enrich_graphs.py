@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""Compare the throughput of enriching many graphs serially with the manager and the snapshot versus in parallel.
+
+Run with ``python benchmarks/bench_enrich_graphs.py [enzclass.txt enzyme.dat]``.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+from pybel import BELGraph
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Enzyme
+from synthetic import write_synthetic_release
+
+
+def _make_graphs(snapshot, number, size):
+    """Make graphs of entries and sub-subclasses, with a few of the proteins linked to them."""
+    rng = random.Random(0)
+    codes = [code for code in snapshot.expasy_ids if code.level >= 3]
+    graphs = []
+    for _ in range(number):
+        graph = BELGraph()
+        for code in rng.sample(codes, size):
+            graph.add_node_from_data(Enzyme.bel_from_expasy_id(code))
+            for protein in snapshot.get_proteins_by_expasy_id(code)[:2]:
+                graph.add_node_from_data(protein.as_bel())
+        graphs.append(graph)
+    return graphs
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+    manager.populate(tree_path=tree_path, database_path=database_path)
+    manager.get_hierarchy()
+    snapshot = manager.snapshot()
+
+    print(f'{"manager":<16}', manager.enrich_graphs(_make_graphs(snapshot, 200, 20)))
+    print(f'{"snapshot":<16}', snapshot.enrich_graphs(_make_graphs(snapshot, 200, 20)))
+    for workers in 2, 4:
+        print(f'{f"{workers} workers":<16}', manager.enrich_graphs(_make_graphs(snapshot, 200, 20), workers=workers))
+
+
+if __name__ == '__main__':
+    main()
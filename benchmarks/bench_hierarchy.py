@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Compare descendant lookups and ancestry checks with :class:`HierarchyIndex` versus walking the tree graph.
+
+Run with ``python benchmarks/bench_hierarchy.py [enzclass.txt enzyme.dat]``.
+"""
+
+import sys
+import timeit
+
+import networkx as nx
+
+from bio2bel_expasy.hierarchy import get_expasy_hierarchy
+from bio2bel_expasy.parser.database import iter_expasy_database
+from bio2bel_expasy.parser.tree import get_expasy_tree
+from synthetic import write_synthetic_release
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    graph = get_expasy_tree(path=tree_path)
+    for entry in iter_expasy_database(path=database_path):
+        if not entry.deleted and not entry.transferred:
+            graph.add_edge(entry.parent_id, entry.expasy_id)
+
+    start = timeit.default_timer()
+    index = get_expasy_hierarchy(tree_path=tree_path, database_path=database_path)
+    print(f'build          {(timeit.default_timer() - start) * 1000:>10.1f} ms for {len(index)} codes')
+
+    classes = [code for code in index if code.level == 1]
+    number = 20
+
+    graph_time = timeit.timeit(lambda: [nx.descendants(graph, code) for code in classes], number=number) / number
+    index_time = timeit.timeit(lambda: [index.descendants(code) for code in classes], number=number) / number
+    print(f'descendants    {graph_time * 1000:>10.3f} ms graph, {index_time * 1000:.3f} ms index for all classes')
+
+    pairs = [(classes[0], code) for code in index]
+    graph_time = timeit.timeit(lambda: [nx.has_path(graph, a, b) for a, b in pairs], number=1)
+    index_time = timeit.timeit(lambda: [index.is_ancestor(a, b) for a, b in pairs], number=number) / number
+    print(f'is_ancestor    {graph_time / len(pairs) * 1e9:>10.0f} ns graph, '
+          f'{index_time / len(pairs) * 1e9:.0f} ns index per check')
+
+
+if __name__ == '__main__':
+    main()
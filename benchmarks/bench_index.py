@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""Measure random-access lookups of single entries through the memory-mapped index.
+
+Run with ``python benchmarks/bench_index.py [enzyme.dat]``.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bio2bel_expasy.parser.database import iter_expasy_database
+from bio2bel_expasy.parser.index import ExpasyFile
+from synthetic import write_synthetic_release
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        _, path = write_synthetic_release()
+
+    index_path = os.path.join(tempfile.mkdtemp(), 'enzyme.index')
+
+    start = time.perf_counter()
+    expasy_ids = [entry.expasy_id for entry in iter_expasy_database(path=path)]
+    print(f'full parse       {(time.perf_counter() - start) * 1000:>9.1f} ms')
+
+    for label in ('open (cold)', 'open (warm)'):
+        start = time.perf_counter()
+        expasy_file = ExpasyFile(path=path, index_path=index_path)
+        print(f'{label:<16} {(time.perf_counter() - start) * 1000:>9.1f} ms')
+        if label == 'open (cold)':
+            expasy_file.close()
+
+    expasy_ids = random.Random(0).choices(expasy_ids, k=10_000)
+    start = time.perf_counter()
+    for expasy_id in expasy_ids:
+        expasy_file.get(expasy_id)
+    elapsed = time.perf_counter() - start
+    print(f'get              {elapsed / len(expasy_ids) * 1e6:>9.1f} us per lookup')
+    expasy_file.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""Compare the memory and time of enriching many graphs with interned PyBEL nodes versus building them on each call.
+
+Run with ``python benchmarks/bench_nodes.py [enzclass.txt enzyme.dat]``.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pybel.dsl.node_classes
+from pybel import BELGraph
+
+from bio2bel_expasy import Manager, models
+from bio2bel_expasy.models import Enzyme
+from synthetic import write_synthetic_release
+
+_INTERNED = {
+    name: getattr(models, name)
+    for name in ['_bel_from_expasy_id', '_bel_from_prosite_id', '_bel_from_uniprot_id']
+}
+
+
+def _make_graphs(snapshot, number, size, pool):
+    """Make graphs of entries and sub-subclasses drawn from a pool, like graphs of related pathways."""
+    rng = random.Random(0)
+    codes = rng.sample([code for code in snapshot.expasy_ids if code.level >= 3], pool)
+    graphs = []
+    for _ in range(number):
+        graph = BELGraph()
+        for code in rng.sample(codes, size):
+            graph.add_node_from_data(Enzyme.bel_from_expasy_id(code))
+        graphs.append(graph)
+    return graphs
+
+
+def _enrich(snapshot, graphs):
+    for graph in graphs:
+        snapshot.enrich_enzymes(graph)
+        snapshot.enrich_enzymes_with_prosites(graph)
+
+
+def _run(label, snapshot, interned, pool):
+    for name, function in _INTERNED.items():
+        function.cache_clear()
+        setattr(models, name, function if interned else function.__wrapped__)
+
+    graphs = _make_graphs(snapshot, 200, 20, pool)
+    start = time.perf_counter()
+    _enrich(snapshot, graphs)
+    elapsed = time.perf_counter() - start
+
+    graphs = _make_graphs(snapshot, 200, 20, pool)
+    tracemalloc.start()
+    _enrich(snapshot, graphs)
+    statistics = tracemalloc.take_snapshot() \
+        .filter_traces([tracemalloc.Filter(True, pybel.dsl.node_classes.__file__)]) \
+        .statistics('filename')
+    tracemalloc.stop()
+
+    size = sum(statistic.size for statistic in statistics)
+    count = sum(statistic.count for statistic in statistics)
+    nodes = {id(node) for graph in graphs for node in graph}
+    print(f'{label:<10} pool {pool:>5} {elapsed:>6.2f} s, {size / 2 ** 20:>6.1f} MB in {count:>7} blocks of nodes, '
+          f'{len(nodes)} node objects for {sum(graph.number_of_nodes() for graph in graphs)} nodes')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+    manager.populate(tree_path=tree_path, database_path=database_path)
+    snapshot = manager.snapshot()
+
+    for pool in 500, 5000:
+        _run('built', snapshot, interned=False, pool=pool)
+        _run('interned', snapshot, interned=True, pool=pool)
+    print({model.__name__: info for model, info in models.get_node_cache_info().items()})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Compare the throughput of serial and multiprocess parsing of the ENZYME database.
+
+Run with ``python benchmarks/bench_parallel_parse.py [enzyme.dat]``.
+"""
+
+import os
+import sys
+import time
+
+from bio2bel_expasy.parser.database import iter_expasy_database
+from synthetic import write_synthetic_release
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        _, path = write_synthetic_release(entries=48)
+
+    size = os.path.getsize(path) / 2 ** 20
+    serial = None
+
+    for workers in (None, 2, 4, os.cpu_count()):
+        start = time.perf_counter()
+        entries = list(iter_expasy_database(path=path, workers=workers))
+        elapsed = time.perf_counter() - start
+
+        if serial is None:
+            serial = entries
+        elif entries != serial:
+            raise ValueError(f'parallel parse with {workers} workers did not match the serial parse')
+
+        print(f'workers={workers or 1:<3} {len(entries):>7} entries {elapsed:>6.2f} s {size / elapsed:>7.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Compare the peak memory of holding a parsed release as records versus as dictionaries.
+
+Run with ``python benchmarks/bench_parse_memory.py [enzyme.dat]``.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from bio2bel_expasy.parser.database import iter_expasy_database
+from synthetic import write_synthetic_release
+
+
+def _measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rv = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<12} {len(rv):>8} entries {current / 2 ** 20:>8.1f} MiB retained {elapsed:>6.2f} s')
+    return current
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        _, path = write_synthetic_release()
+
+    records = _measure('records', lambda: {
+        entry.expasy_id: entry
+        for entry in iter_expasy_database(path=path)
+    })
+    dicts = _measure('dicts', lambda: {
+        entry.expasy_id: entry.to_dict()
+        for entry in iter_expasy_database(path=path)
+    })
+    print(f'records use {dicts / records:.1f}x less memory')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Compare populating a SQLite database with the model-based loaders, the bulk Core loaders, and in batches.
+
+Each mode runs in its own process so their peak memory can be compared.
+
+Run with ``python benchmarks/bench_populate.py [enzclass.txt enzyme.dat]``.
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from bio2bel_expasy import Manager
+from synthetic import write_synthetic_release
+
+MODES = {
+    'bulk': dict(bulk=True),
+    'batches': dict(batch_size=1000),
+    'models': dict(bulk=False),
+}
+
+
+def _populate(tree_path, database_path, mode):
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+
+    start = time.perf_counter()
+    manager.populate_tree(path=tree_path, **MODES[mode])
+    manager.populate_database(path=database_path, **MODES[mode])
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{mode:<8} {elapsed:>8.2f} s {peak:>8.1f} MiB peak  {manager.summarize()}')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    for mode in MODES:
+        process = multiprocessing.Process(target=_populate, args=(tree_path, database_path, mode))
+        process.start()
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
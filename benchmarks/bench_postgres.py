@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""Compare populating PostgreSQL with the bulk ``executemany`` loaders versus ``COPY`` with a staging swap.
+
+Run with ``python benchmarks/bench_postgres.py postgresql://... [enzclass.txt enzyme.dat]``. The content of the given
+database is replaced.
+"""
+
+import sys
+import time
+
+from bio2bel_expasy import Manager
+from synthetic import write_synthetic_release
+
+
+def main():
+    """Run the benchmark."""
+    connection = sys.argv[1]
+    if len(sys.argv) == 4:
+        tree_path, database_path = sys.argv[2:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    manager = Manager(connection=connection)
+    manager.drop_all()
+    manager.create_all()
+
+    start = time.perf_counter()
+    manager.populate_tree(path=tree_path, bulk=True)
+    manager.populate_database(path=database_path, bulk=True)
+    print(f'executemany {time.perf_counter() - start:>8.2f} s  {manager.summarize()}')
+
+    start = time.perf_counter()
+    manager.populate_copy(tree_path=tree_path, database_path=database_path)
+    print(f'copy        {time.perf_counter() - start:>8.2f} s  {manager.summarize()}')
+
+    manager.session.close()
+    manager.drop_all()
+
+
+if __name__ == '__main__':
+    main()
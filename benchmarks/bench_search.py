@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""Compare searching enzymes by name with the full-text index versus scanning the names and synonyms in Python.
+
+Run with ``python benchmarks/bench_search.py [connection [enzclass.txt enzyme.dat]]``. Defaults to a new SQLite file.
+The content of a given database is replaced.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Enzyme, Synonym
+from synthetic import ACTIVITIES, SUBSTRATES, write_synthetic_release
+
+
+def _scan(manager, text, limit):
+    """Find the enzymes whose names or synonyms contain every word of the text, like before the index."""
+    words = text.lower().split()
+    names = {}
+    for enzyme_pk, description in manager.session.query(Enzyme.id, Enzyme.description):
+        names[enzyme_pk] = [(description or '').lower()]
+    for enzyme_pk, name in manager.session.query(Synonym.enzyme_id, Synonym.name):
+        names[enzyme_pk].append(name.lower())
+
+    return [
+        enzyme_pk
+        for enzyme_pk, texts in names.items()
+        if all(any(word in text for text in texts) for word in words)
+    ][:limit]
+
+
+def _time(label, function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f'{label:<24} {elapsed * 1e3:>10.3f} ms per query')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        connection = sys.argv[1]
+    else:
+        connection = f'sqlite:///{os.path.join(tempfile.mkdtemp(prefix="bio2bel_expasy_bench_"), "expasy.db")}'
+
+    if len(sys.argv) == 4:
+        tree_path, database_path = sys.argv[2:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    manager = Manager(connection=connection)
+    manager.drop_all()
+    manager.create_all()
+    manager.populate(tree_path=tree_path, database_path=database_path)
+    print(manager.summarize(), f'{manager.session.query(Synonym).count()} synonyms')
+
+    start = time.perf_counter()
+    manager._rebuild_search_index()
+    manager.session.commit()
+    print(f'{"rebuild index":<24} {(time.perf_counter() - start) * 1e3:>10.3f} ms')
+
+    rng = random.Random(0)
+    queries = [
+        f'{rng.choice(SUBSTRATES)} {rng.choice(ACTIVITIES)}'
+        for _ in range(200)
+    ]
+
+    _time('scan in Python', lambda query: _scan(manager, query, 10), queries[:20])
+    _time('search_enzymes', lambda query: manager.search_enzymes(query, limit=10), queries)
+    _time('search_enzymes (100)', lambda query: manager.search_enzymes(query, limit=100), queries)
+
+    manager.session.close()
+    if len(sys.argv) > 1:
+        manager.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""Compare the latency of lookups and enrichment with the manager versus an in-memory snapshot.
+
+Run with ``python benchmarks/bench_snapshot.py [enzclass.txt enzyme.dat]``.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from pybel import BELGraph
+from pybel.dsl import Protein
+
+from bio2bel_expasy import Manager
+from synthetic import write_synthetic_release
+
+
+def _time(label, manager, snapshot, function, number):
+    start = time.perf_counter()
+    function(manager)
+    manager_time = (time.perf_counter() - start) / number
+
+    start = time.perf_counter()
+    function(snapshot)
+    snapshot_time = (time.perf_counter() - start) / number
+
+    print(f'{label:<32} {manager_time * 1e6:>10.1f} us manager, {snapshot_time * 1e6:>8.2f} us snapshot, '
+          f'{manager_time / snapshot_time:>8.0f}x')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+    manager.populate(tree_path=tree_path, database_path=database_path)
+
+    start = time.perf_counter()
+    snapshot = manager.snapshot()
+    print(f'snapshot {time.perf_counter() - start:.2f} s for {snapshot.summarize()}')
+
+    rng = random.Random(0)
+    number = 1000
+    uniprot_ids = rng.sample(snapshot.accession_numbers, number)
+    expasy_ids = rng.sample([code for code in snapshot.expasy_ids if code.level == 4], number)
+
+    _time('get_enzymes_by_uniprot_id', manager, snapshot, lambda engine: [
+        engine.get_enzymes_by_uniprot_id(uniprot_id)
+        for uniprot_id in uniprot_ids
+    ], number)
+    _time('get_proteins_by_expasy_id', manager, snapshot, lambda engine: [
+        engine.get_proteins_by_expasy_id(expasy_id)
+        for expasy_id in expasy_ids
+    ], number)
+
+    def enrich(engine):
+        graph = BELGraph()
+        for uniprot_id in uniprot_ids:
+            graph.add_node_from_data(Protein(namespace='uniprot', identifier=uniprot_id))
+        if isinstance(engine, Manager):
+            engine.read_cache.clear()  # measure the lookups, not the cache
+        engine.enrich_proteins_with_enzyme_families(graph)
+
+    _time('enrich_proteins (per protein)', manager, snapshot, enrich, number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""Compare populating an empty SQLite file with and without the bulk-load profile.
+
+Both use the bulk loaders. Without the profile, the tree and the database are committed separately with the default
+journal settings and with the indexes maintained row by row.
+
+Run with ``python benchmarks/bench_sqlite.py [enzclass.txt enzyme.dat]``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from bio2bel_expasy import Manager
+from synthetic import write_synthetic_release
+
+
+def _populate(tree_path, database_path, sqlite_profile):
+    directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+    manager = Manager(connection=f'sqlite:///{os.path.join(directory, "expasy.db")}')
+
+    start = time.perf_counter()
+    manager.populate(tree_path=tree_path, database_path=database_path, sqlite_profile=sqlite_profile)
+    elapsed = time.perf_counter() - start
+
+    label = 'profile' if sqlite_profile else 'default'
+    print(f'{label:<8} {elapsed:>8.2f} s  {manager.summarize()}')
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) == 3:
+        tree_path, database_path = sys.argv[1:]
+    else:
+        tree_path, database_path = write_synthetic_release()
+
+    for sqlite_profile in (False, True, False, True):
+        _populate(tree_path, database_path, sqlite_profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Generate synthetic ENZYME releases with realistic shape for the benchmarks.
+
+The full release has about 8,000 entries and 250,000 UniProt cross-references, so the defaults here mirror that.
+Pass a real ``enzyme.dat`` to the benchmarks instead when one is available.
+"""
+
+import os
+import random
+import tempfile
+from typing import Optional, Tuple
+
+__all__ = [
+    'write_synthetic_release',
+]
+
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+#: Words from which the names and synonyms of the entries are made, so that searching them is realistic
+SUBSTRATES = [
+    'alcohol', 'aldehyde', 'glucose', 'lactate', 'pyruvate', 'glutamate', 'succinate', 'malate', 'citrate', 'acetyl-CoA',
+    'sterol', 'fatty-acid', 'tRNA', 'DNA', 'peptide', 'glycerol', 'urate', 'choline', 'serine', 'xylose',
+]
+ACTIVITIES = [
+    'dehydrogenase', 'oxidase', 'reductase', 'kinase', 'synthase', 'hydrolase', 'isomerase', 'ligase', 'transferase',
+    'mutase', 'lyase', 'phosphatase', 'carboxylase', 'epimerase',
+]
+
+
+def _accession(rng: random.Random) -> str:
+    return rng.choice('OPQ') + str(rng.randint(0, 9)) + ''.join(rng.choice(_LETTERS) for _ in range(3)) + str(
+        rng.randint(0, 9))
+
+
+def _entry_name(rng: random.Random) -> str:
+    return ''.join(rng.choice(_LETTERS) for _ in range(4)) + '_' + ''.join(rng.choice(_LETTERS) for _ in range(5))
+
+
+def _iter_codes(classes: int, subclasses: int, subsubclasses: int, entries: int):
+    for a in range(1, classes + 1):
+        for b in range(1, subclasses + 1):
+            for c in range(1, subsubclasses + 1):
+                for d in range(1, entries + 1):
+                    yield a, b, c, d
+
+
+def write_synthetic_release(
+    directory: Optional[str] = None,
+    classes: int = 7,
+    subclasses: int = 10,
+    subsubclasses: int = 10,
+    entries: int = 12,
+    proteins: int = 30,
+    seed: int = 0,
+) -> Tuple[str, str]:
+    """Write a synthetic ``enzclass.txt`` and ``enzyme.dat`` and return their paths.
+
+    :param directory: The directory in which to write the files. Defaults to a new temporary directory.
+    :param classes: The number of classes
+    :param subclasses: The number of subclasses per class
+    :param subsubclasses: The number of sub-subclasses per subclass
+    :param entries: The number of entries per sub-subclass
+    :param proteins: The average number of UniProt cross-references per entry
+    :param seed: The random seed
+    """
+    rng = random.Random(seed)
+
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix='bio2bel_expasy_bench_')
+
+    tree_path = os.path.join(directory, 'enzclass.txt')
+    database_path = os.path.join(directory, 'enzyme.dat')
+
+    with open(tree_path, 'w') as file:
+        for a in range(1, classes + 1):
+            print(f'{a}. -. -.-  Class {a}.', file=file)
+            for b in range(1, subclasses + 1):
+                print(f'{a}.{b:>2}. -.-   Subclass {a}.{b}.', file=file)
+                for c in range(1, subsubclasses + 1):
+                    print(f'{a}.{b:>2}.{c:>2}.-    Sub-subclass {a}.{b}.{c}.', file=file)
+
+    with open(database_path, 'w') as file:
+        print('CC   SYNTHETIC FILE', file=file)
+        print('//', file=file)
+        for a, b, c, d in _iter_codes(classes, subclasses, subsubclasses, entries):
+            print(f'ID   {a}.{b}.{c}.{d}', file=file)
+            if rng.random() < 0.05:
+                print('DE   Deleted entry.', file=file)
+                print('//', file=file)
+                continue
+            print(f'DE   {rng.choice(SUBSTRATES)} {rng.choice(SUBSTRATES)} {rng.choice(ACTIVITIES)} {d}.', file=file)
+            for _ in range(rng.randint(0, 3)):
+                print(f'AN   {rng.choice(SUBSTRATES)} {rng.choice(ACTIVITIES)} {c}-{d}.', file=file)
+            print('CA   A + B = C + D.', file=file)
+            if rng.random() < 0.3:
+                print(f'PR   PROSITE; PDOC{rng.randint(0, 999):05};', file=file)
+            pairs = [
+                f'{_accession(rng)}, {_entry_name(rng)}'
+                for _ in range(rng.randint(0, 2 * proteins))
+            ]
+            for i in range(0, len(pairs), 3):
+                print('DR   ' + ';  '.join(pairs[i:i + 3]) + ';', file=file)
+            print('//', file=file)
+
+    return tree_path, database_path
@@ -38,6 +38,9 @@ EXTRAS_REQUIRE = {
         'flask',
         'flask_admin',
     ],
+    'postgres': [
+        'psycopg2',
+    ],
     'docs': [
         'sphinx',
         'sphinx-rtd-theme',
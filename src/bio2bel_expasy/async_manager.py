@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+"""An asyncio interface to the read API of the manager.
+
+SQLAlchemy 1.3, which Bio2BEL needs, has no asyncio support, so :class:`AsyncManager` runs the lookups of a
+:class:`bio2bel_expasy.Manager` on a pool of worker threads instead, and awaits them from the event loop. The session
+of the manager is scoped to the thread, so each worker gets its own session and takes its own connection from the
+pool of the engine, and lookups overlap up to the number of workers.
+
+Models can't leave the thread of their session, so the lookups return the immutable records from
+:mod:`bio2bel_expasy.read_cache`, like :class:`bio2bel_expasy.snapshot.Snapshot`. Each worker gives its connection
+back to the pool after each lookup.
+
+Each thread gets its own in-memory database with ``sqlite://``, so use a SQLite file, or another database, instead.
+"""
+
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, TypeVar
+
+from sqlalchemy import Table
+
+from .ec_code import ECCode
+from .manager import Manager
+from .models import Enzyme, Prosite, Protein, enzyme_prosite, enzyme_protein
+from .read_cache import EnzymeRecord, PrositeRecord, ProteinRecord
+from .utils import chunked
+
+__all__ = [
+    'AsyncManager',
+]
+
+X = TypeVar('X')
+
+
+class AsyncManager:
+    """Runs the read API of a manager on worker threads, so lookups don't block the event loop and can overlap.
+
+    .. code-block:: python
+
+        async with AsyncManager(connection='sqlite:///expasy.db') as manager:
+            enzymes, proteins = await asyncio.gather(
+                manager.get_enzymes_by_uniprot_id('Q6AZW2'),
+                manager.get_proteins_by_expasy_id('1.1.1.2'),
+            )
+    """
+
+    def __init__(self, manager: Optional[Manager] = None, max_workers: int = 4, **kwargs) -> None:
+        """Wrap a manager.
+
+        :param manager: A manager. Defaults to building one with the remaining keyword arguments.
+        :param max_workers: The number of lookups that can run at once. It should not exceed the size of the
+         connection pool of the engine, which is 5 by default.
+        """
+        self.manager = manager if manager is not None else Manager(**kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bio2bel_expasy')
+
+    async def __aenter__(self) -> 'AsyncManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """Wait for the running lookups, then stop the workers."""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """Wait for the running lookups, then stop the workers, without blocking the event loop meanwhile."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    async def _run(self, function: Callable[..., X], *args) -> X:
+        """Run the function on a worker and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._call, function, *args))
+
+    def _call(self, function: Callable[..., X], *args) -> X:
+        try:
+            return function(*args)
+        finally:
+            self.manager.session.remove()  # give the connection of this worker's session back to the pool
+
+    async def count_enzymes(self) -> int:
+        """Count the number of enzymes."""
+        return await self._run(self.manager.count_enzymes)
+
+    async def count_prosites(self) -> int:
+        """Count the number of ProSites."""
+        return await self._run(self.manager.count_prosites)
+
+    async def count_proteins(self) -> int:
+        """Count the number of proteins."""
+        return await self._run(self.manager.count_proteins)
+
+    async def summarize(self) -> Mapping[str, int]:
+        """Return a summary dictionary, like :meth:`bio2bel_expasy.Manager.summarize`."""
+        return await self._run(self.manager.summarize)
+
+    async def get_enzyme_by_id(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        """Get an enzyme by its ExPASy identifier, from the read cache of the manager if possible."""
+        return await self._run(self.manager.get_enzyme_record, expasy_id)
+
+    async def get_protein_by_uniprot_id(self, uniprot_id: str) -> Optional[ProteinRecord]:
+        """Get a protein by its UniProt accession number, from the read cache of the manager if possible."""
+        return await self._run(self.manager.get_protein_record, uniprot_id)
+
+    async def get_prosite_by_id(self, prosite_id: str) -> Optional[PrositeRecord]:
+        """Get a ProSite by its identifier, from the read cache of the manager if possible."""
+        return await self._run(self.manager.get_prosite_record, prosite_id)
+
+    async def get_parent_by_expasy_id(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        """Get the parent of the enzyme with the given ExPASy identifier, if both exist."""
+        return await self._run(self._get_parent, expasy_id)
+
+    def _get_parent(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        parent = self.manager.get_parent_by_expasy_id(expasy_id)
+        if parent is not None:
+            return self._to_enzyme_records([parent])[0]
+
+    async def get_children_by_expasy_id(self, expasy_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the children of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        return await self._run(self._to_records, self.manager.get_children_by_expasy_id, expasy_id)
+
+    async def get_descendants_by_expasy_id(self, expasy_id: str) -> List[EnzymeRecord]:
+        """Get all enzymes below the enzyme with the given ExPASy identifier, nearest first."""
+        return await self._run(self._to_records, self.manager.get_descendants_by_expasy_id, expasy_id)
+
+    async def get_proteins_under_class(self, expasy_id: str) -> List[ProteinRecord]:
+        """Get the proteins of the enzyme with the given ExPASy identifier and of all enzymes below it."""
+        return await self._run(self._to_records, self.manager.get_proteins_under_class, expasy_id)
+
+    async def get_prosites_by_expasy_id(self, expasy_id: str) -> Optional[List[PrositeRecord]]:
+        """Get the ProSites of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        return await self._run(self._to_records, self.manager.get_prosites_by_expasy_id, expasy_id)
+
+    async def get_enzymes_by_prosite_id(self, prosite_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the enzymes of the ProSite with the given identifier, or None if it doesn't exist."""
+        return await self._run(self._to_records, self.manager.get_enzymes_by_prosite_id, prosite_id)
+
+    async def get_proteins_by_expasy_id(self, expasy_id: str) -> Optional[List[ProteinRecord]]:
+        """Get the proteins of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        return await self._run(self._to_records, self.manager.get_proteins_by_expasy_id, expasy_id)
+
+    async def get_enzymes_by_uniprot_id(self, uniprot_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the enzymes of the protein with the given UniProt accession number, or None if it doesn't exist."""
+        return await self._run(self._to_records, self.manager.get_enzymes_by_uniprot_id, uniprot_id)
+
+    async def get_enzymes_by_uniprot_ids(self, uniprot_ids: Iterable[str]) -> Dict[str, List[EnzymeRecord]]:
+        """Get the enzymes of each of the proteins found with the given UniProt accession numbers."""
+        return await self._run(self._to_many_records, self.manager.get_enzymes_by_uniprot_ids, list(uniprot_ids))
+
+    async def get_enzymes_by_prosite_ids(self, prosite_ids: Iterable[str]) -> Dict[str, List[EnzymeRecord]]:
+        """Get the enzymes of each of the ProSites found with the given identifiers."""
+        return await self._run(self._to_many_records, self.manager.get_enzymes_by_prosite_ids, list(prosite_ids))
+
+    async def get_proteins_by_expasy_ids(self, expasy_ids: Iterable[str]) -> Dict[str, List[ProteinRecord]]:
+        """Get the proteins of each of the enzymes found with the given ExPASy identifiers."""
+        return await self._run(self._to_many_records, self.manager.get_proteins_by_expasy_ids, list(expasy_ids))
+
+    async def get_prosites_by_expasy_ids(self, expasy_ids: Iterable[str]) -> Dict[str, List[PrositeRecord]]:
+        """Get the ProSites of each of the enzymes found with the given ExPASy identifiers."""
+        return await self._run(self._to_many_records, self.manager.get_prosites_by_expasy_ids, list(expasy_ids))
+
+    def _to_records(self, get: Callable[[str], Optional[List]], key: str) -> Optional[List]:
+        """Look up the models and copy them to records, while they are still attached."""
+        models = get(key)
+        if models is None:
+            return
+        return self._copy(models)
+
+    def _to_many_records(self, get: Callable[[List[str]], Dict[str, List]], keys: List[str]) -> Dict[str, List]:
+        """Look up the lists of models and copy them to records, with a few queries for all of them."""
+        result = get(keys)
+        records = self._copy([model for models in result.values() for model in models])
+
+        rv, start = {}, 0
+        for key, models in result.items():
+            rv[key] = records[start:start + len(models)]
+            start += len(models)
+        return rv
+
+    def _copy(self, models: List) -> List:
+        """Copy models of the same type to records."""
+        if not models:
+            return []
+        if isinstance(models[0], Enzyme):
+            return self._to_enzyme_records(models)
+        if isinstance(models[0], Protein):
+            expasy_ids = self._get_expasy_ids(enzyme_protein, enzyme_protein.c.protein_id, models)
+            return [
+                ProteinRecord(protein.accession_number, protein.entry_name, expasy_ids[protein.id])
+                for protein in models
+            ]
+        if isinstance(models[0], Prosite):
+            expasy_ids = self._get_expasy_ids(enzyme_prosite, enzyme_prosite.c.prosite_id, models)
+            return [
+                PrositeRecord(prosite.prosite_id, expasy_ids[prosite.id])
+                for prosite in models
+            ]
+        raise TypeError(f'can not copy {models[0]!r}')
+
+    def _to_enzyme_records(self, enzymes: List[Enzyme]) -> List[EnzymeRecord]:
+        """Copy the enzymes, looking up the identifiers of their parents in a query per chunk."""
+        session = self.manager.session
+        parent_ids = {}
+        for chunk in chunked({enzyme.parent_id for enzyme in enzymes if enzyme.parent_id is not None}):
+            parent_ids.update(session.query(Enzyme.id, Enzyme.expasy_id).filter(Enzyme.id.in_(chunk)))
+
+        return [
+            EnzymeRecord(enzyme.expasy_id, enzyme.description, parent_ids.get(enzyme.parent_id))
+            for enzyme in enzymes
+        ]
+
+    def _get_expasy_ids(self, table: Table, column, models: List) -> Dict[int, tuple]:
+        """Get the ExPASy identifiers linked to each of the models through the table, in a query per chunk."""
+        rv = defaultdict(list)
+        for chunk in chunked({model.id for model in models}):
+            query = self.manager.session.query(column, Enzyme.expasy_id) \
+                .select_from(table) \
+                .join(Enzyme, Enzyme.id == table.c.enzyme_id) \
+                .filter(column.in_(chunk))
+            for pk, expasy_id in query:
+                rv[pk].append(expasy_id)
+
+        return defaultdict(tuple, {
+            pk: tuple(sorted(map(ECCode, expasy_ids)))
+            for pk, expasy_ids in rv.items()
+        })
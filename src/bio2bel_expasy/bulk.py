@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""Rows for loading a release with primary keys assigned in Python, shared by the bulk loaders.
+
+:class:`ReleaseRows` turns the parsed tree and entries into the rows of each table, so a loader never has to read keys
+back from the database. The rows can then be inserted with ``executemany`` (see
+:meth:`bio2bel_expasy.Manager.populate_database`) or streamed with ``COPY`` (see :mod:`bio2bel_expasy.postgres`).
+"""
+
+from operator import attrgetter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import networkx as nx
+from sqlalchemy import Table
+
+from .models import Enzyme, Prosite, Protein, Synonym, enzyme_closure, enzyme_prosite, enzyme_protein
+from .parser.records import ExpasyEntry
+
+__all__ = [
+    'TABLES',
+    'ReleaseRows',
+    'get_closure_rows',
+]
+
+Row = Dict[str, Optional[object]]
+
+#: The tables filled by the bulk loaders, in an order that respects their foreign keys
+TABLES: List[Table] = [
+    Enzyme.__table__,
+    Prosite.__table__,
+    Protein.__table__,
+    enzyme_prosite,
+    enzyme_protein,
+    Synonym.__table__,
+    enzyme_closure,
+]
+
+
+def get_closure_rows(parents: Mapping[int, Optional[int]], enzyme_pks: Iterable[int]) -> List[Row]:
+    """Get the rows of the closure table for the given enzymes by following their parents.
+
+    :param parents: A dictionary from the primary key of each enzyme to the primary key of its parent
+    :param enzyme_pks: The primary keys of the enzymes whose ancestors are needed
+    """
+    rv = []
+    for descendant_pk in enzyme_pks:
+        ancestor_pk, depth = descendant_pk, 0
+        while ancestor_pk is not None:
+            rv.append({'ancestor_id': ancestor_pk, 'descendant_id': descendant_pk, 'depth': depth})
+            ancestor_pk, depth = parents.get(ancestor_pk), depth + 1
+    return rv
+
+
+class ReleaseRows:
+    """Assigns primary keys to the classes and entries of a release and generates the rows of each table.
+
+    Like the loaders that use the models, the first description given for an enzyme and the first entry name given
+    for a protein are kept.
+    """
+
+    def __init__(self, enzyme_pks: Optional[Mapping[str, int]] = None) -> None:
+        """Start assigning keys.
+
+        :param enzyme_pks: The primary keys of the enzymes already in the database, if any. New keys are assigned
+         after the largest one.
+        """
+        self.enzyme_pks: Dict[str, int] = dict(enzyme_pks or {})
+        self.prosite_pks: Dict[str, int] = {}
+        self.protein_pks: Dict[str, int] = {}
+        #: The parent of each enzyme given a key here
+        self.parents: Dict[int, Optional[int]] = {}
+        self._next_enzyme_pk = max(self.enzyme_pks.values(), default=0) + 1
+
+    def _add_enzyme(self, expasy_id: str, description: str, parent_id: Optional[str]) -> Tuple[int, Optional[Row]]:
+        enzyme_pk = self.enzyme_pks.get(expasy_id)
+        if enzyme_pk is not None:
+            return enzyme_pk, None
+
+        enzyme_pk = self.enzyme_pks[expasy_id] = self._next_enzyme_pk
+        self._next_enzyme_pk += 1
+        parent_pk = self.parents[enzyme_pk] = self.enzyme_pks.get(parent_id)
+        return enzyme_pk, {
+            'id': enzyme_pk,
+            'expasy_id': expasy_id,
+            'description': description,
+            'parent_id': parent_pk,
+            **Enzyme.get_number_columns(expasy_id),
+        }
+
+    def iter_class_rows(self, tree: nx.DiGraph) -> Iterable[Tuple[Table, Row]]:
+        """Generate the rows of the classes of the tree, parents first.
+
+        :param tree: The ExPASy tree from :func:`bio2bel_expasy.parser.tree.get_expasy_tree`
+        """
+        for expasy_id in sorted(tree, key=attrgetter('sort_key')):
+            parent_id = next(iter(tree.predecessors(expasy_id)), None)
+            _, row = self._add_enzyme(expasy_id, tree.nodes[expasy_id]['description'], parent_id)
+            if row is not None:
+                yield Enzyme.__table__, row
+
+    def iter_entry_rows(self, entries: Iterable[ExpasyEntry]) -> Iterable[Tuple[Table, Row]]:
+        """Generate the rows of the live entries, their synonyms, ProSites, and proteins, and the links between them.
+
+        Rows are generated in an order that respects the foreign keys, so they can be inserted as they come.
+
+        :param entries: The entries from :func:`bio2bel_expasy.parser.database.iter_expasy_database`
+        """
+        for entry in entries:
+            if entry.deleted or entry.transferred:
+                continue
+
+            enzyme_pk, row = self._add_enzyme(entry.expasy_id, entry.name, entry.parent_id)
+            if row is not None:
+                yield Enzyme.__table__, row
+                for name in dict.fromkeys(entry.synonyms):
+                    yield Synonym.__table__, {'enzyme_id': enzyme_pk, 'name': name}
+
+            # an entry can list the same cross-reference twice, but it can only be linked once
+            for prosite_id in dict.fromkeys(entry.prosite_ids):
+                prosite_pk = self.prosite_pks.get(prosite_id)
+                if prosite_pk is None:
+                    prosite_pk = self.prosite_pks[prosite_id] = len(self.prosite_pks) + 1
+                    yield Prosite.__table__, {'id': prosite_pk, 'prosite_id': prosite_id}
+                yield enzyme_prosite, {'enzyme_id': enzyme_pk, 'prosite_id': prosite_pk}
+
+            accession_numbers = set()
+            for accession_number, entry_name in entry.proteins:
+                if accession_number in accession_numbers:
+                    continue
+                accession_numbers.add(accession_number)
+
+                protein_pk = self.protein_pks.get(accession_number)
+                if protein_pk is None:
+                    protein_pk = self.protein_pks[accession_number] = len(self.protein_pks) + 1
+                    yield Protein.__table__, {
+                        'id': protein_pk,
+                        'accession_number': accession_number,
+                        'entry_name': entry_name,
+                    }
+                yield enzyme_protein, {'enzyme_id': enzyme_pk, 'protein_id': protein_pk}
+
+    def iter_closure_rows(self) -> Iterable[Tuple[Table, Row]]:
+        """Generate the rows of the closure table for the enzymes given a key here."""
+        for row in get_closure_rows(self.parents, self.parents):
+            yield enzyme_closure, row
@@ -9,6 +9,16 @@ from .manager import Manager
 main = Manager.get_cli()
 
 
+@main.command()
+@click.option('--force-download', is_flag=True, help='Download the latest release even if files are cached')
+@click.pass_obj
+def update(manager, force_download):
+    """Apply only the changes since the loaded release."""
+    delta = manager.update(force_download=force_download)
+    for key, expasy_ids in delta.items():
+        click.echo(f'{key}: {len(expasy_ids)}')
+
+
 @main.group()
 def enzyme():
     """Enzyme utils"""
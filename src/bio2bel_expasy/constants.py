@@ -18,7 +18,12 @@ EXPASY_TREE_DATA_PATH = os.path.join(DATA_DIR, 'enzclass.txt')
 EXPASY_DATABASE_URL = 'ftp://ftp.expasy.org/databases/enzyme/enzyme.dat'
 #: The local cache location where the ENZYME database document is stored
 EXPASY_DATA_PATH = os.path.join(DATA_DIR, 'enzyme.dat')
-EXPASY_PARSED_PATH = os.path.join(DATA_DIR, 'enzyme.json')
+#: The local cache location where the parsed ENZYME database is stored
+EXPASY_PARSED_PATH = os.path.join(DATA_DIR, 'enzyme.cache')
+#: The local cache location where the index of byte ranges of records in the ENZYME database document is stored
+EXPASY_INDEX_PATH = os.path.join(DATA_DIR, 'enzyme.index')
+#: The local cache location where the nested-interval index over the EC hierarchy is stored
+EXPASY_HIERARCHY_PATH = os.path.join(DATA_DIR, 'hierarchy.index')
 
 EC_DATA_FILE_REGEX = r'(ID   )(\d+|\-)\.( )*((\d+)|(\-))\.( )*(\d+|\-)(\.(n)?(\d+|\-))*'
 EC_PATTERN_REGEX = r'(\d+|\-)\.( )*((\d+)|(\-))\.( )*(\d+|\-)(\.(n)?(\d+|\-))*'
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""Compute the differences between two releases of ExPASy for incremental updates of the database."""
+
+from operator import attrgetter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import networkx as nx
+
+from .ec_code import ECCode
+from .parser.records import ExpasyEntry
+
+__all__ = [
+    'ReleaseState',
+    'get_release_state',
+    'diff_releases',
+]
+
+
+class ReleaseState:
+    """The parts of a release of ExPASy that are stored in the database."""
+
+    def __init__(
+        self,
+        descriptions: Dict[str, str],
+        prosites: Dict[str, Set[str]],
+        proteins: Dict[str, Set[Tuple[str, str]]],
+        transferred: Iterable[str] = (),
+        synonyms: Optional[Dict[str, Set[str]]] = None,
+    ) -> None:
+        """Build a release state.
+
+        :param descriptions: A dictionary from ExPASy identifiers of all classes and entries to their descriptions
+        :param prosites: A dictionary from ExPASy identifiers to the ProSite identifiers of their domains
+        :param proteins: A dictionary from ExPASy identifiers to the (accession number, entry name) pairs of their
+         UniProt proteins
+        :param transferred: ExPASy identifiers of entries that have been transferred in this release
+        :param synonyms: A dictionary from ExPASy identifiers to their additional names
+        """
+        self.descriptions = descriptions
+        self.prosites = prosites
+        self.proteins = proteins
+        self.transferred = set(transferred)
+        self.synonyms = {} if synonyms is None else synonyms
+
+
+def get_release_state(tree: nx.DiGraph, entries: Iterable[ExpasyEntry]) -> ReleaseState:
+    """Get the state of a release from the parsed tree and database.
+
+    :param tree: The ExPASy tree from :func:`bio2bel_expasy.parser.tree.get_expasy_tree`
+    :param entries: The entries from :func:`bio2bel_expasy.parser.database.iter_expasy_database`
+    """
+    descriptions = {
+        expasy_id: data['description']
+        for expasy_id, data in tree.nodes(data=True)
+    }
+    prosites = {}
+    proteins = {}
+    synonyms = {}
+    transferred = set()
+
+    for entry in entries:
+        if entry.transferred:
+            transferred.add(entry.expasy_id)
+        if entry.deleted or entry.transferred:
+            continue
+
+        descriptions[entry.expasy_id] = entry.name
+        if entry.synonyms:
+            synonyms[entry.expasy_id] = set(entry.synonyms)
+        if entry.prosite_ids:
+            prosites[entry.expasy_id] = set(entry.prosite_ids)
+        if entry.accession_numbers:
+            proteins[entry.expasy_id] = set(entry.proteins)
+
+    return ReleaseState(
+        descriptions=descriptions,
+        prosites=prosites,
+        proteins=proteins,
+        transferred=transferred,
+        synonyms=synonyms,
+    )
+
+
+def _sorted(expasy_ids: Iterable[str]) -> List[ECCode]:
+    return sorted(map(ECCode, expasy_ids), key=attrgetter('sort_key'))
+
+
+def _get_changed_links(old: Mapping[str, Set], new: Mapping[str, Set], expasy_ids: Set[str]) -> List[ECCode]:
+    return _sorted(
+        expasy_id
+        for expasy_id in expasy_ids
+        if old.get(expasy_id, set()) != new.get(expasy_id, set())
+    )
+
+
+def diff_releases(old: ReleaseState, new: ReleaseState) -> Mapping[str, List[ECCode]]:
+    """Summarize the changes from one release to the next.
+
+    :return: A dictionary with numerically sorted lists of ExPASy identifiers for each kind of change:
+
+     - ``added``: present in the new release but not the old one
+     - ``deleted``: present in the old release but deleted or missing from the new one
+     - ``transferred``: present in the old release but transferred in the new one
+     - ``descriptions``: present in both, with a changed description
+     - ``synonyms``: present in both, with changed synonyms
+     - ``prosites``: present in both, with changed ProSite links
+     - ``proteins``: present in both, with changed UniProt links
+    """
+    old_ids = set(old.descriptions)
+    new_ids = set(new.descriptions)
+    removed_ids = old_ids - new_ids
+    kept_ids = old_ids & new_ids
+
+    return {
+        'added': _sorted(new_ids - old_ids),
+        'deleted': _sorted(removed_ids - new.transferred),
+        'transferred': _sorted(removed_ids & new.transferred),
+        'descriptions': _sorted(
+            expasy_id
+            for expasy_id in kept_ids
+            if old.descriptions[expasy_id] != new.descriptions[expasy_id]
+        ),
+        'synonyms': _get_changed_links(old.synonyms, new.synonyms, kept_ids),
+        'prosites': _get_changed_links(old.prosites, new.prosites, kept_ids),
+        'proteins': _get_changed_links(old.proteins, new.proteins, kept_ids),
+    }
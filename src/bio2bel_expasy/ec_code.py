@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""A parsed, interned value type for Enzyme Commission codes.
+
+:class:`ECCode` is a :class:`str` holding the canonical form of a code, like ``1.1.1.-``, so it can be used anywhere
+the package used code strings before (as a dictionary key, graph node, or database value). It is parsed only once:
+constructing the same code again, from any spelling, returns the same instance, and its numbers, level, parent, and
+ancestors are computed when it is first built. Only canonical forms are kept, so codes parsed from arbitrary input don't
+grow the table with every spelling they come in.
+
+>>> from bio2bel_expasy.ec_code import ECCode
+>>> code = ECCode('1. 1. 1.2')
+>>> code
+ECCode('1.1.1.2')
+>>> code.parent
+ECCode('1.1.1.-')
+>>> code.level
+4
+>>> sorted(map(ECCode, ['1.10.-.-', '1.2.-.-']))
+[ECCode('1.2.-.-'), ECCode('1.10.-.-')]
+"""
+
+from typing import ClassVar, Dict, Optional, Tuple
+
+__all__ = [
+    'ECCode',
+]
+
+
+def _parse(value: str) -> Tuple[Tuple[int, ...], bool]:
+    """Parse the numbers of a code and whether its last number is preliminary."""
+    parts = value.replace(' ', '').split('.')
+    if not 1 <= len(parts) <= 4:
+        raise ValueError(f'invalid EC code: {value!r}')
+
+    numbers = []
+    preliminary = False
+    for i, part in enumerate(parts):
+        if part == '-':
+            if any(later != '-' for later in parts[i + 1:]):
+                raise ValueError(f'invalid EC code: {value!r}')
+            break
+        if i == 3 and part.startswith('n'):
+            part = part[1:]
+            preliminary = True
+        if not part.isdigit():
+            raise ValueError(f'invalid EC code: {value!r}')
+        numbers.append(int(part))
+
+    if not numbers:
+        raise ValueError(f'invalid EC code: {value!r}')
+
+    return tuple(numbers), preliminary
+
+
+def _format(numbers: Tuple[int, ...], preliminary: bool) -> str:
+    parts = [str(number) for number in numbers]
+    if preliminary:
+        parts[3] = f'n{parts[3]}'
+    parts.extend('-' for _ in range(4 - len(numbers)))
+    return '.'.join(parts)
+
+
+class ECCode(str):
+    """An interned Enzyme Commission code in its canonical form."""
+
+    #: Maps the canonical form of every code built so far to its interned code
+    _instances: ClassVar[Dict[str, 'ECCode']] = {}
+
+    numbers: Tuple[int, ...]
+    preliminary: bool
+    parent: Optional['ECCode']
+    ancestors: Tuple['ECCode', ...]
+    #: A tuple that orders codes numerically. Pass ``key=attrgetter('sort_key')`` when sorting many codes, which is
+    #: much faster than comparing them pairwise.
+    sort_key: Tuple[int, ...]
+
+    def __new__(cls, value: str) -> 'ECCode':
+        """Get the interned code for the given string.
+
+        :param value: An EC code, like ``1.1.1.2``, ``1. 1. 1.-``, or ``1.1.1.n2``
+        :raises ValueError: if the string is not a valid EC code
+        """
+        if isinstance(value, ECCode):
+            return value
+        if not isinstance(value, str):
+            raise ValueError(f'invalid EC code: {value!r}')
+
+        code = cls._instances.get(value)
+        if code is not None:
+            return code
+
+        numbers, preliminary = _parse(value)
+        return cls._from_numbers(numbers, preliminary)
+
+    @classmethod
+    def _from_numbers(cls, numbers: Tuple[int, ...], preliminary: bool = False) -> 'ECCode':
+        canonical = _format(numbers, preliminary)
+        code = cls._instances.get(canonical)
+        if code is not None:
+            return code
+
+        code = str.__new__(cls, canonical)
+        code.numbers = numbers
+        code.preliminary = preliminary
+        code.sort_key = numbers[:3] + (0,) * (3 - len(numbers[:3])) + (int(preliminary),) + numbers[3:]
+        if 1 < len(numbers):
+            code.parent = cls._from_numbers(numbers[:-1])
+            code.ancestors = (code.parent,) + code.parent.ancestors
+        else:
+            code.parent = None
+            code.ancestors = ()
+
+        cls._instances[canonical] = code
+        return code
+
+    @property
+    def level(self) -> int:
+        """Return the level of this code in the hierarchy, from 1 for classes to 4 for entries."""
+        return len(self.numbers)
+
+    def is_ancestor_of(self, other: 'ECCode') -> bool:
+        """Return if this code is a (strict) ancestor of the other code."""
+        return self.level < other.level and other.numbers[:self.level] == self.numbers
+
+    def __reduce__(self):
+        return ECCode, (str(self),)
+
+    def __repr__(self):
+        return f'ECCode({str.__repr__(self)})'
+
+    # str defines these, so they need to be overridden to sort numerically rather than lexically
+
+    def __lt__(self, other):
+        if isinstance(other, ECCode):
+            return self.sort_key < other.sort_key
+        return str.__lt__(self, other)
+
+    def __le__(self, other):
+        if isinstance(other, ECCode):
+            return self.sort_key <= other.sort_key
+        return str.__le__(self, other)
+
+    def __gt__(self, other):
+        if isinstance(other, ECCode):
+            return self.sort_key > other.sort_key
+        return str.__gt__(self, other)
+
+    def __ge__(self, other):
+        if isinstance(other, ECCode):
+            return self.sort_key >= other.sort_key
+        return str.__ge__(self, other)
+
+    __hash__ = str.__hash__
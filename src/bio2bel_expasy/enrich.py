@@ -3,16 +3,18 @@
 """Convenient wrapper functions for the manager."""
 
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
 from pybel import BELGraph
 from .manager import Manager
+from .parallel import EnrichmentReport
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     'enrich_prosite_classes',
     'enrich_enzymes',
+    'enrich_graphs',
 ]
 
 
@@ -30,3 +32,15 @@ def enrich_enzymes(graph: BELGraph, manager: Optional[Manager] = None) -> None:
         manager = Manager()
 
     return manager.enrich_enzymes(graph)
+
+
+def enrich_graphs(
+    graphs: Iterable[BELGraph],
+    manager: Optional[Manager] = None,
+    workers: Optional[int] = None,
+) -> EnrichmentReport:
+    """Enrich the enzymes in each of the graphs, in place, optionally in parallel processes sharing a snapshot."""
+    if manager is None:
+        manager = Manager()
+
+    return manager.enrich_graphs(graphs, workers=workers)
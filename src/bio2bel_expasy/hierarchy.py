@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+"""An index over the EC hierarchy for constant-time ancestry checks and linear-time descendant lookups.
+
+The codes of a release are laid out in pre-order, with the children of each code sorted numerically, so that the
+descendants of every code form a contiguous run right after it. Each code is labeled with its position and with the
+position just past its last descendant, which gives nested intervals:
+
+- ``is_ancestor(a, b)`` checks that the position of ``b`` falls within the interval of ``a``, in O(1)
+- ``descendants(a)`` slices the interval of ``a``, in O(k) for k descendants
+- ``ancestors(b)`` follows an array of parent positions, in O(depth)
+
+The labels are stored in :class:`array.array` so the index for a full release takes a few hundred kilobytes, and the
+index built from the files is persisted with :func:`bio2bel_expasy.parser.cache.write_cache`.
+"""
+
+import logging
+from array import array
+from collections import defaultdict
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from .constants import EXPASY_HIERARCHY_PATH
+from .ec_code import ECCode
+from .parser.cache import read_cache, write_cache
+from .parser.database import download_expasy_database, iter_expasy_database
+from .parser.tree import download_expasy_tree, get_expasy_tree
+
+__all__ = [
+    'HierarchyIndex',
+    'get_expasy_hierarchy',
+    'get_persisted_hierarchy',
+]
+
+log = logging.getLogger(__name__)
+
+_sort_key = attrgetter('sort_key')
+
+
+class HierarchyIndex:
+    """A nested-interval index over a set of EC codes."""
+
+    __slots__ = ('codes', '_position', '_end', '_parent')
+
+    def __init__(self, codes: Sequence[str], end: array, parent: array) -> None:
+        """Build an index from its pre-order labels. Use :meth:`from_codes` to build one from a set of codes.
+
+        :param codes: The codes in pre-order
+        :param end: For each code, the position just past its last descendant
+        :param parent: For each code, the position of its parent, or -1 for roots
+        """
+        self.codes = tuple(map(ECCode, codes))
+        self._position = {
+            code: position
+            for position, code in enumerate(self.codes)
+        }
+        self._end = end
+        self._parent = parent
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> 'HierarchyIndex':
+        """Build an index over the given codes.
+
+        Each code is placed under its nearest ancestor that is also in the given codes, or as a root if it has none.
+        """
+        codes = set(map(ECCode, codes))
+        children = defaultdict(list)
+        roots = []
+        for code in codes:
+            parent = next((ancestor for ancestor in code.ancestors if ancestor in codes), None)
+            if parent is None:
+                roots.append(code)
+            else:
+                children[parent].append(code)
+
+        ordered = []
+        end = array('i', [0] * len(codes))
+        parent = array('i', [-1] * len(codes))
+
+        # iterative depth-first traversal so the depth of the tree never matters. A code of None marks leaving the
+        # subtree of the code at the given position.
+        stack = [(code, -1) for code in sorted(roots, key=_sort_key, reverse=True)]
+        while stack:
+            code, parent_position = stack.pop()
+            if code is None:
+                end[parent_position] = len(ordered)
+                continue
+
+            position = len(ordered)
+            ordered.append(code)
+            parent[position] = parent_position
+            stack.append((None, position))
+            stack.extend(
+                (child, position)
+                for child in sorted(children[code], key=_sort_key, reverse=True)
+            )
+
+        return cls(ordered, end, parent)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._position
+
+    def __iter__(self) -> Iterator[ECCode]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """Return if the first code is a strict ancestor of the second, in O(1)."""
+        ancestor_position = self._position.get(ancestor)
+        descendant_position = self._position.get(descendant)
+        if ancestor_position is None or descendant_position is None:
+            return False
+        return ancestor_position < descendant_position < self._end[ancestor_position]
+
+    def descendants(self, code: str) -> Sequence[ECCode]:
+        """Return the strict descendants of the code in pre-order, or an empty sequence if it is not indexed."""
+        position = self._position.get(code)
+        if position is None:
+            return ()
+        return self.codes[position + 1:self._end[position]]
+
+    def children(self, code: str) -> List[ECCode]:
+        """Return the direct children of the code in numeric order."""
+        position = self._position.get(code)
+        if position is None:
+            return []
+
+        rv = []
+        child_position = position + 1
+        while child_position < self._end[position]:
+            rv.append(self.codes[child_position])
+            child_position = self._end[child_position]
+        return rv
+
+    def parent(self, code: str) -> Optional[ECCode]:
+        """Return the parent of the code, if it has one."""
+        position = self._position.get(code)
+        if position is None or self._parent[position] == -1:
+            return
+        return self.codes[self._parent[position]]
+
+    def ancestors(self, code: str) -> List[ECCode]:
+        """Return the ancestors of the code, from its parent up to its class."""
+        rv = []
+        position = self._position.get(code)
+        if position is None:
+            return rv
+
+        position = self._parent[position]
+        while position != -1:
+            rv.append(self.codes[position])
+            position = self._parent[position]
+        return rv
+
+    def to_state(self):
+        """Return a flat state that can be serialized with :mod:`marshal`."""
+        return [str(code) for code in self.codes], self._end.tobytes(), self._parent.tobytes()
+
+    @classmethod
+    def from_state(cls, state) -> 'HierarchyIndex':
+        """Build an index from the state returned by :meth:`to_state`."""
+        codes, end_bytes, parent_bytes = state
+        end, parent = array('i'), array('i')
+        end.frombytes(end_bytes)
+        parent.frombytes(parent_bytes)
+        return cls(codes, end, parent)
+
+
+def get_expasy_hierarchy(
+    tree_path: Optional[str] = None,
+    database_path: Optional[str] = None,
+    force_download: bool = False,
+) -> HierarchyIndex:
+    """Get the index over the classes of the ExPASy tree and the live entries of the ExPASy database.
+
+    When no paths are given, the index is cached at :data:`bio2bel_expasy.constants.EXPASY_HIERARCHY_PATH` and
+    rebuilt automatically when either downloaded file changes.
+
+    :param tree_path: An optional path to the ExPASy tree file
+    :param database_path: An optional path to the ExPASy database file
+    :param force_download: True to force download resources
+    """
+    def get_codes() -> List[str]:
+        tree = get_expasy_tree(path=tree_path, force_download=force_download)
+        entry_ids = (
+            entry.expasy_id
+            for entry in iter_expasy_database(path=database_path, force_download=force_download)
+            if not entry.deleted and not entry.transferred
+        )
+        return list(tree) + list(entry_ids)
+
+    if tree_path is None and database_path is None:
+        tree_path = download_expasy_tree(force_download=force_download)
+        database_path = download_expasy_database(force_download=force_download)
+        return get_persisted_hierarchy(tree_path, database_path, get_codes)
+
+    return HierarchyIndex.from_codes(get_codes())
+
+
+def get_persisted_hierarchy(
+    tree_path: str,
+    database_path: str,
+    get_codes: Callable[[], Iterable[str]],
+) -> HierarchyIndex:
+    """Load the index over the downloaded files from :data:`bio2bel_expasy.constants.EXPASY_HIERARCHY_PATH`.
+
+    If it is missing or stale, it is built from the codes and persisted for the next time.
+
+    :param tree_path: The path of the downloaded ExPASy tree file
+    :param database_path: The path of the downloaded ExPASy database file
+    :param get_codes: A function that returns the classes of the tree and the live entries of the database, only
+     called when the index is rebuilt
+    """
+    state = read_cache(EXPASY_HIERARCHY_PATH, [tree_path, database_path])
+    if state is not None:
+        return HierarchyIndex.from_state(state)
+
+    hierarchy = HierarchyIndex.from_codes(get_codes())
+    write_cache(EXPASY_HIERARCHY_PATH, [tree_path, database_path], hierarchy.to_state())
+    return hierarchy
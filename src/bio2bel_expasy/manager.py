@@ -3,26 +3,67 @@
 """Manager for Bio2BEL ExPASy."""
 
 import logging
-from typing import List, Mapping, Optional
-
+from collections import defaultdict
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar
+
+import networkx as nx
+from sqlalchemy import Table, and_, or_, select, tuple_
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from tqdm import tqdm
 
 from bio2bel import AbstractManager
 from bio2bel.manager.flask_manager import FlaskMixin
 from bio2bel.manager.namespace_manager import BELNamespaceManagerMixin
 from pybel import BELGraph
-from pybel.constants import IS_A, NAME, NAMESPACE
+from pybel.constants import IDENTIFIER, NAME, NAMESPACE
 from pybel.dsl import BaseEntity
 from pybel.manager.models import Namespace, NamespaceEntry
+from .bulk import ReleaseRows, TABLES, get_closure_rows
 from .constants import MODULE_NAME
-from .models import Base, Enzyme, Prosite, Protein, enzyme_prosite, enzyme_protein
-from .parser.database import get_expasy_database, ID, DE, PR, DR
-from .parser.tree import get_expasy_tree, give_edge, normalize_expasy_id
+from .delta import ReleaseState, diff_releases, get_release_state
+from .ec_code import ECCode
+from .hierarchy import HierarchyIndex
+from .models import (
+    Base, Checkpoint, ENZYME_NUMERIC_ORDER, Enzyme, Prosite, Protein, Synonym, clear_node_caches, enzyme_closure,
+    enzyme_prosite, enzyme_protein,
+)
+from .parallel import EnrichmentReport, enrich_graphs
+from .parser.cache import get_source_fingerprint
+from .parser.database import download_expasy_database, iter_expasy_database
+from .parser.records import ExpasyEntry
+from .parser.tree import download_expasy_tree, get_expasy_tree
+from .postgres import copy_release, get_setval_statements, is_copy_supported
+from .read_cache import CacheInfo, EnzymeRecord, LRUCache, PrositeRecord, ProteinRecord
+from .search import drop_search_index, has_search_index, is_search_supported, rebuild_search_index, search
+from .snapshot import Snapshot
+from .sqlite import bulk_load_profile, executemany, is_sqlite
+from .utils import chunked, get_loader_options
 
 __all__ = ['Manager']
 
 log = logging.getLogger(__name__)
 
+X = TypeVar('X')
+
+
+def _get_number_values(code: ECCode, after: bool = False) -> List:
+    """Get the values of the columns in :data:`bio2bel_expasy.models.ENZYME_NUMERIC_ORDER` for the code.
+
+    :param after: If true, get the values that sort right after the code and everything below it instead
+    """
+    columns = Enzyme.get_number_columns(code)
+    values = [columns[column.key] for column in ENZYME_NUMERIC_ORDER]
+    if after:
+        values[code.level - 1 if code.level < 4 else -1] += 1
+    return values
+
+
+def _escape_like(text: str) -> str:
+    """Escape the wildcards of a ``LIKE`` pattern in the text, with a backslash, so they match themselves."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 
 class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
     """Creates a connection to database and a persistent session using SQLAlchemy."""
@@ -39,13 +80,97 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
     identifiers_namespace = 'ec-code'
     identifiers_url = 'http://identifiers.org/ec-code/'
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, cache_size: int = 1024, cache_ttl: Optional[float] = None, **kwargs):
+        """Connect to the database.
+
+        :param cache_size: The number of records held by the cache of :meth:`get_enzyme_record`,
+         :meth:`get_prosite_record`, and :meth:`get_protein_record`. Zero disables it.
+        :param cache_ttl: If given, the number of seconds after which a cached record is looked up again, and the
+         index of :meth:`get_hierarchy` is built again
+        """
         super().__init__(*args, **kwargs)
 
         #: Maps canonicalized ExPASy enzyme identifiers to their SQLAlchemy models
         self.id_enzyme = {}
         self.id_prosite = {}
         self.id_uniprot = {}
+        #: The models whose identity maps hold every row of their table, so a miss means the row doesn't exist
+        self._warm_models = set()
+
+        #: The index over the enzymes in the database, built on first use by :meth:`get_hierarchy`
+        self._hierarchy: Optional[HierarchyIndex] = None
+        #: When the index was built, by the clock of the read cache
+        self._hierarchy_built = 0.0
+
+        #: Whether the database supports the full-text index, checked on first use by :meth:`search_enzymes`
+        self._search_supported: Optional[bool] = None
+
+        #: Whether the full-text index was found. It isn't there until a release is loaded, so only finding it sticks.
+        self._search_indexed = False
+
+        #: Caches the immutable records of the read-side lookups. Cleared whenever the database is loaded or updated.
+        self.read_cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def get_hierarchy(self) -> HierarchyIndex:
+        """Get the nested-interval index over the enzymes in the database, building it with one query if needed.
+
+        Like the records of the read cache, the index is built again after ``cache_ttl`` seconds, if it was given,
+        so changes made to the database by other processes are seen, and whenever this manager loads or updates it.
+        """
+        ttl, timer = self.read_cache.ttl, self.read_cache.timer
+        if self._hierarchy is None or (ttl is not None and ttl <= timer() - self._hierarchy_built):
+            expasy_ids = [expasy_id for expasy_id, in self.session.query(Enzyme.expasy_id)]
+            self._hierarchy = HierarchyIndex.from_codes(expasy_ids)
+            self._hierarchy_built = timer()
+        return self._hierarchy
+
+    def warm_identity_maps(self) -> None:
+        """Fill the identity maps with every enzyme, ProSite, and protein in the database, with one query per table.
+
+        The children, synonyms, ProSites, and proteins of the enzymes are loaded along with them, in chunks, so adding
+        to them does not load them one enzyme at a time.
+
+        Until they are cleared, :meth:`get_or_create_enzyme`, :meth:`get_or_create_prosite`, and
+        :meth:`get_or_create_protein` then never have to query the database.
+        """
+        enzymes = self.session.query(Enzyme).options(
+            selectinload(Enzyme.children),
+            selectinload(Enzyme.synonyms),
+            selectinload(Enzyme.prosites),
+            selectinload(Enzyme.proteins),
+        )
+        for query, identity_map, key in [
+            (enzymes, self.id_enzyme, 'expasy_id'),
+            (self.session.query(Prosite), self.id_prosite, 'prosite_id'),
+            (self.session.query(Protein), self.id_uniprot, 'accession_number'),
+        ]:
+            identity_map.update(
+                (getattr(instance, key), instance)
+                for instance in query
+            )
+            self._warm_models.add(query.column_descriptions[0]['type'])
+
+    def clear_identity_maps(self) -> None:
+        """Clear the identity maps, like after a commit expires the models in them."""
+        self.id_enzyme.clear()
+        self.id_prosite.clear()
+        self.id_uniprot.clear()
+        self._warm_models.clear()
+
+    def _reset_caches(self) -> None:
+        """Forget everything derived from the content of the database, after it was loaded or updated."""
+        self.clear_identity_maps()
+        self._hierarchy = None
+        self._search_indexed = False
+        self.read_cache.clear()
+        clear_node_caches()
+
+    def drop_all(self, check_first: bool = True):
+        """Drop all tables from the database, including the search index, and forget the cached lookups."""
+        with self.engine.begin() as connection:
+            drop_search_index(connection)
+        super().drop_all(check_first=check_first)
+        self._reset_caches()
 
     def is_populated(self) -> bool:
         """Check if the database is already populated."""
@@ -89,7 +214,7 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
             self.session.add(enzyme)
             return enzyme
 
-        enzyme = self.get_enzyme_by_id(expasy_id)
+        enzyme = None if Enzyme in self._warm_models else self.get_enzyme_by_id(expasy_id)
 
         if enzyme is None:
             enzyme = self.id_enzyme[expasy_id] = Enzyme(
@@ -108,7 +233,7 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
             self.session.add(prosite)
             return prosite
 
-        prosite = self.get_prosite_by_id(prosite_id)
+        prosite = None if Prosite in self._warm_models else self.get_prosite_by_id(prosite_id)
 
         if prosite is None:
             prosite = self.id_prosite[prosite_id] = Prosite(prosite_id=prosite_id, **kwargs)
@@ -129,7 +254,10 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
             self.session.add(protein)
             return protein
 
-        protein = self.get_protein_by_uniprot_id(uniprot_id=accession_number)
+        if Protein in self._warm_models:
+            protein = None
+        else:
+            protein = self.get_protein_by_uniprot_id(uniprot_id=accession_number)
 
         if protein is None:
             protein = self.id_uniprot[accession_number] = Protein(
@@ -141,23 +269,125 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
 
         return protein
 
-    def populate(self, tree_path: Optional[str] = None, database_path: Optional[str] = None) -> None:
+    def populate(
+        self,
+        tree_path: Optional[str] = None,
+        database_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        copy: bool = False,
+        sqlite_profile: bool = False,
+    ) -> None:
         """Populate the database..
 
         :param tree_path:
         :param database_path:
+        :param batch_size: If given, commits after each batch of this many classes or entries and resumes an
+         interrupted population of the same release. See :meth:`populate_database`.
+        :param copy: If true and the database is PostgreSQL, replaces its content with the release using ``COPY``.
+         See :meth:`populate_copy`. Otherwise, falls back to the other loaders.
+        :param sqlite_profile: If true and the database is an empty SQLite database, loads the release in one
+         transaction with the settings from :func:`bio2bel_expasy.sqlite.bulk_load_profile`.
+        """
+        if copy:
+            if is_copy_supported(self.engine):
+                self.populate_copy(tree_path=tree_path, database_path=database_path)
+                return
+            log.warning('COPY is not supported by %s, so loading with the ORM', self.engine.dialect.name)
+
+        if sqlite_profile and is_sqlite(self.engine) and 0 == self.count_enzymes():
+            self._populate_sqlite_profile(tree_path=tree_path, database_path=database_path)
+            return
+
+        self.populate_tree(path=tree_path, batch_size=batch_size)
+        self.populate_database(path=database_path, batch_size=batch_size)
+
+    def _populate_sqlite_profile(self, tree_path: Optional[str] = None, database_path: Optional[str] = None) -> None:
+        """Load a release into an empty SQLite database with the bulk loaders, in one transaction."""
+        tree = get_expasy_tree(path=tree_path)
+        entries = iter_expasy_database(path=database_path)
+
+        with bulk_load_profile(self.session, TABLES):
+            self._bulk_populate_tree(tree)
+            self._bulk_populate_database(entries)
+            self.session.flush()
+            self._rebuild_closure()
+            self._rebuild_search_index()
+
+        self._reset_caches()
+
+    def populate_copy(
+        self,
+        tree_path: Optional[str] = None,
+        database_path: Optional[str] = None,
+        force_download: bool = False,
+    ) -> Mapping[str, int]:
+        """Replace the content of a PostgreSQL database with a release, using ``COPY`` and an atomic swap.
+
+        See :func:`bio2bel_expasy.postgres.copy_release`.
+
+        :param tree_path: A custom path to the ExPASy tree file
+        :param database_path: A custom path to the ExPASy database file
+        :param force_download: If true, overwrites previously cached files
+        :return: The number of rows copied into each table
         """
-        self.populate_tree(path=tree_path)
-        self.populate_database(path=database_path)
+        tree = get_expasy_tree(path=tree_path, force_download=force_download)
+        entries = iter_expasy_database(path=database_path, force_download=force_download)
+
+        self.session.close()  # release the locks the session holds so the tables can be swapped
+        counts = copy_release(self.engine, tree, tqdm(entries, desc='Database'))
 
-    def populate_tree(self, path: Optional[str] = None, force_download: bool = False) -> None:
+        self._rebuild_search_index()
+        self.session.commit()
+        self._reset_caches()
+        return counts
+
+    def populate_tree(
+        self,
+        path: Optional[str] = None,
+        force_download: bool = False,
+        bulk: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
         """Download and populate the ExPASy tree.
 
         :param path: A custom url to download
         :param force_download: If true, overwrites a previously cached file
+        :param bulk: If true, inserts the classes with Core statements and pre-assigned keys, which is only possible
+         when no enzymes are loaded yet. Defaults to doing so if the database is empty.
+        :param batch_size: If given, commits after each batch of this many classes, parents first, and resumes from
+         the last committed batch. See :meth:`populate_database`.
         """
+        if batch_size is not None:
+            if path is None:
+                path = download_expasy_tree(force_download=force_download)
+            tree = get_expasy_tree(path=path)
+            classes = (
+                (expasy_id, (expasy_id, tree.nodes[expasy_id]['description']))
+                for expasy_id in sorted(tree, key=attrgetter('sort_key'))
+            )
+            self._populate_in_batches('tree', path, classes, self._load_class_batch, batch_size)
+            return
+
         tree = get_expasy_tree(path=path, force_download=force_download)
 
+        if bulk is None:
+            bulk = 0 == self.count_enzymes()
+
+        if bulk:
+            self._bulk_populate_tree(tree)
+        else:
+            self.warm_identity_maps()
+            self._populate_tree_models(tree)
+
+        self.session.flush()
+        self._rebuild_closure()
+        self._rebuild_search_index()
+
+        log.info("committing")
+        self.session.commit()
+        self._reset_caches()
+
+    def _populate_tree_models(self, tree: nx.DiGraph) -> None:
         for expasy_id, data in tqdm(tree.nodes(data=True), desc='Classes', total=tree.number_of_nodes()):
             self.get_or_create_enzyme(
                 expasy_id=expasy_id,
@@ -167,47 +397,537 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         for parent_id, child_id in tqdm(tree.edges(), desc='Tree', total=tree.number_of_edges()):
             parent = self.id_enzyme[parent_id]
             child = self.id_enzyme[child_id]
-            parent.children.append(child)
-
-        log.info("committing")
-        self.session.commit()
-
-    def populate_database(self, path: Optional[str] = None, force_download: bool = False) -> None:
+            if child.parent is not parent:
+                parent.children.append(child)
+
+    def _bulk_populate_tree(self, tree: nx.DiGraph) -> None:
+        """Insert the classes of the tree into an empty enzyme table, parents first."""
+        self._insert_rows(ReleaseRows().iter_class_rows(tree))
+        self._reset_sequences()
+
+    def populate_database(
+        self,
+        path: Optional[str] = None,
+        force_download: bool = False,
+        workers: Optional[int] = None,
+        bulk: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
         """Populate the ExPASy database.
 
+        Entries are streamed from the file one at a time so the whole release is never held in memory.
+
         :param path: A custom url to download
         :param force_download: If true, overwrites a previously cached file
+        :param workers: The number of processes with which to parse the file. Defaults to parsing serially.
+        :param bulk: If true, inserts the entries, ProSites, proteins, and their links with batched Core statements
+         and pre-assigned keys, which is only possible when no entries are loaded yet. Defaults to doing so if
+         nothing but the tree has been loaded.
+        :param batch_size: If given, commits after each batch of this many entries, along with a checkpoint of the
+         release and the last entry committed. If the population of the same release is interrupted, calling this
+         again skips the committed entries. Each batch looks up the rows it links to, so memory stays flat and
+         loading into a database with content is safe. To move to a new release, use :meth:`update`.
         """
-        data_dict = get_expasy_database(path=path, force_download=force_download)
+        if batch_size is not None:
+            if path is None:
+                path = download_expasy_database(force_download=force_download)
+            entries = (
+                (entry.expasy_id, entry)
+                for entry in iter_expasy_database(path=path, workers=workers)
+            )
+            self._populate_in_batches('database', path, entries, self._load_entry_batch, batch_size)
+            return
 
-        for data in tqdm(data_dict, desc='Database'):
-            if data['DELETED'] or data['TRANSFERRED']:
-                continue  # if both are false then proceed
+        entries = iter_expasy_database(path=path, force_download=force_download, workers=workers)
+
+        if bulk is None:
+            bulk = not self._has_entries()
+
+        if bulk:
+            self._bulk_populate_database(entries)
+        else:
+            self.warm_identity_maps()
+            self._populate_database_models(entries)
+
+        self.session.flush()
+        self._rebuild_closure()
+        self._rebuild_search_index()
+
+        log.info("committing")
+        self.session.commit()
+        self._reset_caches()
+
+    def _has_entries(self) -> bool:
+        """Check if any entries, ProSites, or proteins are loaded, beyond the classes of the tree."""
+        return any(
+            self.session.query(query.exists()).scalar()
+            for query in (
+                self.session.query(Enzyme).filter(Enzyme.expasy_id.notlike('%-')),
+                self.session.query(Prosite),
+                self.session.query(Protein),
+            )
+        )
 
-            expasy_id = data[ID]
+    def _populate_database_models(self, entries: Iterable[ExpasyEntry]) -> None:
+        for entry in tqdm(entries, desc='Database'):
+            if entry.deleted or entry.transferred:
+                continue  # if both are false then proceed
 
             enzyme = self.get_or_create_enzyme(
-                expasy_id=expasy_id,
-                description=data[DE]
+                expasy_id=entry.expasy_id,
+                description=entry.name,
             )
 
-            parent_id, _ = give_edge(data[ID])
-            enzyme.parent = self.get_enzyme_by_id(parent_id)
+            parent_id = entry.parent_id
+            enzyme.parent = self.id_enzyme.get(parent_id)
+            if enzyme.parent is None and Enzyme not in self._warm_models:
+                enzyme.parent = self.get_enzyme_by_id(parent_id)
 
-            for prosite_id in data.get(PR, []):
+            names = {synonym.name for synonym in enzyme.synonyms}
+            for name in dict.fromkeys(entry.synonyms):
+                if name not in names:
+                    enzyme.synonyms.append(Synonym(name=name))
+
+            # an entry can list the same cross-reference twice, but it can only be linked once
+            for prosite_id in dict.fromkeys(entry.prosite_ids):
                 prosite = self.get_or_create_prosite(prosite_id)
                 enzyme.prosites.append(prosite)
 
-            for uniprot_data in data.get(DR, []):
+            accession_numbers = set()
+            for accession_number, entry_name in entry.proteins:
+                if accession_number in accession_numbers:
+                    continue
+                accession_numbers.add(accession_number)
                 protein = self.get_or_create_protein(
-                    accession_number=uniprot_data['accession_number'],
-                    entry_name=uniprot_data['entry_name']
+                    accession_number=accession_number,
+                    entry_name=entry_name,
                 )
                 enzyme.proteins.append(protein)
 
-        log.info("committing")
+    def _bulk_populate_database(self, entries: Iterable[ExpasyEntry]) -> None:
+        """Insert the entries with keys assigned in Python, so no row needs to be read back.
+
+        The keys of the classes already loaded are read with one query.
+        """
+        enzyme_pks = dict(self.session.query(Enzyme.expasy_id, Enzyme.id))
+        rows = ReleaseRows(enzyme_pks=enzyme_pks).iter_entry_rows(tqdm(entries, desc='Database'))
+        self._insert_rows(rows)
+        self._reset_sequences()
+
+    def _insert_rows(self, rows: Iterable[Tuple[Table, Mapping]]) -> None:
+        """Insert the rows with one statement per table, in an order that respects their foreign keys."""
+        rows_by_table = defaultdict(list)
+        for table, row in rows:
+            rows_by_table[table].append(row)
+
+        for table in TABLES:
+            if rows_by_table[table]:
+                log.info('inserting %d rows into %s', len(rows_by_table[table]), table.name)
+                if is_sqlite(self.engine):
+                    executemany(self.session, table, rows_by_table[table])
+                else:
+                    self.session.execute(table.insert(), rows_by_table[table])
+
+    def _populate_in_batches(
+        self,
+        source: str,
+        path: str,
+        items: Iterable[Tuple[str, X]],
+        load_batch: Callable[[List[X]], None],
+        batch_size: int,
+    ) -> None:
+        """Load the items in batches, each committed along with a checkpoint, skipping those already committed.
+
+        :param source: The name of the source, under which the checkpoint is stored
+        :param path: The path of the source file, whose hash identifies the release
+        :param items: Pairs of ExPASy identifiers and the items to load, in the same order every time
+        :param load_batch: A function that loads a list of items without committing
+        :param batch_size: The number of items per batch
+        :raises ValueError: if resuming, and the last committed identifier is not among the items
+        """
+        release = get_source_fingerprint(path)[2].hex()
+        checkpoint = self.session.query(Checkpoint).get(source)
+
+        if checkpoint is None or checkpoint.release != release:
+            checkpoint = Checkpoint(source=source, release=release, last_expasy_id=None, complete=False)
+        elif checkpoint.complete:
+            log.info('%s release %s is already loaded', source, release[:8])
+            return
+        elif checkpoint.last_expasy_id is not None:
+            log.info('resuming %s release %s after %s', source, release[:8], checkpoint.last_expasy_id)
+            items = iter(items)
+            for expasy_id, _ in items:
+                if expasy_id == checkpoint.last_expasy_id:
+                    break
+            else:  # everything would be skipped, and the release marked complete
+                raise ValueError(
+                    f'can not resume {source} release {release[:8]}: the last committed identifier, '
+                    f'{checkpoint.last_expasy_id}, is not in {path}',
+                )
+
+        for batch in tqdm(chunked(items, batch_size), desc=f'{source.capitalize()} batches'):
+            try:
+                load_batch([item for _, item in batch])
+            except Exception:
+                self.session.rollback()
+                raise
+            checkpoint.last_expasy_id = batch[-1][0]
+            self.session.add(checkpoint)
+            self.session.commit()
+            self.session.expunge_all()  # keep the session from growing with the release
+            self.read_cache.clear()  # the committed batch is visible, even if a later one fails
+
+        self._rebuild_closure()
+        self._rebuild_search_index()
+        checkpoint.complete = True
+        self.session.add(checkpoint)
+        self.session.commit()
+        self._reset_caches()
+
+    def _load_class_batch(self, classes: List[Tuple[str, str]]) -> None:
+        """Load a batch of (ExPASy identifier, description) pairs of classes, without committing."""
+        self._get_or_create_enzyme_pks(dict(classes))
+
+    def _load_entry_batch(self, entries: List[ExpasyEntry]) -> None:
+        """Load a batch of entries with their synonyms and link them to their ProSites and proteins, without committing."""
+        entries = [
+            entry
+            for entry in entries
+            if not entry.deleted and not entry.transferred
+        ]
+        enzyme_pks = self._get_or_create_enzyme_pks({
+            entry.expasy_id: entry.name
+            for entry in entries
+        })
+        prosite_pks = self._get_or_create_prosite_pks([
+            prosite_id
+            for entry in entries
+            for prosite_id in entry.prosite_ids
+        ])
+        protein_pks = self._get_or_create_protein_pks(
+            [pair for entry in entries for pair in entry.proteins],
+            rename=False,
+        )
+
+        self._insert_missing_links(Synonym.__table__, 'name', {
+            (enzyme_pks[entry.expasy_id], name)
+            for entry in entries
+            for name in entry.synonyms
+        })
+        self._insert_missing_links(enzyme_prosite, 'prosite_id', {
+            (enzyme_pks[entry.expasy_id], prosite_pks[prosite_id])
+            for entry in entries
+            for prosite_id in entry.prosite_ids
+        })
+        self._insert_missing_links(enzyme_protein, 'protein_id', {
+            (enzyme_pks[entry.expasy_id], protein_pks[pair])
+            for entry in entries
+            for pair in entry.proteins
+        })
+
+    def _get_or_create_enzyme_pks(self, descriptions: Mapping[str, str]) -> Dict[str, int]:
+        """Get a dictionary from the given ExPASy identifiers, and their parents, to primary keys.
+
+        Enzymes that are missing are created with the given descriptions, linked to their parents if they exist.
+        """
+        codes = list(map(ECCode, descriptions))
+        expasy_ids = set(codes).union(code.parent for code in codes if code.parent is not None)
+
+        rv = {}
+        for chunk in chunked(expasy_ids):
+            rv.update(self.session.query(Enzyme.expasy_id, Enzyme.id).filter(Enzyme.expasy_id.in_(chunk)))
+
+        for level in sorted({code.level for code in codes}):  # add parents before their children
+            enzymes = [
+                Enzyme(expasy_id=code, description=descriptions[code], parent_id=rv.get(code.parent))
+                for code in codes
+                if code.level == level and code not in rv
+            ]
+            self.session.add_all(enzymes)
+            self.session.flush()
+            rv.update((enzyme.expasy_id, enzyme.id) for enzyme in enzymes)
+
+        return rv
+
+    def _insert_missing_links(self, table: Table, column: str, rows: Set[Tuple[int, int]]) -> None:
+        """Insert the (enzyme primary key, other primary key) rows that are not yet in the association table."""
+        enzyme_pks = {enzyme_pk for enzyme_pk, _ in rows}
+        for chunk in chunked(enzyme_pks):
+            rows -= set(self.session.query(table.c.enzyme_id, table.c[column]).filter(table.c.enzyme_id.in_(chunk)))
+
+        if rows:
+            self.session.execute(table.insert(), [
+                {'enzyme_id': enzyme_pk, column: link_pk}
+                for enzyme_pk, link_pk in rows
+            ])
+
+    def _reset_sequences(self) -> None:
+        """Move the primary key sequences past the keys assigned by the bulk loaders, on databases that have them."""
+        if self.session.bind.dialect.name != 'postgresql':
+            return
+
+        for statement in get_setval_statements(self.engine):
+            self.session.execute(statement)
+
+    def _rebuild_closure(self) -> None:
+        """Fill the closure table from the parents of all enzymes, without committing."""
+        parents = dict(self.session.query(Enzyme.id, Enzyme.parent_id))
+        self.session.execute(enzyme_closure.delete())
+        self._insert_rows(
+            (enzyme_closure, row)
+            for row in get_closure_rows(parents, parents)
+        )
+
+    def _rebuild_search_index(self) -> None:
+        """Fill the full-text index over the names and synonyms of all enzymes, if the database supports it."""
+        if self._is_search_supported():
+            rebuild_search_index(self.session.connection())
+
+    def _is_search_supported(self) -> bool:
+        if self._search_supported is None:
+            self._search_supported = is_search_supported(self.engine)
+        return self._search_supported
+
+    def _is_search_indexed(self) -> bool:
+        """Check if the full-text index can be used, which needs it to have been built when a release was loaded."""
+        if not self._is_search_supported():
+            return False
+        if not self._search_indexed:
+            self._search_indexed = has_search_index(self.session.connection())
+        return self._search_indexed
+
+    def update(
+        self,
+        tree_path: Optional[str] = None,
+        database_path: Optional[str] = None,
+        force_download: bool = False,
+    ) -> Mapping[str, List[str]]:
+        """Update the database to a new release of ExPASy by applying only what changed since the loaded release.
+
+        The new release is compared with the contents of the database, read with one query per table, then added,
+        deleted, and transferred enzymes, changed descriptions, and changed ProSite and UniProt links are written in a
+        single transaction. ProSites and proteins that are no longer linked to any enzyme are removed so the result
+        matches a fresh :meth:`populate`.
+
+        :param tree_path: A custom path to the ExPASy tree file
+        :param database_path: A custom path to the ExPASy database file
+        :param force_download: If true, overwrites previously cached files
+        :return: The changes, as returned by :func:`bio2bel_expasy.delta.diff_releases`
+        """
+        tree = get_expasy_tree(path=tree_path, force_download=force_download)
+        entries = iter_expasy_database(path=database_path, force_download=force_download)
+        new = get_release_state(tree, entries)
+        old = self._get_loaded_state()
+        delta = diff_releases(old, new)
+
+        try:
+            self._apply_delta(old, new, delta)
+            self._rebuild_search_index()
+        except Exception:
+            self.session.rollback()
+            raise
+
         self.session.commit()
 
+        self._reset_caches()
+
+        log.info('updated: %s', {key: len(value) for key, value in delta.items()})
+        return delta
+
+    def _get_loaded_state(self) -> ReleaseState:
+        """Get the state of the release currently in the database."""
+        descriptions = dict(self.session.query(Enzyme.expasy_id, Enzyme.description))
+
+        prosites = defaultdict(set)
+        prosite_query = self.session.query(Enzyme.expasy_id, Prosite.prosite_id) \
+            .join(enzyme_prosite, Enzyme.id == enzyme_prosite.c.enzyme_id) \
+            .join(Prosite, Prosite.id == enzyme_prosite.c.prosite_id)
+        for expasy_id, prosite_id in prosite_query:
+            prosites[expasy_id].add(prosite_id)
+
+        proteins = defaultdict(set)
+        protein_query = self.session.query(Enzyme.expasy_id, Protein.accession_number, Protein.entry_name) \
+            .join(enzyme_protein, Enzyme.id == enzyme_protein.c.enzyme_id) \
+            .join(Protein, Protein.id == enzyme_protein.c.protein_id)
+        for expasy_id, accession_number, entry_name in protein_query:
+            proteins[expasy_id].add((accession_number, entry_name))
+
+        synonyms = defaultdict(set)
+        synonym_query = self.session.query(Enzyme.expasy_id, Synonym.name) \
+            .join(Synonym, Enzyme.id == Synonym.enzyme_id)
+        for expasy_id, name in synonym_query:
+            synonyms[expasy_id].add(name)
+
+        return ReleaseState(descriptions=descriptions, prosites=prosites, proteins=proteins, synonyms=synonyms)
+
+    def _apply_delta(self, old: ReleaseState, new: ReleaseState, delta: Mapping[str, List[str]]) -> None:
+        """Write the changes between the loaded release and the new release without committing."""
+        enzyme_pks = dict(self.session.query(Enzyme.expasy_id, Enzyme.id))
+
+        removed_pks = [enzyme_pks.pop(expasy_id) for expasy_id in delta['deleted'] + delta['transferred']]
+        for chunk in chunked(removed_pks):
+            self.session.execute(enzyme_closure.delete().where(or_(
+                enzyme_closure.c.ancestor_id.in_(chunk),
+                enzyme_closure.c.descendant_id.in_(chunk),
+            )))
+            self.session.execute(enzyme_prosite.delete().where(enzyme_prosite.c.enzyme_id.in_(chunk)))
+            self.session.execute(enzyme_protein.delete().where(enzyme_protein.c.enzyme_id.in_(chunk)))
+            self.session.execute(Synonym.__table__.delete().where(Synonym.enzyme_id.in_(chunk)))
+            self.session.execute(Enzyme.__table__.update().where(Enzyme.parent_id.in_(chunk)).values(parent_id=None))
+            self.session.execute(Enzyme.__table__.delete().where(Enzyme.id.in_(chunk)))
+
+        for expasy_id in delta['descriptions']:
+            self.session.execute(
+                Enzyme.__table__.update()
+                .where(Enzyme.id == enzyme_pks[expasy_id])
+                .values(description=new.descriptions[expasy_id])
+            )
+
+        added_pks = []
+        added_by_level = defaultdict(list)
+        for expasy_id in delta['added']:
+            code = ECCode(expasy_id)
+            added_by_level[code.level].append((code, code.parent))
+
+        for level in sorted(added_by_level):  # add parents before their children
+            enzymes = [
+                Enzyme(
+                    expasy_id=expasy_id,
+                    description=new.descriptions[expasy_id],
+                    parent_id=enzyme_pks.get(parent_id),
+                )
+                for expasy_id, parent_id in added_by_level[level]
+            ]
+            self.session.add_all(enzymes)
+            self.session.flush()
+            enzyme_pks.update((enzyme.expasy_id, enzyme.id) for enzyme in enzymes)
+            added_pks.extend(enzyme.id for enzyme in enzymes)
+
+        if added_pks:
+            parents = dict(self.session.query(Enzyme.id, Enzyme.parent_id))
+            self.session.execute(enzyme_closure.insert(), get_closure_rows(parents, added_pks))
+
+        linked_ids = set(delta['added'])
+        self._apply_link_delta(
+            enzyme_pks=enzyme_pks,
+            old=old.synonyms,
+            new=new.synonyms,
+            expasy_ids=linked_ids.union(delta['synonyms']),
+            table=Synonym.__table__,
+            column='name',
+            pks=lambda names: {name: name for name in names},  # a synonym is its own key
+        )
+        self._apply_link_delta(
+            enzyme_pks=enzyme_pks,
+            old=old.prosites,
+            new=new.prosites,
+            expasy_ids=linked_ids.union(delta['prosites']),
+            table=enzyme_prosite,
+            column='prosite_id',
+            pks=self._get_or_create_prosite_pks,
+        )
+        self._apply_link_delta(
+            enzyme_pks=enzyme_pks,
+            old=old.proteins,
+            new=new.proteins,
+            expasy_ids=linked_ids.union(delta['proteins']),
+            table=enzyme_protein,
+            column='protein_id',
+            pks=self._get_or_create_protein_pks,
+        )
+
+        self.session.execute(
+            Prosite.__table__.delete().where(~Prosite.id.in_(select([enzyme_prosite.c.prosite_id])))
+        )
+        self.session.execute(
+            Protein.__table__.delete().where(~Protein.id.in_(select([enzyme_protein.c.protein_id])))
+        )
+
+    def _apply_link_delta(self, enzyme_pks, old, new, expasy_ids, table, column, pks) -> None:
+        """Insert and delete rows in an association table for the links that changed."""
+        added, removed = [], []
+        for expasy_id in expasy_ids:
+            old_links = old.get(expasy_id, set())
+            new_links = new.get(expasy_id, set())
+            added.extend((expasy_id, link) for link in new_links - old_links)
+            removed.extend((expasy_id, link) for link in old_links - new_links)
+
+        # the added links come last so that the new names of renamed proteins win
+        link_pks = pks([link for _, link in chain(removed, added)])
+
+        for expasy_id, link in removed:
+            self.session.execute(table.delete().where(and_(
+                table.c.enzyme_id == enzyme_pks[expasy_id],
+                table.c[column] == link_pks[link],
+            )))
+
+        # a link whose protein was only renamed is both removed and added, so insert after deleting
+        rows = {
+            (enzyme_pks[expasy_id], link_pks[link])
+            for expasy_id, link in added
+        }
+        if rows:
+            self.session.execute(table.insert(), [
+                {'enzyme_id': enzyme_pk, column: link_pk}
+                for enzyme_pk, link_pk in rows
+            ])
+
+    def _get_or_create_prosite_pks(self, prosite_ids: List[str]) -> Dict[str, int]:
+        """Get a dictionary from ProSite identifiers to primary keys, creating the ProSites that are missing."""
+        prosite_ids = set(prosite_ids)
+        rv = {}
+        for chunk in chunked(prosite_ids):
+            rv.update(self.session.query(Prosite.prosite_id, Prosite.id).filter(Prosite.prosite_id.in_(chunk)))
+
+        missing = prosite_ids - set(rv)
+        if missing:
+            self.session.execute(Prosite.__table__.insert(), [{'prosite_id': prosite_id} for prosite_id in missing])
+            for chunk in chunked(missing):
+                rv.update(self.session.query(Prosite.prosite_id, Prosite.id).filter(Prosite.prosite_id.in_(chunk)))
+        return rv
+
+    def _get_or_create_protein_pks(
+        self,
+        proteins: List[Tuple[str, str]],
+        rename: bool = True,
+    ) -> Dict[Tuple[str, str], int]:
+        """Get a dictionary from (accession number, entry name) pairs to primary keys.
+
+        Proteins that are missing are created and, if rename is true, proteins whose entry name changed are renamed to
+        the last name given for them. Otherwise, the first name given for a new protein is kept, like when populating.
+        """
+        entry_names = dict(proteins) if rename else dict(reversed(proteins))
+        accession_pks = {}
+        for chunk in chunked(entry_names):
+            query = self.session.query(Protein.accession_number, Protein.entry_name, Protein.id) \
+                .filter(Protein.accession_number.in_(chunk))
+            for accession_number, entry_name, pk in query:
+                accession_pks[accession_number] = pk
+                if rename and entry_names[accession_number] != entry_name:
+                    self.session.execute(
+                        Protein.__table__.update()
+                        .where(Protein.id == pk)
+                        .values(entry_name=entry_names[accession_number])
+                    )
+
+        # insert the missing proteins with one statement, then read their keys back
+        missing = [
+            {'accession_number': accession_number, 'entry_name': entry_name}
+            for accession_number, entry_name in entry_names.items()
+            if accession_number not in accession_pks
+        ]
+        if missing:
+            self.session.execute(Protein.__table__.insert(), missing)
+            for chunk in chunked(row['accession_number'] for row in missing):
+                query = self.session.query(Protein.accession_number, Protein.id) \
+                    .filter(Protein.accession_number.in_(chunk))
+                accession_pks.update(query)
+
+        return {
+            (accession_number, entry_name): accession_pks[accession_number]
+            for accession_number, entry_name in proteins
+        }
+
     def get_enzyme_by_id(self, expasy_id: str) -> Optional[Enzyme]:
         """Get an enzyme by its ExPASy identifier.
 
@@ -215,37 +935,296 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
 
         :param expasy_id: An ExPASy identifier. Example: 1.3.3.- or 1.3.3.19
         """
-        canonical_expasy_id = normalize_expasy_id(expasy_id)
-        return self.session.query(Enzyme).filter(Enzyme.expasy_id == canonical_expasy_id).one_or_none()
+        return self._get_enzyme(expasy_id)
+
+    def _get_enzyme(self, expasy_id: str, relationship=None, loading: Optional[str] = None) -> Optional[Enzyme]:
+        """Get an enzyme by its ExPASy identifier, loading the relationship with the given strategy."""
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return
+
+        return self.session.query(Enzyme) \
+            .filter(Enzyme.expasy_id == code) \
+            .options(*get_loader_options(loading, relationship)) \
+            .one_or_none()
+
+    def get_enzyme_record(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        """Get an immutable copy of an enzyme by its ExPASy identifier, from the read cache if possible.
+
+        Unlike :meth:`get_enzyme_by_id`, the result is not bound to the session, so it can be kept and shared.
+
+        :param expasy_id: An ExPASy identifier. Example: 1.3.3.- or 1.3.3.19
+        """
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return
+
+        return self.read_cache.get_or_load((Enzyme, code), self._load_enzyme_record)
 
-    def get_parent_by_expasy_id(self, expasy_id: str) -> Optional[Enzyme]:
+    def _load_enzyme_record(self, key) -> Optional[EnzymeRecord]:
+        enzyme = self.session.query(Enzyme) \
+            .options(joinedload(Enzyme.parent)) \
+            .filter(Enzyme.expasy_id == key[1]) \
+            .one_or_none()
+        if enzyme is not None:
+            return EnzymeRecord.from_model(enzyme)
+
+    def get_prosite_record(self, prosite_id: str) -> Optional[PrositeRecord]:
+        """Get an immutable copy of a ProSite entry and its enzymes, from the read cache if possible.
+
+        :param prosite_id: A ProSite identifier
+        """
+        return self.read_cache.get_or_load((Prosite, prosite_id), self._load_prosite_record)
+
+    def _load_prosite_record(self, key) -> Optional[PrositeRecord]:
+        prosite = self.session.query(Prosite) \
+            .options(selectinload(Prosite.enzymes)) \
+            .filter(Prosite.prosite_id == key[1]) \
+            .one_or_none()
+        if prosite is not None:
+            return PrositeRecord.from_model(prosite)
+
+    def get_protein_record(self, uniprot_id: str) -> Optional[ProteinRecord]:
+        """Get an immutable copy of a UniProt entry and its enzymes, from the read cache if possible.
+
+        :param uniprot_id: A UniProt accession number
+        """
+        return self.read_cache.get_or_load((Protein, uniprot_id), self._load_protein_record)
+
+    def _load_protein_record(self, key) -> Optional[ProteinRecord]:
+        protein = self.session.query(Protein) \
+            .options(selectinload(Protein.enzymes)) \
+            .filter(Protein.accession_number == key[1]) \
+            .one_or_none()
+        if protein is not None:
+            return ProteinRecord.from_model(protein)
+
+    def get_protein_records(self, uniprot_ids: Iterable[str]) -> Dict[str, ProteinRecord]:
+        """Get immutable copies of many UniProt entries and their enzymes, with a query per chunk of cache misses.
+
+        :param uniprot_ids: UniProt accession numbers
+        :return: A dictionary from the accession numbers that were found to their records
+        """
+        records = self.read_cache.get_or_load_many(
+            ((Protein, uniprot_id) for uniprot_id in uniprot_ids),
+            self._load_protein_records,
+        )
+        return {
+            key[1]: record
+            for key, record in records.items()
+            if record is not None
+        }
+
+    def _load_protein_records(self, keys: List[Tuple[type, str]]) -> Dict[Tuple[type, str], ProteinRecord]:
+        entry_names, expasy_ids = {}, defaultdict(list)
+        for chunk in chunked(uniprot_id for _, uniprot_id in keys):
+            query = self.session.query(Protein.accession_number, Protein.entry_name, Enzyme.expasy_id) \
+                .outerjoin(enzyme_protein, enzyme_protein.c.protein_id == Protein.id) \
+                .outerjoin(Enzyme, Enzyme.id == enzyme_protein.c.enzyme_id) \
+                .filter(Protein.accession_number.in_(chunk))
+            for accession_number, entry_name, expasy_id in query:
+                entry_names[accession_number] = entry_name
+                if expasy_id is not None:
+                    expasy_ids[accession_number].append(ECCode(expasy_id))
+
+        return {
+            (Protein, accession_number): ProteinRecord(
+                accession_number=accession_number,
+                entry_name=entry_name,
+                expasy_ids=tuple(sorted(expasy_ids[accession_number])),
+            )
+            for accession_number, entry_name in entry_names.items()
+        }
+
+    def cache_info(self) -> CacheInfo:
+        """Get the hits, misses, and evictions of the read cache."""
+        return self.read_cache.info()
+
+    def snapshot(self) -> Snapshot:
+        """Read the whole database, with one query per table, into an immutable in-memory engine for serving.
+
+        The snapshot has the same query and enrichment methods as the manager but doesn't use the database, so it
+        doesn't see later changes either.
+        """
+        parent = aliased(Enzyme)
+        enzymes = self.session.query(Enzyme.expasy_id, Enzyme.description, parent.expasy_id) \
+            .outerjoin(parent, Enzyme.parent_id == parent.id)
+
+        prosite_links = self.session.query(Enzyme.expasy_id, Prosite.prosite_id) \
+            .join(enzyme_prosite, Enzyme.id == enzyme_prosite.c.enzyme_id) \
+            .join(Prosite, Prosite.id == enzyme_prosite.c.prosite_id) \
+            .order_by(Prosite.id)
+
+        protein_links = self.session.query(Enzyme.expasy_id, Protein.accession_number, Protein.entry_name) \
+            .join(enzyme_protein, Enzyme.id == enzyme_protein.c.enzyme_id) \
+            .join(Protein, Protein.id == enzyme_protein.c.protein_id) \
+            .order_by(Protein.id)
+
+        return Snapshot(enzymes, prosite_links, protein_links)
+
+    def get_parent_by_expasy_id(self, expasy_id: str, loading: Optional[str] = 'joined') -> Optional[Enzyme]:
         """Return the parent ID of ExPASy identifier if exist otherwise returns None.
 
         :param expasy_id: An ExPASy identifier
+        :param loading: How to load the parent. See :func:`bio2bel_expasy.utils.get_loader_options`.
         """
-        enzyme = self.get_enzyme_by_id(expasy_id)
+        enzyme = self._get_enzyme(expasy_id, Enzyme.parent, loading)
 
         if enzyme is None:
             return
 
         return enzyme.parent
 
-    def get_children_by_expasy_id(self, expasy_id: str) -> Optional[List[Enzyme]]:
+    def get_children_by_expasy_id(self, expasy_id: str, loading: Optional[str] = 'selectin') -> Optional[List[Enzyme]]:
         """Return a list of enzymes which are children of the enzyme with the given ExPASy enzyme identifier.
 
         :param expasy_id: An ExPASy enzyme identifier
+        :param loading: How to load the children. See :func:`bio2bel_expasy.utils.get_loader_options`.
         """
-        enzyme = self.get_enzyme_by_id(expasy_id)
+        enzyme = self._get_enzyme(expasy_id, Enzyme.children, loading)
 
         if enzyme is None:
             return
 
         return enzyme.children
 
-    def get_protein_by_uniprot_id(self, uniprot_id: str) -> Optional[Protein]:
+    def get_descendants_by_expasy_id(self, expasy_id: str) -> List[Enzyme]:
+        """Return all enzymes below the enzyme with the given ExPASy identifier, nearest first, with one query.
+
+        :param expasy_id: An ExPASy identifier. Example: 1.1.-.-
+        """
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return []
+
+        ancestor = aliased(Enzyme)
+        return self.session.query(Enzyme) \
+            .join(enzyme_closure, enzyme_closure.c.descendant_id == Enzyme.id) \
+            .join(ancestor, ancestor.id == enzyme_closure.c.ancestor_id) \
+            .filter(ancestor.expasy_id == code, 0 < enzyme_closure.c.depth) \
+            .order_by(enzyme_closure.c.depth, *ENZYME_NUMERIC_ORDER) \
+            .all()
+
+    def get_proteins_under_class(self, expasy_id: str) -> List[Protein]:
+        """Return the proteins annotated to the enzyme with the given ExPASy identifier or any below it, with one query.
+
+        :param expasy_id: An ExPASy identifier. Example: 1.1.-.-
+        """
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return []
+
+        ancestor = aliased(Enzyme)
+        return self.session.query(Protein) \
+            .join(enzyme_protein, enzyme_protein.c.protein_id == Protein.id) \
+            .join(enzyme_closure, enzyme_closure.c.descendant_id == enzyme_protein.c.enzyme_id) \
+            .join(ancestor, ancestor.id == enzyme_closure.c.ancestor_id) \
+            .filter(ancestor.expasy_id == code) \
+            .distinct() \
+            .order_by(Protein.accession_number) \
+            .all()
+
+    def get_enzymes_by_prefix(self, prefix: str, level: Optional[int] = None) -> List[Enzyme]:
+        """Return the enzyme with the given ExPASy identifier and all enzymes below it, in numeric order.
+
+        The leading number columns are compared for equality, so this is a range scan of their index.
+
+        :param prefix: An ExPASy identifier or its leading numbers. Example: 1.14.13.- or 1.14.13
+        :param level: If given, only return enzymes at this level, from 1 for classes to 4 for entries
+        """
+        try:
+            code = ECCode(prefix)
+        except ValueError:
+            return []
+
+        count = code.level if code.level < 4 else len(ENZYME_NUMERIC_ORDER)
+        query = self.session.query(Enzyme).filter(*(
+            column == value
+            for column, value in zip(ENZYME_NUMERIC_ORDER[:count], _get_number_values(code))
+        ))
+        if level is not None:
+            query = query.filter(Enzyme.level == level)
+        return query.order_by(*ENZYME_NUMERIC_ORDER).all()
+
+    def get_enzymes_in_range(self, start: str, end: str, level: Optional[int] = None) -> List[Enzyme]:
+        """Return the enzymes from the one with the first ExPASy identifier to all below the second, in numeric order.
+
+        For example, 1.1.-.- to 1.3.-.- returns the classes 1.1, 1.2, and 1.3 and everything below them, and 1.1.1.1 to
+        1.1.1.10 returns ten entries at most.
+
+        :param start: The ExPASy identifier to start from
+        :param end: The ExPASy identifier whose last enzyme below it ends the range
+        :param level: If given, only return enzymes at this level, from 1 for classes to 4 for entries
+        """
+        try:
+            start, end = ECCode(start), ECCode(end)
+        except ValueError:
+            return []
+
+        numbers = tuple_(*ENZYME_NUMERIC_ORDER)
+        query = self.session.query(Enzyme).filter(
+            numbers >= tuple_(*_get_number_values(start)),
+            numbers < tuple_(*_get_number_values(end, after=True)),
+        )
+        if level is not None:
+            query = query.filter(Enzyme.level == level)
+        return query.order_by(*ENZYME_NUMERIC_ORDER).all()
+
+    def iter_enzymes(self, level: Optional[int] = None, chunk_size: int = 1000) -> Iterable[Enzyme]:
+        """Iterate over the enzymes in numeric order, loading them in chunks.
+
+        :param level: If given, only iterate over enzymes at this level, from 1 for classes to 4 for entries
+        :param chunk_size: The number of enzymes loaded at once
+        """
+        query = self.session.query(Enzyme)
+        if level is not None:
+            query = query.filter(Enzyme.level == level)
+        return query.order_by(*ENZYME_NUMERIC_ORDER).yield_per(chunk_size)
+
+    def search_enzymes(self, text: str, limit: int = 10) -> List[Enzyme]:
+        """Return the enzymes whose names or synonyms contain every word of the text, best matches first.
+
+        Uses the full-text index from :mod:`bio2bel_expasy.search` on SQLite and PostgreSQL. Elsewhere, or if the
+        index wasn't built, like in a database loaded by an older version, the enzymes whose names or synonyms
+        contain the text are returned in numeric order instead.
+
+        :param text: Free text, like ``alcohol dehydrogenase``
+        :param limit: The largest number of enzymes returned
+        """
+        if not self._is_search_indexed():
+            pattern = f'%{_escape_like(text)}%'
+            return self.session.query(Enzyme) \
+                .filter(or_(
+                    Enzyme.description.ilike(pattern, escape='\\'),
+                    Enzyme.synonyms.any(Synonym.name.ilike(pattern, escape='\\')),
+                )) \
+                .order_by(*ENZYME_NUMERIC_ORDER) \
+                .limit(limit) \
+                .all()
+
+        enzyme_pks = search(self.session.connection(), text, limit=limit)
+        if not enzyme_pks:
+            return []
+
+        enzymes = {
+            enzyme.id: enzyme
+            for enzyme in self.session.query(Enzyme).filter(Enzyme.id.in_(enzyme_pks))
+        }
+        return [enzymes[enzyme_pk] for enzyme_pk in enzyme_pks]
+
+    def get_protein_by_uniprot_id(
+        self,
+        uniprot_id: str,
+        loading: Optional[str] = None,
+    ) -> Optional[Protein]:
         """Get a protein having the given UniProt identifier.
 
         :param uniprot_id: A UniProt identifier
+        :param loading: How to load the enzymes of the protein, which are not loaded along with it by default
 
         >>> from bio2bel_expasy import Manager
         >>> manager = Manager()
@@ -253,55 +1232,66 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         >>> protein.accession_number
         'Q6AZW2'
         """
-        return self.session.query(Protein).filter(Protein.accession_number == uniprot_id).one_or_none()
+        return self.session.query(Protein) \
+            .filter(Protein.accession_number == uniprot_id) \
+            .options(*get_loader_options(loading, Protein.enzymes)) \
+            .one_or_none()
 
-    def get_prosite_by_id(self, prosite_id: str) -> Optional[Prosite]:
+    def get_prosite_by_id(self, prosite_id: str, loading: Optional[str] = None) -> Optional[Prosite]:
         """Get a ProSite having the given ProSite identifier.
 
         :param prosite_id: A ProSite identifier
+        :param loading: How to load the enzymes of the ProSite, which are not loaded along with it by default
         """
-        return self.session.query(Prosite).filter(Prosite.prosite_id == prosite_id).one_or_none()
+        return self.session.query(Prosite) \
+            .filter(Prosite.prosite_id == prosite_id) \
+            .options(*get_loader_options(loading, Prosite.enzymes)) \
+            .one_or_none()
 
-    def get_prosites_by_expasy_id(self, expasy_id: str) -> Optional[List[Prosite]]:
+    def get_prosites_by_expasy_id(self, expasy_id: str, loading: Optional[str] = 'selectin') -> Optional[List[Prosite]]:
         """Get a list of ProSites associated with the enzyme corresponding to the given identifier.
 
         :param expasy_id: An ExPASy identifier
+        :param loading: How to load the ProSites. See :func:`bio2bel_expasy.utils.get_loader_options`.
         """
-        enzyme = self.get_enzyme_by_id(expasy_id)
+        enzyme = self._get_enzyme(expasy_id, Enzyme.prosites, loading)
 
         if enzyme is None:
             return
 
         return enzyme.prosites
 
-    def get_enzymes_by_prosite_id(self, prosite_id: str) -> Optional[List[Enzyme]]:
+    def get_enzymes_by_prosite_id(self, prosite_id: str, loading: Optional[str] = 'selectin') -> Optional[List[Enzyme]]:
         """Return a list of enzymes associated with the given ProSite ID.
 
         :param prosite_id: ProSite identifier
+        :param loading: How to load the enzymes. See :func:`bio2bel_expasy.utils.get_loader_options`.
         """
-        prosite = self.get_prosite_by_id(prosite_id)
+        prosite = self.get_prosite_by_id(prosite_id, loading=loading)
 
         if prosite is None:
             return
 
         return prosite.enzymes
 
-    def get_proteins_by_expasy_id(self, expasy_id: str) -> Optional[List[Protein]]:
+    def get_proteins_by_expasy_id(self, expasy_id: str, loading: Optional[str] = 'selectin') -> Optional[List[Protein]]:
         """Return a list of UniProt entries as tuples (accession_number, entry_name) of the given enzyme_id.
 
         :param expasy_id: An ExPASy identifier
+        :param loading: How to load the proteins. See :func:`bio2bel_expasy.utils.get_loader_options`.
         """
-        enzyme = self.get_enzyme_by_id(expasy_id)
+        enzyme = self._get_enzyme(expasy_id, Enzyme.proteins, loading)
 
         if enzyme is None:
             return
 
         return enzyme.proteins
 
-    def get_enzymes_by_uniprot_id(self, uniprot_id: str) -> Optional[List[Enzyme]]:
+    def get_enzymes_by_uniprot_id(self, uniprot_id: str, loading: Optional[str] = 'selectin') -> Optional[List[Enzyme]]:
         """Return a list of enzymes annotated to the protein with the given UniProt accession number.
 
         :param uniprot_id: A UniProt identifier
+        :param loading: How to load the enzymes. See :func:`bio2bel_expasy.utils.get_loader_options`.
 
         Example:
 
@@ -310,36 +1300,142 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         >>> manager.get_enzymes_by_uniprot_id('Q6AZW2')
         >>> ...
         """
-        protein = self.get_protein_by_uniprot_id(uniprot_id)
+        protein = self.get_protein_by_uniprot_id(uniprot_id, loading=loading)
 
         if protein is None:
             return
 
         return protein.enzymes
 
+    def get_enzymes_by_uniprot_ids(
+        self,
+        uniprot_ids: Iterable[str],
+        loading: Optional[str] = 'selectin',
+    ) -> Dict[str, List[Enzyme]]:
+        """Return the enzymes annotated to each of the proteins with the given UniProt accession numbers.
+
+        Like :meth:`get_enzymes_by_uniprot_id`, but with one query for the proteins and one for their enzymes per
+        chunk of identifiers.
+
+        :param uniprot_ids: UniProt accession numbers
+        :param loading: How to load the enzymes. See :func:`bio2bel_expasy.utils.get_loader_options`.
+        :return: A dictionary from each accession number found in the database to its enzymes
+        """
+        proteins = self._get_many(Protein, Protein.accession_number, uniprot_ids, Protein.enzymes, loading)
+        return {
+            uniprot_id: protein.enzymes
+            for uniprot_id, protein in proteins.items()
+        }
+
+    def get_enzymes_by_prosite_ids(
+        self,
+        prosite_ids: Iterable[str],
+        loading: Optional[str] = 'selectin',
+    ) -> Dict[str, List[Enzyme]]:
+        """Return the enzymes associated with each of the given ProSite identifiers, in a query per chunk.
+
+        :param prosite_ids: ProSite identifiers
+        :param loading: How to load the enzymes. See :func:`bio2bel_expasy.utils.get_loader_options`.
+        :return: A dictionary from each ProSite identifier found in the database to its enzymes
+        """
+        prosites = self._get_many(Prosite, Prosite.prosite_id, prosite_ids, Prosite.enzymes, loading)
+        return {
+            prosite_id: prosite.enzymes
+            for prosite_id, prosite in prosites.items()
+        }
+
+    def get_proteins_by_expasy_ids(
+        self,
+        expasy_ids: Iterable[str],
+        loading: Optional[str] = 'selectin',
+    ) -> Dict[str, List[Protein]]:
+        """Return the proteins of each of the enzymes with the given ExPASy identifiers, in a query per chunk.
+
+        :param expasy_ids: ExPASy identifiers, which are canonicalized like by :meth:`get_enzyme_by_id`
+        :param loading: How to load the proteins. See :func:`bio2bel_expasy.utils.get_loader_options`.
+        :return: A dictionary from each given identifier found in the database to the proteins of its enzyme
+        """
+        enzymes = self._get_enzymes(expasy_ids, Enzyme.proteins, loading)
+        return {
+            expasy_id: enzyme.proteins
+            for expasy_id, enzyme in enzymes.items()
+        }
+
+    def get_prosites_by_expasy_ids(
+        self,
+        expasy_ids: Iterable[str],
+        loading: Optional[str] = 'selectin',
+    ) -> Dict[str, List[Prosite]]:
+        """Return the ProSites of each of the enzymes with the given ExPASy identifiers, in a query per chunk.
+
+        :param expasy_ids: ExPASy identifiers, which are canonicalized like by :meth:`get_enzyme_by_id`
+        :param loading: How to load the ProSites. See :func:`bio2bel_expasy.utils.get_loader_options`.
+        :return: A dictionary from each given identifier found in the database to the ProSites of its enzyme
+        """
+        enzymes = self._get_enzymes(expasy_ids, Enzyme.prosites, loading)
+        return {
+            expasy_id: enzyme.prosites
+            for expasy_id, enzyme in enzymes.items()
+        }
+
+    def _get_enzymes(self, expasy_ids: Iterable[str], relationship, loading: Optional[str]) -> Dict[str, Enzyme]:
+        """Get the enzymes with the given identifiers, keyed by the identifiers as given."""
+        codes = {}
+        for expasy_id in expasy_ids:
+            try:
+                codes[expasy_id] = ECCode(expasy_id)
+            except ValueError:
+                continue
+
+        enzymes = self._get_many(Enzyme, Enzyme.expasy_id, set(codes.values()), relationship, loading)
+        return {
+            expasy_id: enzymes[code]
+            for expasy_id, code in codes.items()
+            if code in enzymes
+        }
+
+    def _get_many(self, model, column, keys: Iterable[str], relationship, loading: Optional[str]) -> Dict[str, X]:
+        """Get the instances of the model whose column has one of the keys, with the relationship loaded.
+
+        Each chunk of keys takes one statement for the instances and, with selectin loading, one for their related
+        instances, so the number of statements grows with the number of chunks rather than the number of keys.
+        """
+        rv = {}
+        # selectinload loads the related instances of up to 500 instances per statement
+        for chunk in chunked(dict.fromkeys(keys), size=500):
+            query = self.session.query(model) \
+                .filter(column.in_(chunk)) \
+                .options(*get_loader_options(loading, relationship))
+            rv.update(
+                (getattr(instance, column.key), instance)
+                for instance in query
+            )
+        return rv
+
     def enrich_proteins_with_enzyme_families(self, graph: BELGraph) -> None:
         """Enrich proteins in the BEL graph with IS_A relations to their enzyme classes.
 
         1. Gets a list of UniProt proteins
-        2. Annotates :data:`pybel.constants.IS_A` relations for all enzyme classes it finds
-
+        2. Looks up all of them at once with :meth:`get_protein_records`, with a query per chunk of proteins that
+           are not in the read cache
+        3. Annotates :data:`pybel.constants.IS_A` relations for all enzyme classes it finds
         """
-        for node in list(graph):
-            namespace = node.get(NAMESPACE)
-
-            if namespace is None:
-                continue
+        nodes = [
+            node
+            for node in graph
+            if node.get(NAMESPACE) is not None and node[NAMESPACE].lower() in {'up', 'uniprot'}
+        ]
 
-            if namespace.lower() not in {'up', 'uniprot'}:
-                continue
+        proteins = self.get_protein_records(node.identifier for node in nodes)
 
-            enzymes = self.get_enzymes_by_uniprot_id(node.identifier)
+        for node in nodes:
+            protein = proteins.get(node.identifier)
 
-            if enzymes is None:
+            if protein is None:
                 continue
 
-            for enzyme in enzymes:
-                graph.add_is_a(enzyme.as_bel(), node)
+            for expasy_id in protein.expasy_ids:
+                graph.add_is_a(Enzyme.bel_from_expasy_id(expasy_id), node)
 
     def look_up_enzyme(self, node: BaseEntity) -> Optional[Enzyme]:
         """Try to get an enzyme model from the given node."""
@@ -347,73 +1443,162 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         if namespace is None:
             return
 
-        if namespace.lower() not in {'expasy', 'ec', 'eccode'}:
+        if namespace.lower() not in {'expasy', 'ec', 'eccode', 'ec-code'}:
             return
 
-        name = node.get(NAME)
+        name = node.get(IDENTIFIER) or node.get(NAME)
+        if name is None:
+            return
 
         return self.get_enzyme_by_id(name)
 
-    def enrich_enzyme_with_proteins(self, graph: BELGraph, node: BaseEntity) -> None:
-        """Enrich an enzyme with all of its member proteins."""
-        enzyme = self.look_up_enzyme(node)
-        if enzyme is None:
+    def enrich_enzyme_with_proteins(self, graph: BELGraph, node: BaseEntity, loading: Optional[str] = 'joined') -> None:
+        """Enrich an enzyme with all of its member proteins.
+
+        :param loading: How to load the proteins along with the enzyme. See
+         :func:`bio2bel_expasy.utils.get_loader_options`.
+        """
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None or expasy_id.level != 4:
             return
 
-        if enzyme.level == 4:
-            for protein in enzyme.proteins:
-                graph.add_is_a(protein.as_bel(), node)
+        proteins = self.get_proteins_by_expasy_id(expasy_id, loading=loading)
+        if proteins is None:  # deleted since the hierarchy was built
+            return
 
-    def enrich_enzyme_parents(self, graph: BELGraph, node: BaseEntity) -> None:
-        """Enrich an enzyme with its parents."""
-        enzyme = self.look_up_enzyme(node)
-        if enzyme is None:
+        for protein in proteins:
+            graph.add_is_a(protein.as_bel(), node)
+
+    def _look_up_expasy_id(self, node: BaseEntity) -> Optional[ECCode]:
+        """Get the ExPASy identifier of the given node if it is an enzyme in the database."""
+        namespace = node.get(NAMESPACE)
+        if namespace is None or namespace.lower() not in {'expasy', 'ec', 'eccode', 'ec-code'}:
             return
 
-        parent = enzyme.parent
-        if parent is None:
+        expasy_id = node.get(IDENTIFIER) or node.get(NAME)
+        if expasy_id is None:
             return
-        graph.add_is_a(node, parent.as_bel())
 
-        grandparent = parent.parent
-        if grandparent is None:
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
             return
-        graph.add_is_a(parent.as_bel(), grandparent.as_bel())
 
-        greatgrandparent = grandparent.parent
-        if greatgrandparent is None:
+        if code in self.get_hierarchy():
+            return code
+
+    def enrich_enzyme_parents(self, graph: BELGraph, node: BaseEntity) -> None:
+        """Enrich an enzyme with its parents."""
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None:
             return
-        graph.add_is_a(grandparent.as_bel(), greatgrandparent.as_bel())
 
-    def _enrich_enzyme_children_helper(self, graph: BELGraph, enzyme: Enzyme) -> None:
-        for child in enzyme.children:
-            child_bel = child.as_bel()
-            graph.add_is_a(child_bel, enzyme.as_bel())
-            self.enrich_enzyme_children(graph, child_bel)
+        child = node
+        for parent_id in self.get_hierarchy().ancestors(expasy_id):
+            parent = Enzyme.bel_from_expasy_id(parent_id)
+            graph.add_is_a(child, parent)
+            child = parent
 
-    def enrich_enzyme_children(self, graph: BELGraph, node: BaseEntity) -> None:
-        """Enrich an enzyme with all of its children."""
-        enzyme = self.look_up_enzyme(node)
-        if enzyme is None:
+    def enrich_enzyme_children(self, graph: BELGraph, node: BaseEntity, proteins: bool = False) -> None:
+        """Enrich an enzyme with all of its children, and theirs.
+
+        The subtree is read from the slice of the hierarchy index below the enzyme rather than by recursion, so
+        the tree itself needs no queries and the largest classes are as safe to expand as the smallest.
+
+        :param proteins: If true, also enrich the entries of the subtree with their member proteins, which are
+         looked up for the whole subtree with one query over the closure table
+        """
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None:
+            return
+
+        hierarchy = self.get_hierarchy()
+        for child_id in hierarchy.descendants(expasy_id):
+            parent_id = hierarchy.parent(child_id)
+            parent = node if parent_id == expasy_id else Enzyme.bel_from_expasy_id(parent_id)
+            graph.add_is_a(Enzyme.bel_from_expasy_id(child_id), parent)
+
+        if not proteins:
             return
-        self._enrich_enzyme_children_helper(graph, enzyme)
+
+        ancestor = aliased(Enzyme)
+        query = self.session.query(Enzyme.expasy_id, Protein.accession_number, Protein.entry_name) \
+            .join(enzyme_closure, enzyme_closure.c.descendant_id == Enzyme.id) \
+            .join(ancestor, ancestor.id == enzyme_closure.c.ancestor_id) \
+            .join(enzyme_protein, enzyme_protein.c.enzyme_id == Enzyme.id) \
+            .join(Protein, Protein.id == enzyme_protein.c.protein_id) \
+            .filter(ancestor.expasy_id == expasy_id)
+
+        for child_id, accession_number, entry_name in query:
+            child = node if child_id == expasy_id else Enzyme.bel_from_expasy_id(child_id)
+            graph.add_is_a(Protein.bel_from_uniprot_id(accession_number, entry_name), child)
+
+    def _get_protein_links(self, expasy_ids: Iterable[str]) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """Get the accession numbers and entry names of the proteins of each of the enzymes, in a query per chunk.
+
+        The columns are read with inner joins rather than by loading the proteins of the enzymes, since SQLite
+        materializes the whole link table for the nested outer join of a joined load.
+        """
+        rv = defaultdict(list)
+        for chunk in chunked(dict.fromkeys(expasy_ids)):
+            query = self.session.query(Enzyme.expasy_id, Protein.accession_number, Protein.entry_name) \
+                .join(enzyme_protein, enzyme_protein.c.enzyme_id == Enzyme.id) \
+                .join(Protein, Protein.id == enzyme_protein.c.protein_id) \
+                .filter(Enzyme.expasy_id.in_(chunk)) \
+                .order_by(Protein.id)
+            for expasy_id, accession_number, entry_name in query:
+                rv[expasy_id].append((accession_number, entry_name))
+        return rv
 
     def enrich_enzymes(self, graph: BELGraph) -> None:
-        """Add all children of entries."""
+        """Add the parents and children of the enzymes in the graph, and the proteins of its entries.
+
+        The proteins of all entries are looked up at once, with a query per chunk of entries.
+        """
+        entries = {}
         for node in list(graph):
             self.enrich_enzyme_parents(graph, node)
             self.enrich_enzyme_children(graph, node)
-            self.enrich_enzyme_with_proteins(graph, node)
+            expasy_id = self._look_up_expasy_id(node)
+            if expasy_id is not None and expasy_id.level == 4:
+                entries[node] = expasy_id
 
-    def enrich_enzymes_with_prosites(self, graph: BELGraph) -> None:
-        """Enrich enzyme classes in the graph with ProSites."""
-        for node in list(graph):
-            enzyme = self.look_up_enzyme(node)
-            if enzyme is None:
-                continue
+        if not entries:
+            return
+
+        proteins = self._get_protein_links(entries.values())
+        for node, expasy_id in entries.items():
+            for accession_number, entry_name in proteins.get(expasy_id, ()):
+                graph.add_is_a(Protein.bel_from_uniprot_id(accession_number, entry_name), node)
+
+    def enrich_graphs(self, graphs: Iterable[BELGraph], workers: Optional[int] = None) -> EnrichmentReport:
+        """Enrich the enzymes in each of the graphs, in place, like :meth:`enrich_enzymes`.
 
-            for prosite in enzyme.prosites:
-                graph.add_is_a(node, prosite.as_bel())
+        :param graphs: The graphs to enrich
+        :param workers: The number of processes with which to enrich the graphs. If more than one, they share a
+         :meth:`snapshot` of the database. Defaults to enriching serially with the manager.
+        :return: The number of graphs, nodes, and edges, and the time it took
+        """
+        graphs = list(graphs)
+        if workers is not None and 1 < workers and 1 < len(graphs):
+            return enrich_graphs(self.snapshot(), graphs, workers=workers)
+        return enrich_graphs(self, graphs)
+
+    def enrich_enzymes_with_prosites(self, graph: BELGraph, loading: Optional[str] = 'selectin') -> None:
+        """Enrich enzyme classes in the graph with ProSites, looking them up for all enzymes at once.
+
+        :param loading: How to load the ProSites of the enzymes. See :func:`bio2bel_expasy.utils.get_loader_options`.
+        """
+        nodes = {}
+        for node in list(graph):
+            expasy_id = self._look_up_expasy_id(node)
+            if expasy_id is not None:
+                nodes.setdefault(expasy_id, []).append(node)
+
+        for expasy_id, prosites in self.get_prosites_by_expasy_ids(nodes, loading=loading).items():
+            for node in nodes[expasy_id]:
+                for prosite in prosites:
+                    graph.add_is_a(node, prosite.as_bel())
 
     def _add_admin(self, app, **kwargs):
         """Add a Flask Admin interface to an application.
@@ -4,12 +4,16 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
 import pybel.dsl
-from sqlalchemy import Column, ForeignKey, Integer, String, Table
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Table
 from sqlalchemy.ext.declarative import DeclarativeMeta, declarative_base
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, relationship, validates
 
 from .constants import MODULE_NAME, PROSITE, UNIPROT
+from .ec_code import ECCode
 
 ENZYME_CATEGORY_TABLE_NAME = f'{MODULE_NAME}_enzymeCategory'
 ENZYME_SUPERFAMILY_TABLE_NAME = f'{MODULE_NAME}_enzymeSuperFamily'
@@ -19,6 +23,12 @@ PROTEIN_TABLE_NAME = f'{MODULE_NAME}_protein'
 PROSITE_TABLE_NAME = f'{MODULE_NAME}_prosite'
 ENZYME_PROSITE_TABLE_NAME = f'{MODULE_NAME}_enzyme_prosite'
 ENZYME_PROTEIN_TABLE_NAME = f'{MODULE_NAME}_enzyme_protein'
+ENZYME_CLOSURE_TABLE_NAME = f'{MODULE_NAME}_enzyme_closure'
+SYNONYM_TABLE_NAME = f'{MODULE_NAME}_synonym'
+CHECKPOINT_TABLE_NAME = f'{MODULE_NAME}_checkpoint'
+
+#: The largest number of PyBEL nodes interned for each model, which takes about 25 MB for proteins when full
+NODE_CACHE_SIZE = 2 ** 16
 
 Base: DeclarativeMeta = declarative_base()
 
@@ -27,6 +37,8 @@ enzyme_prosite = Table(
     Base.metadata,
     Column('enzyme_id', Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), primary_key=True),
     Column('prosite_id', Integer, ForeignKey(f'{PROSITE_TABLE_NAME}.id'), primary_key=True),
+    # the primary key only covers lookups by enzyme, so this covers looking up the enzymes of a ProSite
+    Index(f'ix_{ENZYME_PROSITE_TABLE_NAME}_prosite_id', 'prosite_id'),
 )
 
 enzyme_protein = Table(
@@ -34,8 +46,22 @@ enzyme_protein = Table(
     Base.metadata,
     Column('enzyme_id', Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), primary_key=True),
     Column('protein_id', Integer, ForeignKey(f'{PROTEIN_TABLE_NAME}.id'), primary_key=True),
+    # the primary key only covers lookups by enzyme, so this covers looking up the enzymes of a protein
+    Index(f'ix_{ENZYME_PROTEIN_TABLE_NAME}_protein_id', 'protein_id'),
+)
+
+#: The transitive closure of the enzyme hierarchy. Every enzyme is its own descendant at depth 0, so the descendants
+#: of an enzyme, or the enzymes above it, can be found with a single indexed lookup.
+enzyme_closure = Table(
+    ENZYME_CLOSURE_TABLE_NAME,
+    Base.metadata,
+    Column('ancestor_id', Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), primary_key=True),
+    Column('descendant_id', Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), primary_key=True),
+    Column('depth', Integer, nullable=False, doc='The number of edges from the ancestor to the descendant'),
+    Index(f'ix_{ENZYME_CLOSURE_TABLE_NAME}_descendant_id', 'descendant_id'),
 )
 
+
 class EnzymeCategory(Base):
     """First level entry."""
 
@@ -72,26 +98,101 @@ class Enzyme(Base):
     id = Column(Integer, primary_key=True)
 
     expasy_id = Column(String(16), unique=True, index=True, nullable=False, doc='The ExPASy enzyme code.')
-    parent_id = Column(Integer, ForeignKey(f'{EnzymeFamily.__tablename__}.id'), nullable=True)
+    parent_id = Column(Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), nullable=True)
 
     description = Column(String(255), doc='The ExPASy enzyme description. May need context of parents.')
 
-    children = relationship('Enzyme', backref=backref('parent', remote_side=[id]))
+    # The numbers of the code, set from the ExPASy identifier, with 0 for each dash. Together with the preliminary
+    # flag, they order enzymes numerically, like :data:`bio2bel_expasy.ec_code.ECCode.sort_key`.
+    class_number = Column(Integer, nullable=False, doc='The first number of the code')
+    subclass_number = Column(Integer, nullable=False, doc='The second number of the code, or 0')
+    subsubclass_number = Column(Integer, nullable=False, doc='The third number of the code, or 0')
+    preliminary = Column(Boolean, nullable=False, doc='True if the serial number is preliminary, like in 1.1.1.n2')
+    serial_number = Column(Integer, nullable=False, doc='The fourth number of the code, or 0')
+    level = Column(Integer, nullable=False, doc='The level in the hierarchy, from 1 for classes to 4 for entries')
+
+    children = relationship(
+        'Enzyme',
+        backref=backref('parent', remote_side=[id]),
+        order_by=lambda: ENZYME_NUMERIC_ORDER,
+    )
+
+    __table_args__ = (
+        Index(
+            f'ix_{ENZYME_TABLE_NAME}_numbers',
+            'class_number', 'subclass_number', 'subsubclass_number', 'preliminary', 'serial_number',
+        ),
+    )
 
     bel_encoding = 'P'
 
+    @staticmethod
+    def get_number_columns(expasy_id: str) -> dict:
+        """Get the values of the columns that are set from the given ExPASy identifier.
+
+        >>> Enzyme.get_number_columns('1.14.13.-')['subsubclass_number']
+        13
+        """
+        code = ECCode(expasy_id)
+        class_number, subclass_number, subsubclass_number, serial_number = code.numbers + (0,) * (4 - code.level)
+        return dict(
+            class_number=class_number,
+            subclass_number=subclass_number,
+            subsubclass_number=subsubclass_number,
+            preliminary=code.preliminary,
+            serial_number=serial_number,
+            level=code.level,
+        )
+
+    @validates('expasy_id')
+    def _set_number_columns(self, key, expasy_id):
+        for column, value in self.get_number_columns(expasy_id).items():
+            setattr(self, column, value)
+        return expasy_id
+
+    @staticmethod
+    def bel_from_expasy_id(expasy_id: str) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing the enzyme with the given ExPASy identifier, without loading it.
+
+        The nodes are interned, so the same node is returned for the same identifier, and it must not be changed.
+        """
+        return _bel_from_expasy_id(str(expasy_id))
+
     def as_bel(self) -> pybel.dsl.Protein:
         """Return a PyBEL node representing this enzyme."""
-        return pybel.dsl.Protein(
-            namespace=MODULE_NAME,
-            name=self.description,
-            identifier=self.expasy_id,
-        )
+        return self.bel_from_expasy_id(self.expasy_id)
 
     def __str__(self):
         return f'ec-code:{self.expasy_id} ! {self.description}'
 
 
+#: The columns that order enzymes numerically by their codes
+ENZYME_NUMERIC_ORDER = (
+    Enzyme.class_number,
+    Enzyme.subclass_number,
+    Enzyme.subsubclass_number,
+    Enzyme.preliminary,
+    Enzyme.serial_number,
+)
+
+
+class Synonym(Base):
+    """An additional name of an enzyme, from the ``AN`` lines of the ENZYME database."""
+
+    __tablename__ = SYNONYM_TABLE_NAME
+
+    enzyme_id = Column(Integer, ForeignKey(f'{ENZYME_TABLE_NAME}.id'), primary_key=True)
+    name = Column(String(255), primary_key=True, doc='The additional name')
+
+    enzyme = relationship(
+        'Enzyme',
+        backref=backref('synonyms', order_by=lambda: Synonym.name, cascade='all, delete-orphan'),
+    )
+
+    def __str__(self):
+        return self.name
+
+
 class Prosite(Base):
     """Maps ec to prosite entries."""
 
@@ -104,12 +205,17 @@ class Prosite(Base):
 
     bel_encoding = 'GRP'
 
+    @staticmethod
+    def bel_from_prosite_id(prosite_id: str) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing the ProSite entry with the given identifier, without loading it.
+
+        The nodes are interned, so the same node is returned for the same identifier, and it must not be changed.
+        """
+        return _bel_from_prosite_id(str(prosite_id))
+
     def as_bel(self) -> pybel.dsl.Protein:
         """Return a PyBEL node data dictionary representing this ProSite entry."""
-        return pybel.dsl.Protein(
-            namespace=PROSITE,
-            identifier=str(self.prosite_id)
-        )
+        return self.bel_from_prosite_id(self.prosite_id)
 
     def __str__(self):
         return f'prosite:{self.prosite_id}'
@@ -121,21 +227,72 @@ class Protein(Base):
     __tablename__ = PROTEIN_TABLE_NAME
     id = Column(Integer, primary_key=True)
 
-    uniprot_id = Column(String(255), doc='UniProt `entry name <http://www.uniprot.org/help/entry_name>`_.')
-    uniprot_accession = Column(String(255),
-                               doc='UniProt `accession number <http://www.uniprot.org/help/accession_numbers>`_')
+    accession_number = Column(String(255), unique=True, index=True, nullable=False,
+                              doc='UniProt `accession number <http://www.uniprot.org/help/accession_numbers>`_')
+    entry_name = Column(String(255), doc='UniProt `entry name <http://www.uniprot.org/help/entry_name>`_.')
 
     enzymes = relationship('Enzyme', secondary=enzyme_protein, backref=backref('proteins'))
 
     bel_encoding = 'GRP'
 
+    @staticmethod
+    def bel_from_uniprot_id(uniprot_id: str, entry_name: Optional[str] = None) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing the UniProt entry with the given accession number, without loading it.
+
+        The nodes are interned, so the same node is returned for the same accession number and entry name, and it
+        must not be changed.
+        """
+        return _bel_from_uniprot_id(uniprot_id, entry_name)
+
     def as_bel(self) -> pybel.dsl.Protein:
         """Return a PyBEL node data dictionary representing this UniProt entry."""
-        return pybel.dsl.Protein(
-            namespace=UNIPROT,
-            name=self.uniprot_accession,
-            identifier=self.uniprot_id,
-        )
+        return self.bel_from_uniprot_id(self.accession_number, self.entry_name)
+
+    def __str__(self):
+        return f'uniprot:{self.accession_number}'
+
+
+# The caches are keyed by the exact arguments, so the methods above pass them as plain strings and by position
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def _bel_from_expasy_id(expasy_id: str) -> pybel.dsl.Protein:
+    return pybel.dsl.Protein(namespace=MODULE_NAME, name=expasy_id, identifier=expasy_id)
+
+
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def _bel_from_prosite_id(prosite_id: str) -> pybel.dsl.Protein:
+    return pybel.dsl.Protein(namespace=PROSITE, identifier=prosite_id)
+
+
+@lru_cache(maxsize=NODE_CACHE_SIZE)
+def _bel_from_uniprot_id(uniprot_id: str, entry_name: Optional[str]) -> pybel.dsl.Protein:
+    return pybel.dsl.Protein(namespace=UNIPROT, name=entry_name, identifier=uniprot_id)
+
+
+def get_node_cache_info() -> Dict[type, Tuple[int, int, int, int]]:
+    """Get the hits, misses, largest size, and size of the cache of interned PyBEL nodes of each model."""
+    return {
+        Enzyme: _bel_from_expasy_id.cache_info(),
+        Prosite: _bel_from_prosite_id.cache_info(),
+        Protein: _bel_from_uniprot_id.cache_info(),
+    }
+
+
+def clear_node_caches() -> None:
+    """Forget the interned PyBEL nodes of the enzymes, ProSites, and proteins, like when a new release is loaded."""
+    _bel_from_expasy_id.cache_clear()
+    _bel_from_prosite_id.cache_clear()
+    _bel_from_uniprot_id.cache_clear()
+
+
+class Checkpoint(Base):
+    """Records how far a batched load of one of the source files has committed, so it can be resumed."""
+
+    __tablename__ = CHECKPOINT_TABLE_NAME
+
+    source = Column(String(32), primary_key=True, doc='The source being loaded, either "tree" or "database"')
+    release = Column(String(64), nullable=False, doc='The SHA-256 hash of the source file being loaded')
+    last_expasy_id = Column(String(16), nullable=True, doc='The last ExPASy identifier committed')
+    complete = Column(Boolean, nullable=False, default=False, doc='True once the whole file has been committed')
 
     def __str__(self):
-        return f'uniprot:{self.uniprot_id}'
+        return f'{self.source}:{self.release[:8]} after {self.last_expasy_id}'
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from .closure import get_expasy_closed_tree
-from .database import get_expasy_database
+from .database import get_expasy_database, iter_expasy_database, iter_expasy_entries
+from .records import ExpasyEntry
 from .tree import get_expasy_tree
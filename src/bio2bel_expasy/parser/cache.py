@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""Binary caches of data derived from the ExPASy source files.
+
+A cache file starts with a header recording the size, modification time, and SHA-256 hash of each source file it was
+derived from, followed by a :mod:`marshal` payload. When the source's size and modification time match
+the header the payload is trusted. When only the modification time differs, the hash is checked so that a touched but
+otherwise unchanged file does not force a rebuild, and the header is rewritten with the new modification time so the
+file is not hashed again on the next start. Otherwise, the cache is stale and is ignored.
+
+Hits, misses, and stale caches are counted in :data:`cache_statistics` so cold and warm starts can be told apart.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import struct
+from collections import Counter
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+__all__ = [
+    'cache_statistics',
+    'get_source_fingerprint',
+    'read_cache',
+    'write_cache',
+]
+
+log = logging.getLogger(__name__)
+
+#: Counts the outcomes of :func:`read_cache` as ``hit``, ``miss`` (no usable cache file), and ``stale``
+cache_statistics = Counter()
+
+_MAGIC = b'B2BEC'
+#: Bump when the layout of cached payloads changes
+_FORMAT_VERSION = 2
+#: magic, format version, marshal version, number of sources
+_HEADER = struct.Struct('<5sHHB')
+#: source size, source mtime (ns), source SHA-256
+_SOURCE = struct.Struct('<Qq32s')
+
+Sources = Union[str, Sequence[str]]
+
+
+def _as_paths(source_paths: Sources) -> Sequence[str]:
+    return [source_paths] if isinstance(source_paths, str) else source_paths
+
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _hash_file(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def get_source_fingerprint(path: str) -> Tuple[int, int, bytes]:
+    """Return the size, modification time in nanoseconds, and SHA-256 digest of the given file."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, _hash_file(path)
+
+
+def write_cache(cache_path: str, source_paths: Sources, payload: Any) -> None:
+    """Write the payload derived from the source files to the cache.
+
+    :param cache_path: The path of the cache file
+    :param source_paths: The path, or paths, of the files from which the payload was derived
+    :param payload: A value that can be serialized with :mod:`marshal`
+    """
+    source_paths = _as_paths(source_paths)
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, marshal.version, len(source_paths))
+
+    _write_raw(cache_path, [
+        header,
+        *(_SOURCE.pack(*get_source_fingerprint(source_path)) for source_path in source_paths),
+        marshal.dumps(payload),
+    ])
+
+
+def _check_source(fingerprint: bytes, source_path: str) -> Optional[bytes]:
+    """Get the fingerprint of the source, with its current modification time, if it matches the recorded one."""
+    try:
+        size, mtime_ns, digest = _SOURCE.unpack(fingerprint)
+    except struct.error:
+        return
+
+    stat = os.stat(source_path)
+    if stat.st_size != size:
+        return
+
+    if stat.st_mtime_ns == mtime_ns:
+        return fingerprint
+
+    if _hash_file(source_path) == digest:
+        return _SOURCE.pack(size, stat.st_mtime_ns, digest)
+
+
+def _check_sources(file, source_paths: Sequence[str]) -> Optional[Tuple[bytes, List[bytes], bool]]:
+    """Read the header of the cache and check it against the sources.
+
+    :return: The header, the fingerprints of the sources with their current modification times, and whether any of
+     them changed, or None if the cache is stale
+    """
+    header = file.read(_HEADER.size)
+    try:
+        magic, format_version, marshal_version, n_sources = _HEADER.unpack(header)
+    except struct.error:
+        return
+
+    if magic != _MAGIC or format_version != _FORMAT_VERSION or marshal_version != marshal.version:
+        return
+
+    if n_sources != len(source_paths):
+        return
+
+    fingerprints, touched = [], False
+    for source_path in source_paths:
+        recorded = file.read(_SOURCE.size)
+        fingerprint = _check_source(recorded, source_path)
+        if fingerprint is None:
+            return
+        fingerprints.append(fingerprint)
+        touched = touched or fingerprint != recorded
+
+    return header, fingerprints, touched
+
+
+def _write_raw(cache_path: str, parts: Sequence[bytes]) -> None:
+    tmp_path = f'{cache_path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        for part in parts:
+            file.write(part)
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path: str, source_paths: Sources) -> Optional[Any]:
+    """Read the payload from the cache if it was derived from the current versions of the source files.
+
+    :param cache_path: The path of the cache file
+    :param source_paths: The path, or paths, of the files from which the payload was derived
+    :return: The payload, or None if there is no cache or if it is stale
+    """
+    source_paths = _as_paths(source_paths)
+
+    if not os.path.exists(cache_path):
+        cache_statistics['miss'] += 1
+        log.info('no cache at %s', cache_path)
+        return
+
+    with open(cache_path, 'rb') as file:
+        checked = _check_sources(file, source_paths)
+        if checked is None:
+            cache_statistics['stale'] += 1
+            log.info('cache at %s is stale for %s', cache_path, ', '.join(source_paths))
+            return
+
+        data = file.read()
+        try:
+            payload = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            cache_statistics['stale'] += 1
+            log.warning('cache at %s is corrupt', cache_path)
+            return
+
+    header, fingerprints, touched = checked
+    if touched:  # record the new modification times so the sources aren't hashed again on the next start
+        try:
+            _write_raw(cache_path, [header, *fingerprints, data])
+        except OSError:
+            log.warning('could not update the modification times in the cache at %s', cache_path)
+
+    cache_statistics['hit'] += 1
+    log.info('loaded cache from %s', cache_path)
+    return payload
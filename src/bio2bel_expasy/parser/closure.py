@@ -1,44 +1,64 @@
 from collections import defaultdict
-from itertools import chain
+from typing import Optional
 
-from bio2bel_expasy.parser.database import get_expasy_database
-from bio2bel_expasy.parser.tree import get_expasy_tree
+from bio2bel_expasy.constants import PROSITE, UNIPROT
+from bio2bel_expasy.hierarchy import HierarchyIndex, get_persisted_hierarchy
+from bio2bel_expasy.parser.database import download_expasy_database, iter_expasy_database
+from bio2bel_expasy.parser.tree import download_expasy_tree, get_expasy_tree
 
 __all__ = [
     'get_expasy_closed_tree',
 ]
 
 
-def _concept(c):
-    return (
-        c['namespace'],
-        c['identifier'],
-        c.get('name'),
-    )
+def get_expasy_closed_tree(tree_path: Optional[str] = None, database_path: Optional[str] = None):
+    """Return a mapping from ec-code to list of child concepts (other enzymes, proteins, and domains).
 
+    The descendants of each class are looked up in a :class:`bio2bel_expasy.hierarchy.HierarchyIndex`, so the
+    closure is built in time proportional to its size. When no paths are given, the index persisted for the
+    downloaded files is used, as with :func:`bio2bel_expasy.hierarchy.get_expasy_hierarchy`.
+
+    :param tree_path: An optional path to the ExPASy tree file
+    :param database_path: An optional path to the ExPASy database file
+    """
+    persisted = tree_path is None and database_path is None
+    if persisted:
+        tree_path, database_path = download_expasy_tree(), download_expasy_database()
+
+    expasy_tree = get_expasy_tree(path=tree_path)
+    names = {
+        expasy_id: data['description']
+        for expasy_id, data in expasy_tree.nodes(data=True)
+    }
+    members = defaultdict(set)
+
+    for entry in iter_expasy_database(path=database_path):
+        if entry.deleted or entry.transferred:
+            continue
+
+        expasy_id = entry.expasy_id
+        parent_id = entry.parent_id
+        if parent_id not in expasy_tree:
+            raise KeyError(f'{expasy_id} has missing parent {parent_id}')
+
+        names[expasy_id] = entry.name
+        for prosite_id in entry.prosite_ids:
+            members[expasy_id].add((PROSITE, prosite_id, None))
+        for accession_number, entry_name in entry.proteins:
+            members[expasy_id].add((UNIPROT, accession_number, entry_name))
+
+    if persisted:
+        hierarchy = get_persisted_hierarchy(tree_path, database_path, lambda: names)
+    else:
+        hierarchy = HierarchyIndex.from_codes(names)
 
-def get_expasy_closed_tree():
-    """Return a mapping from ec-code to list of child concepts (other enzymes, proteins, and domains)."""
     rv = defaultdict(set)
-    expasy_database = get_expasy_database()
-    expasy_tree = get_expasy_tree()
-
-    for expasy_id, data in expasy_database.items():
-        try:
-            expasy_tree[data['parent']['identifier']]['children'].append(data['concept'])
-        except KeyError:
-            print(data)
-            raise
-        for concept in chain(data['proteins'], data['domains']):
-            rv[expasy_id].add(_concept(concept))
-
-    for level in 3, 2, 1:
-        for expasy_id, data in expasy_tree.items():
-            if data['level'] == level:
-                for child_concept in data['children']:
-                    rv[expasy_id].add(_concept(child_concept))
-                    for grandchild_concept in rv[child_concept['identifier']]:
-                        rv[expasy_id].add(grandchild_concept)
+    for expasy_id in hierarchy:
+        concepts = set(members.get(expasy_id, ()))
+        for descendant_id in hierarchy.descendants(expasy_id):
+            concepts.add(('ec-code', descendant_id, names[descendant_id]))
+            concepts.update(members.get(descendant_id, ()))
+        rv[expasy_id] = concepts
 
     return rv
 
@@ -47,4 +67,4 @@ if __name__ == '__main__':
     import json
 
     with open('d.json', 'w') as file:
-        json.dump(get_expasy_closed_tree(), file, indent=2)
+        json.dump({k: sorted(v) for k, v in get_expasy_closed_tree().items()}, file, indent=2)
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 
-import json
 import logging
 import os
-from typing import Any, Iterable, Mapping, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Mapping, Optional, Tuple
 
 from bio2bel.downloading import make_downloader
 
 from bio2bel_expasy.constants import EXPASY_DATABASE_URL, EXPASY_DATA_PATH, EXPASY_PARSED_PATH
+from bio2bel_expasy.parser.cache import read_cache, write_cache
+from bio2bel_expasy.parser.records import ExpasyEntry
 
 __all__ = [
     'get_expasy_database',
+    'get_record_aligned_ranges',
+    'iter_expasy_database',
+    'iter_expasy_entries',
 ]
 
 log = logging.getLogger(__name__)
@@ -35,112 +41,230 @@ DR = 'DR'
 download_expasy_database = make_downloader(EXPASY_DATABASE_URL, EXPASY_DATA_PATH)
 
 
-def get_expasy_database(path: Optional[str] = None, force_download: bool = False) -> Mapping[str, Any]:
-    """Get the ExPASy database as a JSON object.
+def get_expasy_database(
+    path: Optional[str] = None,
+    force_download: bool = False,
+    workers: Optional[int] = None,
+) -> Mapping[str, ExpasyEntry]:
+    """Get the ExPASy database as a dictionary of entries.
+
+    When no path is given, the parsed entries of the downloaded file are cached in a binary file at
+    :data:`bio2bel_expasy.constants.EXPASY_PARSED_PATH`, which is rebuilt automatically if the download changes.
 
     :param path: path to the file
     :param force_download: True to force download resources
-    :return: list of data containing dictionaries
+    :param workers: The number of processes with which to parse the file. Defaults to parsing serially.
+    :return: A dictionary from ExPASy identifiers to their entries
     """
     if path is not None:
-        with open(path) as file:
-            return _get_expasy_database_helper(file)
+        return _entries_to_dict(iter_expasy_database(path=path, workers=workers))
 
-    download_expasy_database(force_download=force_download)
+    path = download_expasy_database(force_download=force_download)
 
-    if os.path.exists(EXPASY_PARSED_PATH):
-        with open(EXPASY_PARSED_PATH) as file:
-            return json.load(file)
+    states = read_cache(EXPASY_PARSED_PATH, path)
+    if states is not None:
+        return _entries_to_dict(ExpasyEntry.from_state(state) for state in states)
 
-    with open(EXPASY_DATA_PATH) as file, open(EXPASY_PARSED_PATH, 'w') as parsed_file:
-        rv = _get_expasy_database_helper(file)
-        json.dump(rv, parsed_file, indent=2, sort_keys=True)
+    rv = _entries_to_dict(iter_expasy_database(path=path, workers=workers))
+    write_cache(EXPASY_PARSED_PATH, path, [entry.__getstate__() for entry in rv.values()])
 
     return rv
 
 
-def group_by_id(lines):
-    groups = []
+def iter_expasy_database(
+    path: Optional[str] = None,
+    force_download: bool = False,
+    workers: Optional[int] = None,
+) -> Iterable[ExpasyEntry]:
+    """Iterate over the entries in the ExPASy database, parsing one at a time.
+
+    :param path: path to the file
+    :param force_download: True to force download resources
+    :param workers: The number of processes with which to parse the file. If more than one, the file is split into
+     chunks on record boundaries that are parsed in a process pool, and the entries are still yielded in file order.
+    """
+    if path is None:
+        path = download_expasy_database(force_download=force_download)
+
+    if workers is not None and 1 < workers:
+        yield from _iter_expasy_database_parallel(path, workers)
+        return
+
+    with open(path) as file:
+        yield from iter_expasy_entries(file)
+
+
+#: The number of chunks per worker, so that a slow chunk does not hold up the whole pool
+_CHUNKS_PER_WORKER = 4
+
+
+def _iter_expasy_database_parallel(path: str, workers: int) -> Iterable[ExpasyEntry]:
+    ranges = get_record_aligned_ranges(path, workers * _CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for states in executor.map(_parse_range, repeat(path), ranges):
+            for state in states:
+                yield ExpasyEntry.from_state(state)
+
+
+def get_record_aligned_ranges(path: str, chunks: int) -> List[Tuple[int, int]]:
+    """Split the file into at most the given number of contiguous byte ranges that each end on a ``//`` line.
+
+    :param path: path to the file
+    :param chunks: The desired number of chunks
+    :return: A list of (start, stop) byte offsets that together cover the file
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+
+    with open(path, 'rb') as file:
+        for i in range(1, chunks):
+            offset = size * i // chunks
+            if offset <= boundaries[-1]:
+                continue
+
+            file.seek(offset)
+            file.readline()  # skip the remainder of the line the offset landed in
+            for line in iter(file.readline, b''):
+                if line.startswith(b'//'):
+                    break
+            boundaries.append(file.tell())
+
+    if boundaries[-1] != size:
+        boundaries.append(size)
 
-    for line in lines:  # TODO replace with itertools.groupby
+    return [
+        (start, stop)
+        for start, stop in zip(boundaries, boundaries[1:])
+        if start < stop
+    ]
+
+
+def _parse_range(path: str, start_stop: Tuple[int, int]) -> List[Tuple]:
+    """Parse the records in the given byte range and return their flat states, which pickle cheaply."""
+    start, stop = start_stop
+    with open(path, 'rb') as file:
+        file.seek(start)
+        lines = file.read(stop - start).decode('utf-8').splitlines()
+    return [entry.__getstate__() for entry in iter_expasy_entries(lines)]
+
+
+def _entries_to_dict(entries: Iterable[ExpasyEntry]) -> Mapping[str, ExpasyEntry]:
+    return {
+        entry.expasy_id: entry
+        for entry in entries
+    }
+
+
+def _iter_records(lines: Iterable[str]) -> Iterable[List[Tuple[str, str]]]:
+    """Iterate over the (descriptor, value) pairs of each record, holding only one record in memory at a time.
+
+    :param lines: An iterator over the ExPASy database file or file-like
+    """
+    record = None
+
+    for line in lines:
         line = line.strip()
+        descriptor = line[:2]
 
-        if line.startswith('ID'):
-            groups.append([])
+        if descriptor == ID:
+            if record:
+                yield record
+            record = []
 
-        if not groups:
+        if record is None:
             continue
 
-        descriptor = line[:2]
-        value = line[5:]
+        if descriptor == '//':
+            yield record
+            record = None
+            continue
 
-        groups[-1].append((descriptor, value))
+        record.append((descriptor, line[5:]))
 
-    return groups
+    if record:
+        yield record
 
 
-def _get_expasy_database_helper(lines: Iterable[str]) -> Mapping:
-    """Parse the ExPASy database file and returns a list of enzyme entry dictionaries
+def iter_expasy_entries(lines: Iterable[str]) -> Iterable[ExpasyEntry]:
+    """Parse the ExPASy database file and yield its enzyme entries one at a time.
 
     :param lines: An iterator over the ExPASy database file or file-like
     """
-    rv = {}
-
-    for groups in group_by_id(lines):
-        _, expasy_id = groups[0]
-
-        rv[expasy_id] = ec_data_entry = {
-            'concept': {
-                'namespace': 'ec-code',
-                'identifier': expasy_id,
-            },
-            'parent': {
-                'namespace': 'ec-code',
-                'identifier': expasy_id.rsplit('.', 1)[0] + '.-',
-            },
-            'synonyms': [],
-            'cofactors': [],
-            'domains': [],
-            'proteins': [],
-            'alt_ids': [],
-        }
-
-        for descriptor, value in groups[1:]:
-            if descriptor == '//':
-                continue
-            elif descriptor == DE and value == 'Deleted entry.':
-                continue
-            elif descriptor == DE and value.startswith('Transferred entry: '):
-                value = value[len('Transferred entry: '):].rstrip()
-                ec_data_entry['transfer_id'] = value
-            elif descriptor == DE:
-                ec_data_entry['concept']['name'] = value.rstrip('.')
-            elif descriptor == AN:
-                ec_data_entry['synonyms'].append(value.rstrip('.'))
-            elif descriptor == PR:
-                value = value[len('PROSITE; '):-1]  # remove trailing comma
-                ec_data_entry['domains'].append({
-                    'namespace': 'prosite',
-                    'identifier': value,
-                })
-            elif descriptor == DR:
-                for uniprot_entry in value.replace(' ', '').split(';'):
-                    if not uniprot_entry:
-                        continue
-                    uniprot_id, uniprot_accession = uniprot_entry.split(',')
-                    ec_data_entry['proteins'].append(dict(
-                        namespace='uniprot',
-                        name=uniprot_accession,
-                        identifier=uniprot_id,
-                    ))
-
-    for expasy_id, data in rv.items():
-        transfer_id = data.pop('transfer_id', None)
-        if transfer_id is not None:
-            rv[expasy_id]['alt_ids'].append(transfer_id)
+    for record in _iter_records(lines):
+        yield _process_record(record)
 
+
+def _join_wrapped_lines(record: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Join the lines of values that wrap onto several lines.
+
+    A description, like a long list of transfer targets, wraps onto consecutive ``DE`` lines. Each alternative name
+    has its own ``AN`` lines, of which only the last ends with a period.
+    """
+    rv = []
+    for descriptor, value in record:
+        if rv and rv[-1][0] == descriptor and (
+            descriptor == DE or (descriptor == AN and not rv[-1][1].endswith('.'))
+        ):
+            rv[-1] = descriptor, f'{rv[-1][1]} {value}'
+        else:
+            rv.append((descriptor, value))
     return rv
 
 
+def _process_record(record: List[Tuple[str, str]]) -> ExpasyEntry:
+    """Process the (descriptor, value) pairs of one record into an entry."""
+    record = _join_wrapped_lines(record)
+    _, expasy_id = record[0]
+
+    name = None
+    deleted = False
+    synonyms = []
+    alt_ids = []
+    prosite_ids = []
+    accession_numbers = []
+    entry_names = []
+
+    for descriptor, value in record[1:]:
+        if descriptor == DE and value == 'Deleted entry.':
+            deleted = True
+        elif descriptor == DE and value.startswith('Transferred entry: '):
+            value = value[len('Transferred entry: '):].rstrip().rstrip('.')
+            alt_ids.extend(_split_transfer_ids(value))
+        elif descriptor == DE:
+            name = value.rstrip('.')
+        elif descriptor == AN:
+            synonyms.append(value.rstrip('.'))
+        elif descriptor == PR:
+            prosite_ids.append(value[len('PROSITE; '):-1])  # remove trailing comma
+        elif descriptor == DR:
+            for uniprot_entry in value.replace(' ', '').split(';'):
+                if not uniprot_entry:
+                    continue
+                accession_number, entry_name = uniprot_entry.split(',')
+                accession_numbers.append(accession_number)
+                entry_names.append(entry_name)
+
+    return ExpasyEntry(
+        expasy_id=expasy_id,
+        name=name,
+        deleted=deleted,
+        synonyms=synonyms,
+        alt_ids=alt_ids,
+        prosite_ids=prosite_ids,
+        accession_numbers=accession_numbers,
+        entry_names=entry_names,
+    )
+
+
+def _split_transfer_ids(value: str) -> List[str]:
+    """Split the targets of a transferred entry like ``1.1.1.198, 1.1.1.227 and 1.1.1.228``."""
+    return [
+        transfer_id.strip()
+        for part in value.split(',')
+        for transfer_id in part.split(' and ')
+        if transfer_id.strip()
+    ]
+
+
 if __name__ == '__main__':
     r = get_expasy_database()
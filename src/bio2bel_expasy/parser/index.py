@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""Random access to single entries of the ENZYME database without parsing the whole file.
+
+An index from the EC code of each record to the byte range of that record is built with one pass over the file and
+persisted next to it with :func:`bio2bel_expasy.parser.cache.write_cache`, so it is rebuilt automatically when the file
+changes. Records are then read from a memory map and parsed on demand.
+
+>>> from bio2bel_expasy.parser.index import ExpasyFile
+>>> with ExpasyFile() as expasy_file:
+...     entry = expasy_file.get('1.1.1.2')
+"""
+
+import logging
+import mmap
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from bio2bel_expasy.constants import EXPASY_INDEX_PATH
+from bio2bel_expasy.ec_code import ECCode
+from bio2bel_expasy.parser.cache import read_cache, write_cache
+from bio2bel_expasy.parser.database import download_expasy_database, iter_expasy_entries
+from bio2bel_expasy.parser.records import ExpasyEntry
+
+__all__ = [
+    'ExpasyFile',
+    'build_expasy_index',
+]
+
+log = logging.getLogger(__name__)
+
+_ID_PREFIX = b'ID   '
+_END = b'\n//'
+
+
+def _find_record(buffer, position: int) -> int:
+    """Return the offset of the first ``ID`` line at or after the position, or -1 if there are none left."""
+    if position == 0 and buffer[:len(_ID_PREFIX)] == _ID_PREFIX:
+        return 0
+    offset = buffer.find(b'\n' + _ID_PREFIX, max(position - 1, 0))
+    return offset if offset == -1 else offset + 1
+
+
+def build_expasy_index(buffer) -> Dict[ECCode, Tuple[int, int]]:
+    """Build a dictionary from the EC code of each record to the (start, stop) byte range of the record.
+
+    :param buffer: The contents of the ExPASy database file as :class:`bytes` or a :class:`mmap.mmap`
+    """
+    rv = {}
+    size = len(buffer)
+
+    start = _find_record(buffer, 0)
+    while start != -1:
+        id_end = buffer.find(b'\n', start)
+        if id_end == -1:
+            id_end = size
+        expasy_id = ECCode(buffer[start + len(_ID_PREFIX):id_end].decode('utf-8').strip())
+
+        next_start = _find_record(buffer, id_end)
+        end = buffer.find(_END, id_end)
+        if end == -1 or -1 < next_start < end:  # record without a terminator
+            stop = size if next_start == -1 else next_start
+        else:
+            line_end = buffer.find(b'\n', end + len(_END))
+            stop = size if line_end == -1 else line_end + 1
+
+        rv[expasy_id] = start, stop
+        start = _find_record(buffer, stop)
+
+    return rv
+
+
+class ExpasyFile:
+    """A read-only, memory-mapped view over the ENZYME database file with random access to its entries."""
+
+    def __init__(self, path: Optional[str] = None, index_path: Optional[str] = None,
+                 force_download: bool = False) -> None:
+        """Open the file, building its index if it has not been built for this version of the file.
+
+        :param path: path to the file. Defaults to the downloaded file.
+        :param index_path: path at which the index is persisted. Defaults to
+         :data:`bio2bel_expasy.constants.EXPASY_INDEX_PATH` for the downloaded file and to a sibling of the given file
+         otherwise.
+        :param force_download: True to force download resources
+        :raises ValueError: if the file is empty or has a record with an invalid EC code
+        """
+        if path is None:
+            path = download_expasy_database(force_download=force_download)
+            if index_path is None:
+                index_path = EXPASY_INDEX_PATH
+        elif index_path is None:
+            index_path = f'{path}.index'
+
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = None
+        try:
+            if 0 == os.fstat(self._file.fileno()).st_size:
+                raise ValueError(f'{path} is empty')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            index = read_cache(index_path, path)
+            if index is None:
+                log.info('indexing %s', path)
+                index = build_expasy_index(self._mmap)
+                write_cache(index_path, path, {str(code): byte_range for code, byte_range in index.items()})
+            else:
+                index = {ECCode(expasy_id): byte_range for expasy_id, byte_range in index.items()}
+        except Exception:
+            self.close()
+            raise
+
+        self._index: Dict[ECCode, Tuple[int, int]] = index
+
+    def get_range(self, expasy_id: str) -> Optional[Tuple[int, int]]:
+        """Get the (start, stop) byte range of the record with the given ExPASy identifier, in any spelling."""
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return
+        return self._index.get(code)
+
+    def get(self, expasy_id: str) -> Optional[ExpasyEntry]:
+        """Parse and return the entry with the given ExPASy identifier, if it exists.
+
+        :param expasy_id: An ExPASy identifier. Example: 1.1.1.2
+        """
+        byte_range = self.get_range(expasy_id)
+        if byte_range is None:
+            return
+
+        start, stop = byte_range
+        lines = self._mmap[start:stop].decode('utf-8').splitlines()
+        return next(iter_expasy_entries(lines), None)
+
+    def __contains__(self, expasy_id: str) -> bool:
+        return self.get_range(expasy_id) is not None
+
+    def __iter__(self) -> Iterator[ECCode]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        """Close the memory map and the underlying file."""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ExpasyFile':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
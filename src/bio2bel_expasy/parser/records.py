@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""Compact record types for parsed ExPASy entries.
+
+Each entry of the ENZYME database is held by a slotted :class:`ExpasyEntry` rather than a nest of dictionaries. Its
+ProSite identifiers are interned, since they are shared between entries, and its UniProt accession numbers and entry
+names are each packed into a single delimited string, since there are hundreds of thousands of them per release and
+the per-object overhead of so many small strings would dominate. Use :meth:`ExpasyEntry.to_dict` to get the
+JSON-like dictionary form.
+"""
+
+import sys
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from bio2bel_expasy.constants import PROSITE, UNIPROT
+from bio2bel_expasy.ec_code import ECCode
+
+__all__ = [
+    'ExpasyEntry',
+]
+
+#: Separates the packed UniProt identifiers. Never occurs in them since the parser strips all whitespace.
+_SEPARATOR = ' '
+
+
+def _unpack(packed: str) -> Tuple[str, ...]:
+    if not packed:
+        return ()
+    return tuple(packed.split(_SEPARATOR))
+
+
+class ExpasyEntry:
+    """A parsed entry from the ENZYME database."""
+
+    __slots__ = (
+        'expasy_id',
+        'name',
+        'deleted',
+        'synonyms',
+        'alt_ids',
+        'prosite_ids',
+        '_accession_numbers',
+        '_entry_names',
+    )
+
+    def __init__(
+        self,
+        expasy_id: str,
+        name: Optional[str] = None,
+        deleted: bool = False,
+        synonyms: Iterable[str] = (),
+        alt_ids: Iterable[str] = (),
+        prosite_ids: Iterable[str] = (),
+        accession_numbers: Iterable[str] = (),
+        entry_names: Iterable[str] = (),
+    ) -> None:
+        """Build an entry.
+
+        :param expasy_id: The ExPASy identifier of the entry
+        :param name: The description of the entry
+        :param deleted: True if the entry has been deleted
+        :param synonyms: Additional names of the entry
+        :param alt_ids: The ExPASy identifiers to which the entry has been transferred
+        :param prosite_ids: The ProSite identifiers of the entry's domains
+        :param accession_numbers: The UniProt accession numbers of the entry's proteins
+        :param entry_names: The UniProt entry names of the entry's proteins, parallel to ``accession_numbers``
+        """
+        self.expasy_id = ECCode(expasy_id)
+        self.name = name
+        self.deleted = deleted
+        self.synonyms = tuple(synonyms)
+        self.alt_ids = tuple(alt_ids)
+        self.prosite_ids = tuple(sys.intern(prosite_id) for prosite_id in prosite_ids)
+        self._accession_numbers = _SEPARATOR.join(accession_numbers)
+        self._entry_names = _SEPARATOR.join(entry_names)
+
+        if self._accession_numbers.count(_SEPARATOR) != self._entry_names.count(_SEPARATOR):
+            raise ValueError(f'{expasy_id} has mismatched UniProt accession numbers and entry names')
+
+    @property
+    def accession_numbers(self) -> Tuple[str, ...]:
+        """Return the UniProt accession numbers of this entry's proteins."""
+        return _unpack(self._accession_numbers)
+
+    @property
+    def entry_names(self) -> Tuple[str, ...]:
+        """Return the UniProt entry names of this entry's proteins, parallel to :attr:`accession_numbers`."""
+        return _unpack(self._entry_names)
+
+    @property
+    def parent_id(self) -> ECCode:
+        """Return the ExPASy identifier of this entry's sub-subclass."""
+        return self.expasy_id.parent
+
+    @property
+    def transferred(self) -> bool:
+        """Return if this entry has been transferred to other entries."""
+        return bool(self.alt_ids)
+
+    @property
+    def proteins(self) -> Iterable[Tuple[str, str]]:
+        """Iterate over the (accession number, entry name) pairs of this entry's UniProt proteins."""
+        return zip(self.accession_numbers, self.entry_names)
+
+    def to_dict(self) -> Mapping[str, Any]:
+        """Return the JSON-like dictionary form of this entry."""
+        concept = {
+            'namespace': 'ec-code',
+            'identifier': self.expasy_id,
+        }
+        if self.name is not None:
+            concept['name'] = self.name
+
+        return {
+            'concept': concept,
+            'parent': {
+                'namespace': 'ec-code',
+                'identifier': self.parent_id,
+            },
+            'deleted': self.deleted,
+            'synonyms': list(self.synonyms),
+            'domains': [
+                {
+                    'namespace': PROSITE,
+                    'identifier': prosite_id,
+                }
+                for prosite_id in self.prosite_ids
+            ],
+            'proteins': [
+                {
+                    'namespace': UNIPROT,
+                    'name': entry_name,
+                    'identifier': accession_number,
+                }
+                for accession_number, entry_name in self.proteins
+            ],
+            'alt_ids': list(self.alt_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'ExpasyEntry':
+        """Build an entry from its JSON-like dictionary form."""
+        return cls(
+            expasy_id=data['concept']['identifier'],
+            name=data['concept'].get('name'),
+            deleted=data['deleted'],
+            synonyms=data['synonyms'],
+            alt_ids=data['alt_ids'],
+            prosite_ids=[domain['identifier'] for domain in data['domains']],
+            accession_numbers=[protein['identifier'] for protein in data['proteins']],
+            entry_names=[protein['name'] for protein in data['proteins']],
+        )
+
+    def __getstate__(self) -> Tuple:
+        # the identifier is stored as a plain string so the state can be serialized with marshal
+        return (str(self.expasy_id),) + tuple(
+            getattr(self, slot)
+            for slot in ExpasyEntry.__slots__[1:]
+        )
+
+    def __setstate__(self, state: Tuple) -> None:
+        for slot, value in zip(ExpasyEntry.__slots__, state):
+            setattr(self, slot, value)
+        self.expasy_id = ECCode(self.expasy_id)
+        self.prosite_ids = tuple(sys.intern(prosite_id) for prosite_id in self.prosite_ids)
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> 'ExpasyEntry':
+        """Build an entry from the flat tuple returned by :meth:`__getstate__`."""
+        entry = cls.__new__(cls)
+        entry.__setstate__(state)
+        return entry
+
+    def __eq__(self, other):
+        return isinstance(other, ExpasyEntry) and all(
+            getattr(self, slot) == getattr(other, slot)
+            for slot in ExpasyEntry.__slots__
+        )
+
+    def __repr__(self):
+        return f'ExpasyEntry({self.expasy_id!r}, name={self.name!r})'
@@ -2,11 +2,13 @@
 
 import json
 import logging
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
+import networkx as nx
 from bio2bel.downloading import make_downloader
 
 from bio2bel_expasy.constants import EXPASY_TREE_DATA_PATH, EXPASY_TREE_URL
+from bio2bel_expasy.ec_code import ECCode
 from bio2bel_expasy.utils import normalize_expasy_id
 
 __all__ = [
@@ -20,56 +22,23 @@ log = logging.getLogger(__name__)
 download_expasy_tree = make_downloader(EXPASY_TREE_URL, EXPASY_TREE_DATA_PATH)
 
 
-def give_edge(head_str):
-    """Returns (parent, child) tuple for given id
+def give_edge(head_str: str) -> Tuple[int, Optional[ECCode], ECCode]:
+    """Return the level, parent, and canonical form of the given EC code.
 
-    :param str head_str:
-    :rtype: tuple
+    :param head_str: An EC code, possibly with spaces like ``1. 1. 1.-``
     """
-    head_str = normalize_expasy_id(head_str)
-    nums = head_str.split('.')
-    for i, obj in enumerate(nums):
-        nums[i] = obj.strip()
-
-    while '-' in nums:
-        nums.remove('-')
-
-    level = len(nums)
-
-    if level == 1:
-        return level, None, "{}.-.-.-".format(nums[0])
-
-    if level == 2:
-        return (
-            level,
-            normalize_expasy_id("{}. -. -.-".format(nums[0])),
-            normalize_expasy_id("{}.{:>2}. -.-".format(nums[0], nums[1])),
-        )
-
-    if level == 3:
-        return (
-            level,
-            normalize_expasy_id("{}.{:>2}. -.-".format(nums[0], nums[1])),
-            normalize_expasy_id("{}.{:>2}.{:>2}.-".format(nums[0], nums[1], nums[2])),
-        )
-
-    if level == 4:
-        return (
-            level,
-            normalize_expasy_id("{}.{:>2}.{:>2}.-".format(nums[0], nums[1], nums[2])),
-            normalize_expasy_id("{}.{:>2}.{:>2}.{}".format(nums[0], nums[1], nums[2], nums[3])),
-        )
+    code = ECCode(head_str)
+    return code.level, code.parent, code
 
 
 def _process_line(line, graph):
-    line.rstrip('\n')
     if not line[0].isnumeric():
         return
     head = line[:10]
-    l_nums, parent, child = give_edge(head)
+    level, parent, child = give_edge(head)
     name = line[11:]
     name = name.strip().strip('.')
-    graph.add_node(child, description=name)
+    graph.add_node(child, description=name, level=level)
     if parent is not None:
         graph.add_edge(parent, child)
 
@@ -103,8 +72,19 @@ def lines_to_json(lines):
     return rv
 
 
-def get_expasy_tree(path: Optional[str] = None, force_download: bool = False):
-    """Populate the graph from a given specific file.
+def lines_to_graph(lines: Iterable[str]) -> nx.DiGraph:
+    """Build a directed graph from parent enzyme classes to their children.
+
+    :param lines: An iterator over the ExPASy tree file or file-like
+    """
+    graph = nx.DiGraph()
+    for line in lines:
+        _process_line(line, graph)
+    return graph
+
+
+def get_expasy_tree(path: Optional[str] = None, force_download: bool = False) -> nx.DiGraph:
+    """Get the ExPASy tree as a directed graph whose nodes have a description and a level.
 
     :param path: The destination of the download
     :param force_download: True to force download
@@ -113,9 +93,9 @@ def get_expasy_tree(path: Optional[str] = None, force_download: bool = False):
         path = download_expasy_tree(force_download=force_download)
 
     with open(path) as file:
-        return lines_to_json(file)
+        return lines_to_graph(file)
 
 
 if __name__ == '__main__':
     tree = get_expasy_tree()
-    print(json.dumps(tree, indent=2))
+    print(json.dumps(nx.node_link_data(tree), indent=2))
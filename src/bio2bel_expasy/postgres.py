@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""Load a release into PostgreSQL with ``COPY``, through staging tables that are swapped in atomically.
+
+The rows of each table, with keys from :class:`bio2bel_expasy.bulk.ReleaseRows`, are streamed to temporary CSV files
+in one pass over the release. The tables are then created in a staging schema, filled with ``COPY ... FROM STDIN``,
+and moved over the live tables in a single transaction. Readers see either the old release or the new one, and a
+failure before the swap leaves the live tables untouched.
+
+This needs the :mod:`psycopg2` driver. Use it with ``Manager.populate(copy=True)``.
+"""
+
+import csv
+import logging
+import tempfile
+from contextlib import ExitStack
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+
+import networkx as nx
+from sqlalchemy.engine import Engine
+
+from .bulk import ReleaseRows, TABLES
+from .models import Base
+from .parser.records import ExpasyEntry
+
+__all__ = [
+    'STAGING_SCHEMA',
+    'copy_release',
+    'get_setval_statements',
+    'is_copy_supported',
+]
+
+log = logging.getLogger(__name__)
+
+#: The schema in which the new release is loaded before it is swapped in
+STAGING_SCHEMA = 'bio2bel_expasy_staging'
+
+#: The tables with a serial primary key, whose sequences need to be moved past the copied keys
+_SERIAL_TABLES = TABLES[:3]
+
+#: Written for NULLs, so they can be told apart from empty strings
+_NULL = r'\N'
+
+
+def is_copy_supported(engine: Engine) -> bool:
+    """Check if releases can be loaded into the database of the engine with :func:`copy_release`."""
+    return engine.dialect.name == 'postgresql' and engine.dialect.driver == 'psycopg2'
+
+
+def get_setval_statements(engine: Engine, schema: Optional[str] = None) -> List[str]:
+    """Get statements that move the primary key sequences past the largest keys, after keys were assigned in Python.
+
+    :param engine: An engine connected to PostgreSQL
+    :param schema: The schema of the tables. Defaults to the current schema.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    rv = []
+    for table in _SERIAL_TABLES:
+        name = quote(table.name) if schema is None else f'{quote(schema)}.{quote(table.name)}'
+        rv.append(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {name}), 0) + 1, false)"
+        )
+    return rv
+
+
+def copy_release(engine: Engine, tree: nx.DiGraph, entries: Iterable[ExpasyEntry]) -> Dict[str, int]:
+    """Replace the enzymes, ProSites, proteins, and their links in the database with the given release.
+
+    Sessions on the engine should not hold open transactions on the tables, or the swap waits for them.
+
+    :param engine: An engine connected to PostgreSQL with psycopg2
+    :param tree: The ExPASy tree from :func:`bio2bel_expasy.parser.tree.get_expasy_tree`
+    :param entries: The entries from :func:`bio2bel_expasy.parser.database.iter_expasy_database`
+    :return: The number of rows copied into each table
+    """
+    if not is_copy_supported(engine):
+        raise ValueError(f'COPY is not supported by {engine.dialect.name}+{engine.dialect.driver}')
+
+    quote = engine.dialect.identifier_preparer.quote
+    staging = quote(STAGING_SCHEMA)
+
+    with ExitStack() as stack:
+        files = {
+            table: stack.enter_context(tempfile.TemporaryFile('w+', newline=''))
+            for table in TABLES
+        }
+        counts = _write_csv(files, tree, entries)
+
+        log.info('creating staging tables in %s', STAGING_SCHEMA)
+        engine.execute(f'DROP SCHEMA IF EXISTS {staging} CASCADE')
+        engine.execute(f'CREATE SCHEMA {staging}')
+        with engine.connect() as connection:
+            staging_connection = connection.execution_options(schema_translate_map={None: STAGING_SCHEMA})
+            Base.metadata.create_all(staging_connection, tables=TABLES)
+
+        raw_connection = engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            cursor.execute('SELECT current_schema()')
+            live = quote(cursor.fetchone()[0])
+
+            for table in TABLES:
+                log.info('copying %d rows into %s', counts[table.name], table.name)
+                files[table].seek(0)
+                columns = ', '.join(quote(column.name) for column in table.columns)
+                cursor.copy_expert(
+                    f"COPY {staging}.{quote(table.name)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')",
+                    files[table],
+                )
+
+            for statement in get_setval_statements(engine, schema=STAGING_SCHEMA):
+                cursor.execute(statement)
+            raw_connection.commit()
+
+            log.info('swapping in the new release')
+            for table in reversed(TABLES):
+                cursor.execute(f'DROP TABLE IF EXISTS {live}.{quote(table.name)} CASCADE')
+            for table in TABLES:
+                cursor.execute(f'ALTER TABLE {staging}.{quote(table.name)} SET SCHEMA {live}')
+            cursor.execute(f'DROP SCHEMA {staging}')
+            for table in TABLES:
+                cursor.execute(f'ANALYZE {live}.{quote(table.name)}')
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+
+    return counts
+
+
+def _write_csv(files, tree: nx.DiGraph, entries: Iterable[ExpasyEntry]) -> Dict[str, int]:
+    """Write the rows of each table to its file, returning the number of rows in each table."""
+    writers = {
+        table: csv.writer(file)
+        for table, file in files.items()
+    }
+    columns = {
+        table: [column.name for column in table.columns]
+        for table in files
+    }
+    counts = {table.name: 0 for table in files}
+
+    release_rows = ReleaseRows()
+    rows = chain(
+        release_rows.iter_class_rows(tree),
+        release_rows.iter_entry_rows(entries),
+    )
+    for table, row in chain(rows, release_rows.iter_closure_rows()):
+        writers[table].writerow([
+            _NULL if row.get(column) is None else row[column]
+            for column in columns[table]
+        ])
+        counts[table.name] += 1
+
+    return counts
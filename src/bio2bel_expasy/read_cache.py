@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+"""A bounded cache for the read-side lookups of the manager.
+
+The models returned by the session can't be shared safely: they expire on commit, load their relationships lazily
+through the session that loaded them, and can be changed by whoever holds them. The cache instead holds immutable
+records, built from the models while they are still attached, so a cached result stays valid after the session is
+closed, and can be shared between callers and threads.
+
+:class:`LRUCache` evicts the least recently used entry once it holds ``maxsize`` of them, and optionally expires
+entries ``ttl`` seconds after they were stored. Lookups of identifiers that are not in the database are cached too,
+since unknown identifiers are looked up as often as known ones when enriching graphs.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Tuple, TypeVar
+
+import pybel.dsl
+
+from .constants import MODULE_NAME, PROSITE, UNIPROT
+from .ec_code import ECCode
+from .models import Enzyme, Prosite, Protein
+
+__all__ = [
+    'CacheInfo',
+    'LRUCache',
+    'EnzymeRecord',
+    'PrositeRecord',
+    'ProteinRecord',
+]
+
+V = TypeVar('V')
+
+#: Marks a key that is not in the cache, since ``None`` is a valid cached value
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """The statistics of a :class:`LRUCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache(Generic[V]):
+    """A thread-safe least recently used cache with an optional time to live.
+
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.get_or_load('a', str.upper), cache.get_or_load('b', str.upper), cache.get_or_load('a', str.upper)
+    ('A', 'B', 'A')
+    >>> _ = cache.get_or_load('c', str.upper)  # evicts 'b', the least recently used
+    >>> 'b' in cache, cache.info()
+    (False, CacheInfo(hits=1, misses=3, evictions=1, size=2, maxsize=2))
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Build an empty cache.
+
+        :param maxsize: The largest number of entries held. A size of zero disables the cache.
+        :param ttl: If given, the number of seconds after which an entry expires
+        :param timer: The clock used for expiring entries
+        """
+        if maxsize < 0:
+            raise ValueError(f'maxsize must not be negative: {maxsize}')
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, V]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._get(key, count=False) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Hashable, count: bool = True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored, value = entry
+                if self.ttl is None or self.timer() - stored < self.ttl:
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if count:
+                self.misses += 1
+            return _MISSING
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store the value, evicting the least recently used entries if the cache is full."""
+        if not self.maxsize:
+            return
+
+        with self._lock:
+            self._entries[key] = self.timer(), value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, load: Callable[[Hashable], V]) -> V:
+        """Get the value for the key, calling ``load(key)`` and storing its result on a miss.
+
+        The lock is not held while loading, so two threads missing the same key at once both load it.
+        """
+        value = self._get(key)
+        if value is _MISSING:
+            value = load(key)
+            self.put(key, value)
+        return value
+
+    def get_or_load_many(
+        self,
+        keys: Iterable[Hashable],
+        load_many: Callable[[List[Hashable]], Mapping[Hashable, V]],
+    ) -> Dict[Hashable, V]:
+        """Get the values for the keys, calling ``load_many(missed_keys)`` once for all misses and storing the results.
+
+        Keys that ``load_many`` leaves out are stored with ``None``, like a ``load`` that returns ``None``.
+        """
+        rv, missed = {}, []
+        for key in dict.fromkeys(keys):
+            value = self._get(key)
+            if value is _MISSING:
+                missed.append(key)
+            else:
+                rv[key] = value
+
+        if missed:
+            loaded = load_many(missed)
+            for key in missed:
+                rv[key] = loaded.get(key)
+                self.put(key, rv[key])
+
+        return rv
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the statistics."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        """Get the statistics of the cache."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
+
+
+class EnzymeRecord(NamedTuple):
+    """An immutable copy of an enzyme."""
+
+    expasy_id: str
+    description: Optional[str]
+    #: The ExPASy identifier of the parent, if the enzyme has one
+    parent_id: Optional[str]
+
+    @classmethod
+    def from_model(cls, enzyme: Enzyme) -> 'EnzymeRecord':
+        """Copy the enzyme model."""
+        parent = enzyme.parent
+        return cls(
+            expasy_id=enzyme.expasy_id,
+            description=enzyme.description,
+            parent_id=None if parent is None else parent.expasy_id,
+        )
+
+    def as_bel(self) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing this enzyme."""
+        return Enzyme.bel_from_expasy_id(self.expasy_id)
+
+    def __str__(self):
+        return f'{MODULE_NAME}:{self.expasy_id} ! {self.description}'
+
+
+class PrositeRecord(NamedTuple):
+    """An immutable copy of a ProSite entry, with the ExPASy identifiers of its enzymes in numeric order."""
+
+    prosite_id: str
+    expasy_ids: Tuple[str, ...]
+
+    @classmethod
+    def from_model(cls, prosite: Prosite) -> 'PrositeRecord':
+        """Copy the ProSite model."""
+        return cls(
+            prosite_id=prosite.prosite_id,
+            expasy_ids=tuple(sorted(ECCode(enzyme.expasy_id) for enzyme in prosite.enzymes)),
+        )
+
+    def as_bel(self) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing this ProSite entry."""
+        return Prosite.bel_from_prosite_id(self.prosite_id)
+
+    def __str__(self):
+        return f'{PROSITE}:{self.prosite_id}'
+
+
+class ProteinRecord(NamedTuple):
+    """An immutable copy of a UniProt entry, with the ExPASy identifiers of its enzymes in numeric order."""
+
+    accession_number: str
+    entry_name: Optional[str]
+    expasy_ids: Tuple[str, ...]
+
+    @classmethod
+    def from_model(cls, protein: Protein) -> 'ProteinRecord':
+        """Copy the protein model."""
+        return cls(
+            accession_number=protein.accession_number,
+            entry_name=protein.entry_name,
+            expasy_ids=tuple(sorted(ECCode(enzyme.expasy_id) for enzyme in protein.enzymes)),
+        )
+
+    def as_bel(self) -> pybel.dsl.Protein:
+        """Return a PyBEL node representing this UniProt entry."""
+        return Protein.bel_from_uniprot_id(self.accession_number, self.entry_name)
+
+    def __str__(self):
+        return f'{UNIPROT}:{self.accession_number}'
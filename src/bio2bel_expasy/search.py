@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""A full-text index over the names and synonyms of the enzymes.
+
+The index is kept in its own table, which is filled from the enzyme and synonym tables with one statement by
+:func:`rebuild_search_index` whenever a release is loaded or updated. It holds a single row per enzyme, keyed by the
+primary key of the enzyme, so it is only a few megabytes for a full release and rebuilding it takes a fraction of a
+second.
+
+- On SQLite, it is an `FTS5 <https://www.sqlite.org/fts5.html>`_ table whose words are stemmed with the Porter
+  stemmer. Matches are ranked with BM25, with the name of an enzyme counting twice as much as its synonyms.
+- On PostgreSQL, it is a table of ``tsvector`` documents with a GIN index, in which the name of an enzyme is weighted
+  above its synonyms. Matches are ranked with ``ts_rank``.
+
+Every word of the text has to match, in any order. Elsewhere, or before the index is built, :func:`search` isn't
+used, and :meth:`bio2bel_expasy.Manager.search_enzymes` falls back to a substring match.
+"""
+
+import logging
+import re
+from typing import List
+
+from sqlalchemy import text as sql
+from sqlalchemy.engine import Connection
+
+from .models import ENZYME_TABLE_NAME, SYNONYM_TABLE_NAME
+
+__all__ = [
+    'SEARCH_TABLE_NAME',
+    'is_search_supported',
+    'has_search_index',
+    'rebuild_search_index',
+    'drop_search_index',
+    'search',
+]
+
+log = logging.getLogger(__name__)
+
+SEARCH_TABLE_NAME = f'{ENZYME_TABLE_NAME}_search'
+
+#: The weights of the name and the synonyms of an enzyme in the BM25 ranking of SQLite
+_SQLITE_WEIGHTS = 2.0, 1.0
+
+#: The text search configuration of PostgreSQL, which sets how words are stemmed
+_POSTGRES_CONFIGURATION = 'english'
+
+_WORD = re.compile(r'\w+')
+
+
+def is_search_supported(connection: Connection) -> bool:
+    """Check if the full-text index can be built in the database, which needs SQLite with FTS5 or PostgreSQL."""
+    if connection.dialect.name == 'postgresql':
+        return True
+    if connection.dialect.name != 'sqlite':
+        return False
+    options = {option for option, in connection.execute('PRAGMA compile_options')}
+    return 'ENABLE_FTS5' in options
+
+
+def has_search_index(connection: Connection) -> bool:
+    """Check if the search table exists, which it doesn't until a release is loaded."""
+    return connection.dialect.has_table(connection, SEARCH_TABLE_NAME)
+
+
+def _quote(connection: Connection, name: str) -> str:
+    return connection.dialect.identifier_preparer.quote(name)
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the search table, if it exists."""
+    connection.execute(f'DROP TABLE IF EXISTS {_quote(connection, SEARCH_TABLE_NAME)}')
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Create the search table again, filled from the enzymes and synonyms in the database, without committing.
+
+    :param connection: A connection to SQLite with FTS5 or to PostgreSQL
+    """
+    search_table = _quote(connection, SEARCH_TABLE_NAME)
+    enzyme_table = _quote(connection, ENZYME_TABLE_NAME)
+    synonym_table = _quote(connection, SYNONYM_TABLE_NAME)
+
+    drop_search_index(connection)
+    log.info('building the search index')
+
+    if connection.dialect.name == 'sqlite':
+        connection.execute(
+            f"CREATE VIRTUAL TABLE {search_table} USING fts5(name, synonyms, tokenize='porter unicode61')"
+        )
+        connection.execute(
+            f'INSERT INTO {search_table} (rowid, name, synonyms) '
+            f'SELECT enzyme.id, enzyme.description, ('
+            f"  SELECT group_concat(synonym.name, ' ') FROM {synonym_table} AS synonym"
+            f'  WHERE synonym.enzyme_id = enzyme.id'
+            f') FROM {enzyme_table} AS enzyme'
+        )
+    else:
+        connection.execute(f'CREATE TABLE {search_table} (enzyme_id INTEGER PRIMARY KEY, document TSVECTOR NOT NULL)')
+        connection.execute(
+            f'INSERT INTO {search_table} (enzyme_id, document) '
+            f'SELECT enzyme.id, '
+            f"  setweight(to_tsvector('{_POSTGRES_CONFIGURATION}', coalesce(enzyme.description, '')), 'A') || "
+            f"  setweight(to_tsvector('{_POSTGRES_CONFIGURATION}', coalesce(string_agg(synonym.name, ' '), '')), 'B') "
+            f'FROM {enzyme_table} AS enzyme '
+            f'LEFT JOIN {synonym_table} AS synonym ON synonym.enzyme_id = enzyme.id '
+            f'GROUP BY enzyme.id, enzyme.description'
+        )
+        index = _quote(connection, f'ix_{SEARCH_TABLE_NAME}_document')
+        connection.execute(f'CREATE INDEX {index} ON {search_table} USING GIN (document)')
+
+
+def search(connection: Connection, text: str, limit: int = 10) -> List[int]:
+    """Get the primary keys of the enzymes whose names or synonyms contain every word of the text, best first.
+
+    :param connection: A connection to a database whose search table was built by :func:`rebuild_search_index`
+    :param text: Free text. Punctuation is ignored, so it does not need to be escaped.
+    :param limit: The largest number of matches returned
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return []
+
+    search_table = _quote(connection, SEARCH_TABLE_NAME)
+
+    if connection.dialect.name == 'sqlite':
+        query = ' '.join(f'"{word}"' for word in words)  # quoted, so words like AND and NEAR are not operators
+        result = connection.execute(sql(
+            f'SELECT rowid FROM {search_table} WHERE {search_table} MATCH :query '
+            f'ORDER BY bm25({search_table}, {_SQLITE_WEIGHTS[0]}, {_SQLITE_WEIGHTS[1]}), rowid LIMIT :limit'
+        ), {'query': query, 'limit': limit})
+    elif connection.dialect.name == 'postgresql':
+        result = connection.execute(sql(
+            f"SELECT enzyme_id FROM {search_table}, plainto_tsquery('{_POSTGRES_CONFIGURATION}', :query) AS query "
+            f'WHERE document @@ query ORDER BY ts_rank(document, query) DESC, enzyme_id LIMIT :limit'
+        ), {'query': ' '.join(words), 'limit': limit})
+    else:
+        return []
+
+    return [enzyme_pk for enzyme_pk, in result]
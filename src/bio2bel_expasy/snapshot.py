@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+
+"""An immutable, in-memory copy of the database for serving lookups and enrichment without SQL.
+
+The whole ENZYME dataset fits in memory, so for serving, :meth:`bio2bel_expasy.Manager.snapshot` reads it once, with
+one query per table, into a :class:`Snapshot`. Enzymes, ProSites, and proteins are numbered by their positions in
+tuples of interned identifiers, and the relations between them are held in compressed sparse row (CSR) arrays: the
+related positions of item ``i`` are ``indices[offsets[i]:offsets[i + 1]]``. The parent of each enzyme is held in a
+plain array of positions.
+
+The snapshot has the same query and enrichment methods as the manager, but returns the immutable records from
+:mod:`bio2bel_expasy.read_cache` instead of models. It does not follow later changes to the database, so take a new
+one after populating or updating.
+"""
+
+import sys
+from array import array
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pybel import BELGraph
+from pybel.constants import IDENTIFIER, NAME, NAMESPACE
+from pybel.dsl import BaseEntity
+
+from .ec_code import ECCode
+from .hierarchy import HierarchyIndex
+from .models import Enzyme, Protein
+from .parallel import EnrichmentReport, enrich_graphs
+from .read_cache import EnzymeRecord, PrositeRecord, ProteinRecord
+
+__all__ = [
+    'Snapshot',
+]
+
+_ENZYME_NAMESPACES = {'expasy', 'ec', 'eccode', 'ec-code'}
+_UNIPROT_NAMESPACES = {'up', 'uniprot'}
+
+
+def _build_csr(pairs: Iterable[Tuple[int, int]], size: int) -> Tuple[array, array]:
+    """Build CSR offsets and indices from (row, column) pairs, keeping the order in which each row's columns came."""
+    rows = defaultdict(list)
+    for row, column in pairs:
+        rows[row].append(column)
+
+    offsets = array('i', [0] * (size + 1))
+    indices = array('i')
+    for row in range(size):
+        indices.extend(rows.get(row, ()))
+        offsets[row + 1] = len(indices)
+    return offsets, indices
+
+
+def _transpose(offsets: array, indices: array, size: int) -> Tuple[array, array]:
+    """Build the CSR arrays of the reverse relation."""
+    return _build_csr(
+        (
+            (indices[position], row)
+            for row in range(len(offsets) - 1)
+            for position in range(offsets[row], offsets[row + 1])
+        ),
+        size,
+    )
+
+
+class Snapshot:
+    """An immutable in-memory engine with the query and enrichment methods of :class:`bio2bel_expasy.Manager`."""
+
+    __slots__ = (
+        'hierarchy',
+        'expasy_ids',
+        'descriptions',
+        'prosite_ids',
+        'accession_numbers',
+        'entry_names',
+        '_enzyme_position',
+        '_prosite_position',
+        '_protein_position',
+        '_parent',
+        '_children',
+        '_enzyme_prosites',
+        '_prosite_enzymes',
+        '_enzyme_proteins',
+        '_protein_enzymes',
+    )
+
+    def __init__(
+        self,
+        enzymes: Iterable[Tuple[str, Optional[str], Optional[str]]],
+        prosite_links: Iterable[Tuple[str, str]],
+        protein_links: Iterable[Tuple[str, str, Optional[str]]],
+    ) -> None:
+        """Build a snapshot. Use :meth:`bio2bel_expasy.Manager.snapshot` to build one from the database.
+
+        :param enzymes: Triples of the ExPASy identifier, description, and ExPASy identifier of the parent of each
+         enzyme
+        :param prosite_links: Pairs of ExPASy identifiers and the ProSite identifiers linked to them
+        :param protein_links: Triples of ExPASy identifiers and the UniProt accession numbers and entry names linked
+         to them
+        """
+        enzymes = list(enzymes)
+        self.hierarchy = HierarchyIndex.from_codes(expasy_id for expasy_id, _, _ in enzymes)
+        #: The ExPASy identifiers of the enzymes, in the pre-order of the hierarchy
+        self.expasy_ids: Tuple[ECCode, ...] = self.hierarchy.codes
+        self._enzyme_position = {
+            expasy_id: position
+            for position, expasy_id in enumerate(self.expasy_ids)
+        }
+
+        descriptions = [None] * len(self.expasy_ids)
+        self._parent = array('i', [-1] * len(self.expasy_ids))
+        for expasy_id, description, parent_id in enzymes:
+            position = self._enzyme_position[expasy_id]
+            descriptions[position] = description
+            if parent_id is not None:
+                self._parent[position] = self._enzyme_position[parent_id]
+        self.descriptions: Tuple[Optional[str], ...] = tuple(descriptions)
+
+        self._children = _build_csr(
+            sorted(
+                ((parent, child) for child, parent in enumerate(self._parent) if parent != -1),
+                key=itemgetter(0),
+            ),
+            len(self.expasy_ids),
+        )
+
+        prosite_position, prosite_pairs = {}, []
+        for expasy_id, prosite_id in prosite_links:
+            position = prosite_position.setdefault(sys.intern(prosite_id), len(prosite_position))
+            prosite_pairs.append((self._enzyme_position[expasy_id], position))
+        self._prosite_position: Dict[str, int] = prosite_position
+        self.prosite_ids: Tuple[str, ...] = tuple(prosite_position)
+
+        protein_position, entry_names, protein_pairs = {}, [], []
+        for expasy_id, accession_number, entry_name in protein_links:
+            position = protein_position.get(accession_number)
+            if position is None:
+                position = protein_position[sys.intern(accession_number)] = len(protein_position)
+                entry_names.append(entry_name)
+            protein_pairs.append((self._enzyme_position[expasy_id], position))
+        self._protein_position: Dict[str, int] = protein_position
+        self.accession_numbers: Tuple[str, ...] = tuple(protein_position)
+        self.entry_names: Tuple[Optional[str], ...] = tuple(entry_names)
+
+        self._enzyme_prosites = _build_csr(prosite_pairs, len(self.expasy_ids))
+        self._prosite_enzymes = _transpose(*self._enzyme_prosites, len(self.prosite_ids))
+        self._enzyme_proteins = _build_csr(protein_pairs, len(self.expasy_ids))
+        self._protein_enzymes = _transpose(*self._enzyme_proteins, len(self.accession_numbers))
+
+    def __setattr__(self, key, value):
+        if hasattr(self, key):
+            raise AttributeError(f'{self.__class__.__name__} is immutable')
+        super().__setattr__(key, value)
+
+    @staticmethod
+    def _related(csr: Tuple[array, array], position: int) -> array:
+        offsets, indices = csr
+        return indices[offsets[position]:offsets[position + 1]]
+
+    def _enzyme_record(self, position: int) -> EnzymeRecord:
+        parent = self._parent[position]
+        return EnzymeRecord(
+            expasy_id=self.expasy_ids[position],
+            description=self.descriptions[position],
+            parent_id=None if parent == -1 else self.expasy_ids[parent],
+        )
+
+    def _prosite_record(self, position: int) -> PrositeRecord:
+        return PrositeRecord(
+            prosite_id=self.prosite_ids[position],
+            expasy_ids=self._sorted_expasy_ids(self._related(self._prosite_enzymes, position)),
+        )
+
+    def _protein_record(self, position: int) -> ProteinRecord:
+        return ProteinRecord(
+            accession_number=self.accession_numbers[position],
+            entry_name=self.entry_names[position],
+            expasy_ids=self._sorted_expasy_ids(self._related(self._protein_enzymes, position)),
+        )
+
+    def _sorted_expasy_ids(self, positions: Iterable[int]) -> Tuple[str, ...]:
+        # the enzymes are numbered in pre-order, so sorting their positions sorts them numerically
+        return tuple(self.expasy_ids[position] for position in sorted(positions))
+
+    def _get_enzyme_position(self, expasy_id: str) -> Optional[int]:
+        try:
+            code = ECCode(expasy_id)
+        except ValueError:
+            return
+        return self._enzyme_position.get(code)
+
+    def count_enzymes(self) -> int:
+        """Count the number of enzymes."""
+        return len(self.expasy_ids)
+
+    def count_enzyme_prosites(self) -> int:
+        """Count the number of links between enzymes and ProSites."""
+        return len(self._enzyme_prosites[1])
+
+    def count_prosites(self) -> int:
+        """Count the number of ProSites."""
+        return len(self.prosite_ids)
+
+    def count_enzyme_proteins(self) -> int:
+        """Count the number of links between enzymes and proteins."""
+        return len(self._enzyme_proteins[1])
+
+    def count_proteins(self) -> int:
+        """Count the number of proteins."""
+        return len(self.accession_numbers)
+
+    def summarize(self) -> Mapping[str, int]:
+        """Return a summary dictionary, like :meth:`bio2bel_expasy.Manager.summarize`."""
+        return dict(
+            enzymes=self.count_enzymes(),
+            enzyme_prosites=self.count_enzyme_prosites(),
+            prosites=self.count_prosites(),
+            enzyme_proteins=self.count_enzyme_proteins(),
+            proteins=self.count_proteins(),
+        )
+
+    def get_hierarchy(self) -> HierarchyIndex:
+        """Get the nested-interval index over the enzymes."""
+        return self.hierarchy
+
+    def get_enzyme_by_id(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        """Get an enzyme by its ExPASy identifier, which is canonicalized first."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is not None:
+            return self._enzyme_record(position)
+
+    def get_parent_by_expasy_id(self, expasy_id: str) -> Optional[EnzymeRecord]:
+        """Get the parent of the enzyme with the given ExPASy identifier, if both exist."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is not None and self._parent[position] != -1:
+            return self._enzyme_record(self._parent[position])
+
+    def get_children_by_expasy_id(self, expasy_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the children of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is not None:
+            return [self._enzyme_record(child) for child in self._related(self._children, position)]
+
+    def get_descendants_by_expasy_id(self, expasy_id: str) -> List[EnzymeRecord]:
+        """Get all enzymes below the enzyme with the given ExPASy identifier, nearest first."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is None:
+            return []
+
+        rv = []
+        level = [position]
+        while level:
+            level = sorted(child for parent in level for child in self._related(self._children, parent))
+            rv.extend(level)
+        return [self._enzyme_record(descendant) for descendant in rv]
+
+    def get_proteins_under_class(self, expasy_id: str) -> List[ProteinRecord]:
+        """Get the proteins of the enzyme with the given ExPASy identifier and of all enzymes below it."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is None:
+            return []
+
+        enzymes = [position]
+        proteins = set()
+        while enzymes:
+            enzyme = enzymes.pop()
+            proteins.update(self._related(self._enzyme_proteins, enzyme))
+            enzymes.extend(self._related(self._children, enzyme))
+
+        return [
+            self._protein_record(protein)
+            for protein in sorted(proteins, key=self.accession_numbers.__getitem__)
+        ]
+
+    def get_protein_by_uniprot_id(self, uniprot_id: str) -> Optional[ProteinRecord]:
+        """Get a protein by its UniProt accession number."""
+        position = self._protein_position.get(uniprot_id)
+        if position is not None:
+            return self._protein_record(position)
+
+    def get_prosite_by_id(self, prosite_id: str) -> Optional[PrositeRecord]:
+        """Get a ProSite by its identifier."""
+        position = self._prosite_position.get(prosite_id)
+        if position is not None:
+            return self._prosite_record(position)
+
+    def get_prosites_by_expasy_id(self, expasy_id: str) -> Optional[List[PrositeRecord]]:
+        """Get the ProSites of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is not None:
+            return [self._prosite_record(prosite) for prosite in self._related(self._enzyme_prosites, position)]
+
+    def get_enzymes_by_prosite_id(self, prosite_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the enzymes of the ProSite with the given identifier, or None if it doesn't exist."""
+        position = self._prosite_position.get(prosite_id)
+        if position is not None:
+            return [self._enzyme_record(enzyme) for enzyme in self._related(self._prosite_enzymes, position)]
+
+    def get_proteins_by_expasy_id(self, expasy_id: str) -> Optional[List[ProteinRecord]]:
+        """Get the proteins of the enzyme with the given ExPASy identifier, or None if it doesn't exist."""
+        position = self._get_enzyme_position(expasy_id)
+        if position is not None:
+            return [self._protein_record(protein) for protein in self._related(self._enzyme_proteins, position)]
+
+    def get_enzymes_by_uniprot_id(self, uniprot_id: str) -> Optional[List[EnzymeRecord]]:
+        """Get the enzymes of the protein with the given UniProt accession number, or None if it doesn't exist."""
+        position = self._protein_position.get(uniprot_id)
+        if position is not None:
+            return [self._enzyme_record(enzyme) for enzyme in self._related(self._protein_enzymes, position)]
+
+    def get_enzymes_by_uniprot_ids(self, uniprot_ids: Iterable[str]) -> Dict[str, List[EnzymeRecord]]:
+        """Get the enzymes of each of the proteins found with the given UniProt accession numbers."""
+        return self._get_many(self.get_enzymes_by_uniprot_id, uniprot_ids)
+
+    def get_enzymes_by_prosite_ids(self, prosite_ids: Iterable[str]) -> Dict[str, List[EnzymeRecord]]:
+        """Get the enzymes of each of the ProSites found with the given identifiers."""
+        return self._get_many(self.get_enzymes_by_prosite_id, prosite_ids)
+
+    def get_proteins_by_expasy_ids(self, expasy_ids: Iterable[str]) -> Dict[str, List[ProteinRecord]]:
+        """Get the proteins of each of the enzymes found with the given ExPASy identifiers."""
+        return self._get_many(self.get_proteins_by_expasy_id, expasy_ids)
+
+    def get_prosites_by_expasy_ids(self, expasy_ids: Iterable[str]) -> Dict[str, List[PrositeRecord]]:
+        """Get the ProSites of each of the enzymes found with the given ExPASy identifiers."""
+        return self._get_many(self.get_prosites_by_expasy_id, expasy_ids)
+
+    @staticmethod
+    def _get_many(get, keys: Iterable[str]) -> Dict[str, Sequence]:
+        rv = {}
+        for key in keys:
+            value = get(key)
+            if value is not None:
+                rv[key] = value
+        return rv
+
+    def _look_up_expasy_id(self, node: BaseEntity) -> Optional[ECCode]:
+        """Get the ExPASy identifier of the given node if it is an enzyme in the snapshot."""
+        namespace = node.get(NAMESPACE)
+        if namespace is None or namespace.lower() not in _ENZYME_NAMESPACES:
+            return
+
+        expasy_id = node.get(IDENTIFIER) or node.get(NAME)
+        position = None if expasy_id is None else self._get_enzyme_position(expasy_id)
+        if position is not None:
+            return self.expasy_ids[position]
+
+    def enrich_proteins_with_enzyme_families(self, graph: BELGraph) -> None:
+        """Enrich proteins in the BEL graph with IS_A relations to their enzyme classes."""
+        for node in list(graph):
+            namespace = node.get(NAMESPACE)
+            if namespace is None or namespace.lower() not in _UNIPROT_NAMESPACES:
+                continue
+
+            position = self._protein_position.get(node.identifier)
+            if position is None:
+                continue
+
+            for enzyme in self._related(self._protein_enzymes, position):
+                graph.add_is_a(Enzyme.bel_from_expasy_id(self.expasy_ids[enzyme]), node)
+
+    def enrich_enzyme_with_proteins(self, graph: BELGraph, node: BaseEntity) -> None:
+        """Enrich an enzyme with all of its member proteins."""
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None or expasy_id.level != 4:
+            return
+
+        for protein in self.get_proteins_by_expasy_id(expasy_id):
+            graph.add_is_a(protein.as_bel(), node)
+
+    def enrich_enzyme_parents(self, graph: BELGraph, node: BaseEntity) -> None:
+        """Enrich an enzyme with its parents."""
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None:
+            return
+
+        child = node
+        for parent_id in self.hierarchy.ancestors(expasy_id):
+            parent = Enzyme.bel_from_expasy_id(parent_id)
+            graph.add_is_a(child, parent)
+            child = parent
+
+    def enrich_enzyme_children(self, graph: BELGraph, node: BaseEntity, proteins: bool = False) -> None:
+        """Enrich an enzyme with all of its children, and theirs.
+
+        :param proteins: If true, also enrich the entries of the subtree with their member proteins
+        """
+        expasy_id = self._look_up_expasy_id(node)
+        if expasy_id is None:
+            return
+
+        for child_id in self.hierarchy.descendants(expasy_id):
+            parent_id = self.hierarchy.parent(child_id)
+            parent = node if parent_id == expasy_id else Enzyme.bel_from_expasy_id(parent_id)
+            graph.add_is_a(Enzyme.bel_from_expasy_id(child_id), parent)
+
+        if not proteins:
+            return
+
+        for child_id in (expasy_id, *self.hierarchy.descendants(expasy_id)):
+            child = node if child_id == expasy_id else Enzyme.bel_from_expasy_id(child_id)
+            for protein in self._related(self._enzyme_proteins, self._enzyme_position[child_id]):
+                graph.add_is_a(Protein.bel_from_uniprot_id(self.accession_numbers[protein], self.entry_names[protein]), child)
+
+    def enrich_enzymes(self, graph: BELGraph) -> None:
+        """Add the parents and children of the enzymes in the graph, and the proteins of its entries.
+
+        The edges are added in the same order as by :meth:`bio2bel_expasy.Manager.enrich_enzymes`.
+        """
+        entries = []
+        for node in list(graph):
+            self.enrich_enzyme_parents(graph, node)
+            self.enrich_enzyme_children(graph, node)
+            entries.append(node)
+
+        for node in entries:
+            self.enrich_enzyme_with_proteins(graph, node)
+
+    def enrich_graphs(self, graphs: Iterable[BELGraph], workers: Optional[int] = None) -> EnrichmentReport:
+        """Enrich the enzymes in each of the graphs, in place, like :meth:`enrich_enzymes`.
+
+        :param graphs: The graphs to enrich
+        :param workers: The number of processes with which to enrich the graphs, which each get a copy of the
+         snapshot. Defaults to enriching serially.
+        """
+        return enrich_graphs(self, graphs, workers=workers)
+
+    def enrich_enzymes_with_prosites(self, graph: BELGraph) -> None:
+        """Enrich enzyme classes in the graph with ProSites."""
+        for node in list(graph):
+            expasy_id = self._look_up_expasy_id(node)
+            if expasy_id is None:
+                continue
+
+            for prosite in self.get_prosites_by_expasy_id(expasy_id):
+                graph.add_is_a(node, prosite.as_bel())
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""A profile for loading a release into an empty SQLite database quickly.
+
+Within :func:`bulk_load_profile`:
+
+- the journal is switched to write-ahead logging and ``synchronous`` is turned off, since a failed load is simply
+  rolled back or redone. Both are set back to what they were afterwards.
+- everything is loaded in one explicit transaction
+- the secondary indexes of the tables are dropped, then created again once the rows are in, which is faster than
+  maintaining them row by row. The primary keys, including the composite keys of the association tables, can't be
+  dropped in SQLite, so they are still maintained.
+- ``ANALYZE`` gathers statistics for the query planner at the end
+
+Use it with ``Manager.populate(sqlite_profile=True)``.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Mapping
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+__all__ = [
+    'bulk_load_profile',
+    'executemany',
+    'is_sqlite',
+]
+
+log = logging.getLogger(__name__)
+
+
+def is_sqlite(engine: Engine) -> bool:
+    """Check if the engine is connected to SQLite."""
+    return engine.dialect.name == 'sqlite'
+
+
+def executemany(session: Session, table: Table, rows: List[Mapping]) -> None:
+    """Insert the rows with the driver's ``executemany``, passing each row as a tuple.
+
+    For large loads, this skips most of the time SQLAlchemy spends processing the parameters of each row.
+
+    :param session: A session connected to SQLite
+    :param table: The table to insert into
+    :param rows: Dictionaries from column names to values. Missing columns are inserted as NULL.
+    """
+    connection = session.connection()
+    statement = str(table.insert().compile(dialect=connection.dialect))
+    columns = [column.name for column in table.columns]
+    cursor = connection.connection.cursor()
+    try:
+        cursor.executemany(statement, [
+            tuple(row.get(column) for column in columns)
+            for row in rows
+        ])
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def bulk_load_profile(session: Session, tables: Iterable[Table]) -> Iterator[None]:
+    """Load into the tables within the context in one transaction, with their secondary indexes created at the end.
+
+    The transaction is committed when the context exits, or rolled back, along with the dropped indexes, on errors.
+
+    :param session: A session connected to SQLite, without a transaction in progress
+    :param tables: The tables that are loaded into
+    """
+    session.commit()
+    pragmas = {
+        name: session.execute(f'PRAGMA {name}').scalar()
+        for name in ('journal_mode', 'synchronous', 'temp_store')
+    }
+    session.execute('PRAGMA journal_mode = WAL')
+    session.execute('PRAGMA synchronous = OFF')
+    session.execute('PRAGMA temp_store = MEMORY')
+
+    # the driver only opens transactions implicitly before data changes, so open one explicitly to include the DDL
+    session.execute('BEGIN')
+    connection = session.connection()
+    indexes = [index for table in tables for index in table.indexes]
+    try:
+        for index in indexes:
+            index.drop(connection)
+
+        yield
+
+        log.info('creating %d indexes', len(indexes))
+        for index in indexes:
+            index.create(connection)
+    except Exception:
+        session.rollback()
+        raise
+    else:
+        session.commit()
+    finally:
+        for name, value in pragmas.items():
+            session.execute(f'PRAGMA {name} = {value}')
+
+    log.info('analyzing')
+    session.execute('ANALYZE')
+    session.commit()
@@ -3,6 +3,14 @@
 """Utilities for Bio2BEL ExPASy."""
 
 import logging
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload, selectinload
 
 log = logging.getLogger(__name__)
 
@@ -13,3 +21,101 @@ def normalize_expasy_id(expasy_id: str) -> str:
     :param expasy_id: A possibly non-normalized ExPASy identifier
     """
     return expasy_id.replace(" ", "")
+
+
+X = TypeVar('X')
+
+#: The number of bound parameters per ``IN`` clause, under SQLite's historical limit of 999
+CHUNK_SIZE = 900
+
+
+def chunked(iterable: Iterable[X], size: int = CHUNK_SIZE) -> Iterable[List[X]]:
+    """Split the iterable into lists of at most the given size.
+
+    :param iterable: Any iterable
+    :param size: The maximum size of each chunk
+    """
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+#: The strategies for loading relationships along with a query. Give None to load them lazily, on first access.
+LOADING_STRATEGIES = {
+    'selectin': selectinload,
+    'joined': joinedload,
+}
+
+
+def get_loader_options(loading: Optional[str], *relationships) -> List:
+    """Get the query options that load the relationships with the given strategy.
+
+    :param loading: ``'selectin'`` to load the relationships with an extra ``SELECT ... IN`` statement, ``'joined'``
+     to load them with an outer join in the same statement, or None to load them lazily
+    :param relationships: Relationship attributes, like :data:`bio2bel_expasy.models.Enzyme.proteins`
+    :raises ValueError: If the strategy is unknown
+    """
+    if loading is None:
+        return []
+
+    loader = LOADING_STRATEGIES.get(loading)
+    if loader is None:
+        raise ValueError(f'unknown loading strategy {loading!r}. Use one of {sorted(LOADING_STRATEGIES)} or None')
+
+    return [loader(relationship) for relationship in relationships]
+
+
+class StatementCounter:
+    """Counts the SQL statements an engine sends to the database, by their first keyword.
+
+    A statement executed with many sets of parameters counts once, like it is sent once.
+
+    >>> from sqlalchemy import create_engine
+    >>> engine = create_engine('sqlite://')
+    >>> counter = StatementCounter(engine)
+    >>> _ = engine.execute('SELECT 1')
+    >>> counter.count, counter.counts['select']
+    (1, 1)
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """Start counting the statements of the given engine.
+
+        :param engine: A SQLAlchemy engine
+        """
+        self.engine = engine
+        #: The number of statements for each lowercase keyword, like ``select`` or ``insert``
+        self.counts = Counter()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        keyword = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ''
+        self.counts[keyword] += 1
+
+    @property
+    def count(self) -> int:
+        """Return the total number of statements counted."""
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        """Reset the counts to zero."""
+        self.counts.clear()
+
+    def close(self) -> None:
+        """Stop counting."""
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[StatementCounter]:
+    """Count the statements the engine executes within the context.
+
+    :param engine: A SQLAlchemy engine
+    """
+    counter = StatementCounter(engine)
+    try:
+        yield counter
+    finally:
+        counter.close()
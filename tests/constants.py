@@ -4,9 +4,11 @@
 
 import logging
 import os
+from contextlib import contextmanager
 
 from bio2bel.testing import make_temporary_cache_class_mixin
 from bio2bel_expasy import Manager
+from bio2bel_expasy.utils import count_statements
 
 log = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ resources_directory_path = os.path.join(HERE, 'resources')
 
 TREE_TEST_FILE = os.path.join(resources_directory_path, 'enzclass_test.txt')
 DATABASE_TEST_FILE = os.path.join(resources_directory_path, 'enzyme_test.dat')
+WRAPPED_DATABASE_TEST_FILE = os.path.join(resources_directory_path, 'enzyme_wrapped_test.dat')
 
 TemporaryCacheClsMixin = make_temporary_cache_class_mixin(Manager)
 
@@ -25,3 +28,14 @@ class PopulatedDatabaseMixin(TemporaryCacheClsMixin):
     def populate(cls):
         """Creates a persistent database and populates it with the test data"""
         cls.manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+
+    @contextmanager
+    def assertStatementCount(self, expected: int):
+        """Assert that the manager sends the given number of statements to the database within the context.
+
+        The session is expired first, so what was loaded before doesn't save any statements.
+        """
+        self.manager.session.expire_all()
+        with count_statements(self.manager.engine) as counter:
+            yield counter
+        self.assertEqual(expected, counter.count, msg=f'statements: {dict(counter.counts)}')
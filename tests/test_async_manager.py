@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the asyncio interface."""
+
+import asyncio
+import threading
+import time
+
+from bio2bel_expasy.async_manager import AsyncManager
+from tests.constants import PopulatedDatabaseMixin
+from tests.test_snapshot import EXPASY_IDS, PROSITE_IDS, UNIPROT_IDS
+
+LOOKUPS = [
+    ('get_enzyme_by_id', EXPASY_IDS),
+    ('get_parent_by_expasy_id', EXPASY_IDS),
+    ('get_children_by_expasy_id', EXPASY_IDS),
+    ('get_descendants_by_expasy_id', EXPASY_IDS),
+    ('get_proteins_under_class', EXPASY_IDS),
+    ('get_prosites_by_expasy_id', EXPASY_IDS),
+    ('get_proteins_by_expasy_id', EXPASY_IDS),
+    ('get_protein_by_uniprot_id', UNIPROT_IDS),
+    ('get_enzymes_by_uniprot_id', UNIPROT_IDS),
+    ('get_prosite_by_id', PROSITE_IDS),
+    ('get_enzymes_by_prosite_id', PROSITE_IDS),
+]
+
+
+class TestAsyncManager(PopulatedDatabaseMixin):
+    @classmethod
+    def populate(cls):
+        super().populate()
+        cls.snapshot = cls.manager.snapshot()
+
+    def setUp(self):
+        self.async_manager = AsyncManager(manager=self.manager)
+
+    def tearDown(self):
+        self.async_manager.close()
+
+    def _run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_exit(self):
+        """Test that leaving the context waits for running lookups without blocking the event loop."""
+        finished = threading.Event()
+
+        def lookup():
+            time.sleep(0.2)
+            finished.set()
+
+        async def tick(states):
+            for _ in range(5):
+                states.append(finished.is_set())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            states = []
+            async with self.async_manager as async_manager:
+                lookup_future = asyncio.ensure_future(async_manager._run(lookup))
+                await asyncio.sleep(0)  # let the lookup start
+                ticker = asyncio.ensure_future(tick(states))
+            self.assertTrue(finished.is_set(), msg='leaving should wait for the lookup')
+            await asyncio.gather(lookup_future, ticker)
+            return states
+
+        states = self._run(run())
+        self.assertFalse(states[0], msg='the event loop should run while the lookup finishes')
+
+    def test_lookups(self):
+        """Test that the lookups return the same records as the snapshot."""
+
+        async def run():
+            return await asyncio.gather(*(
+                getattr(self.async_manager, name)(key)
+                for name, keys in LOOKUPS
+                for key in keys
+            ))
+
+        results = iter(self._run(run()))
+        for name, keys in LOOKUPS:
+            for key in keys:
+                with self.subTest(name=name, key=key):
+                    self.assertEqual(getattr(self.snapshot, name)(key), next(results))
+
+    def test_batch_lookups(self):
+        """Test that the batch lookups return the same records as the snapshot."""
+        for name, keys in [
+            ('get_enzymes_by_uniprot_ids', UNIPROT_IDS),
+            ('get_enzymes_by_prosite_ids', PROSITE_IDS),
+            ('get_proteins_by_expasy_ids', EXPASY_IDS),
+            ('get_prosites_by_expasy_ids', EXPASY_IDS),
+        ]:
+            with self.subTest(name=name):
+                result = self._run(getattr(self.async_manager, name)(keys))
+                self.assertEqual(getattr(self.snapshot, name)(keys), result)
+
+    def test_overlap(self):
+        """Test that lookups run at the same time, on their own sessions."""
+        barrier = threading.Barrier(2, timeout=5)
+        sessions = []
+
+        def wait():
+            sessions.append(self.manager.session())
+            barrier.wait()  # raises if the other lookup can't run until this one is done
+
+        async def run():
+            await asyncio.gather(self.async_manager._run(wait), self.async_manager._run(wait))
+
+        self._run(run())
+        self.assertIsNot(sessions[0], sessions[1])
+
+    def test_summarize(self):
+        self.assertEqual(self.manager.summarize(), self._run(self.async_manager.summarize()))
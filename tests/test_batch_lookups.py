@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for looking up many identifiers at once."""
+
+from bio2bel_expasy.utils import count_statements
+from tests.constants import PopulatedDatabaseMixin
+
+
+class TestBatchLookups(PopulatedDatabaseMixin):
+    def test_enzymes_by_uniprot_ids(self):
+        """Test that the batch lookup agrees with looking up each identifier."""
+        uniprot_ids = ['Q6AZW2', 'Q568L5', 'P75691', 'P00000']
+        result = self.manager.get_enzymes_by_uniprot_ids(uniprot_ids)
+
+        self.assertEqual({'Q6AZW2', 'Q568L5', 'P75691'}, set(result))
+        for uniprot_id, enzymes in result.items():
+            self.assertEqual(self.manager.get_enzymes_by_uniprot_id(uniprot_id), enzymes)
+
+    def test_enzymes_by_prosite_ids(self):
+        """Test looking up the enzymes of many ProSites."""
+        result = self.manager.get_enzymes_by_prosite_ids(['PDOC00061', 'PDOC99999'])
+        self.assertEqual(['PDOC00061'], list(result))
+        self.assertEqual(self.manager.get_enzymes_by_prosite_id('PDOC00061'), result['PDOC00061'])
+
+    def test_by_expasy_ids(self):
+        """Test that ExPASy identifiers are canonicalized, and keyed as given."""
+        expasy_ids = ['1.1.1.2', '1. 1. 1.2', '1.1.1.999', 'nope']
+
+        proteins = self.manager.get_proteins_by_expasy_ids(expasy_ids)
+        self.assertEqual({'1.1.1.2', '1. 1. 1.2'}, set(proteins))
+        self.assertEqual(self.manager.get_proteins_by_expasy_id('1.1.1.2'), proteins['1. 1. 1.2'])
+
+        prosites = self.manager.get_prosites_by_expasy_ids(expasy_ids)
+        self.assertEqual(['PDOC00061'], [prosite.prosite_id for prosite in prosites['1.1.1.2']])
+
+    def test_statements(self):
+        """Test that the number of statements depends on the number of chunks, not of identifiers."""
+        self.manager.session.expire_all()
+        uniprot_ids = ['Q6AZW2', 'Q568L5', 'P75691'] + [f'P{i:05}' for i in range(1200)]
+
+        with count_statements(self.manager.engine) as counter:
+            result = self.manager.get_enzymes_by_uniprot_ids(uniprot_ids)
+            for enzymes in result.values():
+                for enzyme in enzymes:
+                    self.assertIsNotNone(enzyme.expasy_id)
+
+        self.assertEqual(3, len(result))
+        self.assertLessEqual(counter.counts['select'], 2 * 3)
+
+    def test_loading(self):
+        """Test that the related instances can be loaded in the same statement, or lazily."""
+        with self.assertStatementCount(1):
+            parent = self.manager.get_parent_by_expasy_id('1.1.1.2')
+            self.assertEqual('1.1.1.-', parent.expasy_id)
+        with self.assertStatementCount(1):
+            self.manager.get_enzymes_by_uniprot_ids(['Q6AZW2', 'Q568L5'], loading='joined')
+        with self.assertStatementCount(3):
+            for proteins in self.manager.get_proteins_by_expasy_ids(['1.1.1.2', '1.1.1.-'], loading=None).values():
+                list(proteins)
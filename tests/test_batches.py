@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for populating in batches with checkpoints."""
+
+import unittest
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Checkpoint, enzyme_closure
+from tests.constants import DATABASE_TEST_FILE, TREE_TEST_FILE
+
+
+class Interrupted(Exception):
+    """Raised to interrupt a population."""
+
+
+class TestBatches(unittest.TestCase):
+    """Tests for populating in batches with checkpoints."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Populate a reference database in one go."""
+        cls.expected_manager = Manager(connection='sqlite://')
+        cls.expected_manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+
+    def setUp(self):
+        """Make an empty database."""
+        self.manager = Manager(connection='sqlite://')
+
+    def assert_expected_content(self):
+        """Assert that the database has the same content as the reference database."""
+        expected = self.expected_manager._get_loaded_state()
+        actual = self.manager._get_loaded_state()
+        self.assertEqual(expected.descriptions, actual.descriptions)
+        self.assertEqual(expected.prosites, actual.prosites)
+        self.assertEqual(expected.proteins, actual.proteins)
+        self.assertEqual(self.expected_manager.summarize(), self.manager.summarize())
+        self.assertEqual(
+            self.expected_manager.session.query(enzyme_closure).count(),
+            self.manager.session.query(enzyme_closure).count(),
+        )
+
+    def test_batches(self):
+        """Test that populating in batches gives the same content as populating in one go."""
+        self.manager.populate_tree(path=TREE_TEST_FILE, batch_size=5)
+        self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=2)
+        self.assert_expected_content()
+        self.assertEqual('1.1.1.2', self.manager.get_enzyme_by_id('1.1.1.2').expasy_id)
+        self.assertEqual('1.1.1.-', self.manager.get_enzyme_by_id('1.1.1.2').parent.expasy_id)
+
+        checkpoints = {checkpoint.source: checkpoint for checkpoint in self.manager.session.query(Checkpoint)}
+        self.assertEqual({'tree', 'database'}, set(checkpoints))
+        self.assertTrue(all(checkpoint.complete for checkpoint in checkpoints.values()))
+
+    def test_resume(self):
+        """Test that an interrupted population resumes after the last committed batch."""
+        self.manager.populate_tree(path=TREE_TEST_FILE, batch_size=5)
+
+        load_entry_batch = self.manager._load_entry_batch
+        loaded = []
+
+        def interrupt_second_batch(entries):
+            if loaded:
+                raise Interrupted
+            loaded.extend(entry.expasy_id for entry in entries)
+            load_entry_batch(entries)
+
+        self.manager._load_entry_batch = interrupt_second_batch
+        with self.assertRaises(Interrupted):
+            self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=1)
+
+        checkpoint = self.manager.session.query(Checkpoint).get('database')
+        self.assertFalse(checkpoint.complete)
+        self.assertEqual(loaded[-1], checkpoint.last_expasy_id)
+        self.assertIsNotNone(self.manager.get_enzyme_by_id(loaded[-1]))
+
+        def record(entries):
+            loaded.extend(entry.expasy_id for entry in entries)
+            load_entry_batch(entries)
+
+        self.manager._load_entry_batch = record
+        self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=1)
+        self.assertEqual(len(loaded), len(set(loaded)), msg='committed entries were loaded again')
+        self.assert_expected_content()
+
+        # a complete release is not loaded again
+        del loaded[:]
+        self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=1)
+        self.assertEqual([], loaded)
+
+    def test_resume_missing(self):
+        """Test that resuming fails, rather than marking the release complete, if the checkpoint isn't in the file."""
+        self.manager.populate_tree(path=TREE_TEST_FILE, batch_size=5)
+        self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=1)
+
+        checkpoint = self.manager.session.query(Checkpoint).get('database')
+        checkpoint.complete = False
+        checkpoint.last_expasy_id = '9.9.9.9'
+        self.manager.session.commit()
+
+        with self.assertRaises(ValueError):
+            self.manager.populate_database(path=DATABASE_TEST_FILE, batch_size=1)
+        self.assertFalse(self.manager.session.query(Checkpoint).get('database').complete)
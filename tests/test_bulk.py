@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the bulk loaders."""
+
+import unittest
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import enzyme_closure
+from bio2bel_expasy.utils import count_statements
+from tests.constants import DATABASE_TEST_FILE, TREE_TEST_FILE
+
+
+class TestBulkPopulate(unittest.TestCase):
+    """Tests that loading with Core statements gives the same database as loading with models."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Populate one database with each loader."""
+        cls.bulk_manager = Manager(connection='sqlite://')
+        cls.bulk_manager.populate_tree(path=TREE_TEST_FILE, bulk=True)
+        cls.bulk_manager.populate_database(path=DATABASE_TEST_FILE, bulk=True)
+
+        cls.models_manager = Manager(connection='sqlite://')
+        cls.models_manager.populate_tree(path=TREE_TEST_FILE, bulk=False)
+        cls.models_manager.populate_database(path=DATABASE_TEST_FILE, bulk=False)
+
+    def test_same_content(self):
+        """Test that both loaders give the same content."""
+        expected = self.models_manager._get_loaded_state()
+        actual = self.bulk_manager._get_loaded_state()
+        self.assertEqual(expected.descriptions, actual.descriptions)
+        self.assertEqual(expected.prosites, actual.prosites)
+        self.assertEqual(expected.proteins, actual.proteins)
+        self.assertEqual(expected.synonyms, actual.synonyms)
+        self.assertEqual(self.models_manager.summarize(), self.bulk_manager.summarize())
+        self.assertEqual(
+            self.models_manager.session.query(enzyme_closure).count(),
+            self.bulk_manager.session.query(enzyme_closure).count(),
+        )
+
+    def test_parents(self):
+        """Test that the parents are linked."""
+        enzyme = self.bulk_manager.get_enzyme_by_id('1.1.1.2')
+        self.assertEqual('1.1.1.-', enzyme.parent.expasy_id)
+        self.assertEqual('1.1.-.-', enzyme.parent.parent.expasy_id)
+        self.assertEqual(
+            {'1.1.1.2'},
+            {child.expasy_id for child in self.bulk_manager.get_children_by_expasy_id('1.1.1.-')},
+        )
+
+    def test_automatic(self):
+        """Test that the bulk loaders are only chosen while nothing is loaded."""
+        manager = Manager(connection='sqlite://')
+        self.assertFalse(manager._has_entries())
+        manager.populate_tree(path=TREE_TEST_FILE)
+        self.assertFalse(manager._has_entries())
+        manager.populate_database(path=DATABASE_TEST_FILE)
+        self.assertTrue(manager._has_entries())
+
+        # loading again goes through the models, which leave the loaded rows alone
+        summary = manager.summarize()
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        self.assertEqual(summary, manager.summarize())
+
+    def test_models_after_bulk(self):
+        """Test that new rows can be added with the models after a bulk load."""
+        manager = Manager(connection='sqlite://')
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        protein = manager.get_or_create_protein(accession_number='P00000', entry_name='TEST_HUMAN')
+        manager.session.commit()
+        self.assertIsNotNone(protein.id)
+        self.assertEqual(manager.count_proteins(), protein.id)
+
+
+class TestIdentityMaps(unittest.TestCase):
+    """Tests that loading with the models looks rows up with a constant number of statements."""
+
+    def test_warm(self):
+        """Test that warming fills the identity maps."""
+        manager = Manager(connection='sqlite://')
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        self.assertEqual({}, manager.id_enzyme, msg='identity maps should be cleared after committing')
+
+        manager.warm_identity_maps()
+        self.assertEqual(manager.count_enzymes(), len(manager.id_enzyme))
+        self.assertEqual(manager.count_prosites(), len(manager.id_prosite))
+        self.assertEqual(manager.count_proteins(), len(manager.id_uniprot))
+
+        with count_statements(manager.engine) as counter:
+            manager.get_or_create_protein(accession_number='P00000', entry_name='TEST_HUMAN')
+            manager.get_or_create_enzyme(expasy_id='1.1.1.2')
+        self.assertEqual(0, counter.count)
+
+    def test_no_listeners(self):
+        """Test that a manager doesn't add work to every statement unless they're counted."""
+        manager = Manager(connection='sqlite://')
+        self.assertEqual(0, len(manager.engine.dispatch.before_cursor_execute))
+
+    def test_statement_count(self):
+        """Test that loading again issues a number of statements independent of the number of rows."""
+        manager = Manager(connection='sqlite://')
+        manager.populate_tree(path=TREE_TEST_FILE, bulk=False)
+        manager.populate_database(path=DATABASE_TEST_FILE, bulk=False)
+        summary = manager.summarize()
+        self.assertLess(16, sum(summary.values()))
+
+        for populate, path in [
+            (manager.populate_tree, TREE_TEST_FILE),
+            (manager.populate_database, DATABASE_TEST_FILE),
+        ]:
+            with self.subTest(populate=populate.__name__), count_statements(manager.engine) as counter:
+                populate(path=path)
+                self.assertGreaterEqual(9, counter.counts['select'])
+                self.assertEqual(0, counter.counts['update'])
+
+        self.assertEqual(summary, manager.summarize())
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the binary cache of the parsed database."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bio2bel_expasy.parser.cache import cache_statistics, read_cache, write_cache
+from bio2bel_expasy.parser.database import iter_expasy_database
+from bio2bel_expasy.parser.records import ExpasyEntry
+from tests.constants import DATABASE_TEST_FILE
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, 'enzyme.dat')
+        self.cache_path = os.path.join(self.directory, 'enzyme.cache')
+        shutil.copyfile(DATABASE_TEST_FILE, self.source_path)
+        self.entries = list(iter_expasy_database(path=self.source_path))
+        cache_statistics.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self):
+        write_cache(self.cache_path, self.source_path, [entry.__getstate__() for entry in self.entries])
+
+    def test_miss(self):
+        """Test that a missing cache is a miss."""
+        self.assertIsNone(read_cache(self.cache_path, self.source_path))
+        self.assertEqual(1, cache_statistics['miss'])
+
+    def test_round_trip(self):
+        """Test that entries survive a trip through the cache."""
+        self._write()
+        states = read_cache(self.cache_path, self.source_path)
+        self.assertIsNotNone(states)
+        self.assertEqual(self.entries, [ExpasyEntry.from_state(state) for state in states])
+        self.assertEqual(1, cache_statistics['hit'])
+
+    def test_touched(self):
+        """Test that a cache is still used when the source is touched but not changed."""
+        self._write()
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNotNone(read_cache(self.cache_path, self.source_path))
+        self.assertEqual(1, cache_statistics['hit'])
+
+        with mock.patch('bio2bel_expasy.parser.cache._hash_file') as hash_file:
+            states = read_cache(self.cache_path, self.source_path)
+        hash_file.assert_not_called()  # the new modification time was recorded
+        self.assertEqual(self.entries, [ExpasyEntry.from_state(state) for state in states])
+
+    def test_stale(self):
+        """Test that a cache is not used when the source changes."""
+        self._write()
+        with open(self.source_path, 'a') as file:
+            print('ID   1.1.1.1', file=file)
+            print('//', file=file)
+        self.assertIsNone(read_cache(self.cache_path, self.source_path))
+        self.assertEqual(1, cache_statistics['stale'])
+
+    def test_stale_same_size(self):
+        """Test that a cache is not used when the source changes without changing its size."""
+        self._write()
+        with open(self.source_path) as file:
+            text = file.read()
+        stat = os.stat(self.source_path)
+        with open(self.source_path, 'w') as file:
+            file.write(text.replace('1.1.1.74', '1.1.1.75'))
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(read_cache(self.cache_path, self.source_path))
+        self.assertEqual(1, cache_statistics['stale'])
+
+    def test_corrupt(self):
+        """Test that a truncated cache is treated as stale."""
+        self._write()
+        with open(self.cache_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.cache_path) - 10)
+        self.assertIsNone(read_cache(self.cache_path, self.source_path))
+        self.assertEqual(1, cache_statistics['stale'])
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the closure table over the enzyme hierarchy."""
+
+from bio2bel_expasy.models import enzyme_closure
+from tests.constants import PopulatedDatabaseMixin
+
+
+class TestClosureTable(PopulatedDatabaseMixin):
+    """Tests for hierarchy queries answered with the closure table."""
+
+    def test_rows(self):
+        """Test that every enzyme has one row per ancestor, plus one for itself."""
+        rows = self.manager.session.query(enzyme_closure).count()
+        expected = sum(
+            1 + len(self.manager.get_hierarchy().ancestors(expasy_id))
+            for expasy_id in self.manager.get_hierarchy()
+        )
+        self.assertEqual(expected, rows)
+
+    def test_descendants(self):
+        """Test getting all enzymes below a class."""
+        descendants = self.manager.get_descendants_by_expasy_id('1.1.-.-')
+        self.assertEqual(
+            set(self.manager.get_hierarchy().descendants('1.1.-.-')),
+            {enzyme.expasy_id for enzyme in descendants},
+        )
+        self.assertEqual('1.1.1.-', descendants[0].expasy_id, msg='nearest descendants should come first')
+        self.assertIn('1.1.1.2', {enzyme.expasy_id for enzyme in descendants})
+
+        self.assertEqual([], self.manager.get_descendants_by_expasy_id('1.1.1.2'))
+        self.assertEqual([], self.manager.get_descendants_by_expasy_id('9.9.9.9'))
+        self.assertEqual([], self.manager.get_descendants_by_expasy_id('nope'))
+
+    def test_proteins_under_class(self):
+        """Test getting all proteins annotated below a class."""
+        for expasy_id in '1.-.-.-', '1.1.-.-', '1.1.1.-', '1.1.1.2':
+            with self.subTest(expasy_id=expasy_id):
+                proteins = self.manager.get_proteins_under_class(expasy_id)
+                accession_numbers = [protein.accession_number for protein in proteins]
+                self.assertEqual(len(accession_numbers), len(set(accession_numbers)), msg='duplicate proteins')
+                self.assertIn('Q6AZW2', accession_numbers)
+                self.assertIn('Q568L5', accession_numbers)
+
+        self.assertEqual([], self.manager.get_proteins_under_class('2.-.-.-'))
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import os
+import types
 import unittest
 
-from bio2bel_expasy.constants import ENTRY_NAME
-from bio2bel_expasy.parser.database import get_expasy_database
-from tests.constants import DATABASE_TEST_FILE, PopulatedDatabaseMixin
+from bio2bel_expasy.parser.database import (
+    get_expasy_database, get_record_aligned_ranges, iter_expasy_database, iter_expasy_entries,
+)
+from bio2bel_expasy.parser.records import ExpasyEntry
+from tests.constants import DATABASE_TEST_FILE, PopulatedDatabaseMixin, WRAPPED_DATABASE_TEST_FILE
 
 
 class TestParseEnzyme(unittest.TestCase):
@@ -18,34 +22,100 @@ class TestParseEnzyme(unittest.TestCase):
         #
         self.assertEqual(3, len(db))
         #
-        self.assertEqual(False, db[0]['DELETED'])
-        self.assertEqual(0, len(db[0]['TRANSFERRED']))
-        self.assertEqual('1.1.1.2', db[0]['ID'])
-        self.assertEqual('Alcohol dehydrogenase (NADP(+)).', db[0]['DE'])
-        self.assertIn('Aldehyde reductase (NADPH)', db[0]['AN'])
-        self.assertEqual('An alcohol + NADP(+) = an aldehyde + NADPH.', db[0]['CA'])
-        self.assertIn('Zn(2+)', db[0]['CF'])
-        self.assertIn('PDOC00061', db[0]['PR'])
-        self.assertEqual('Q6AZW2', db[0]['DR'][0]['accession_number'])
-        self.assertEqual('A1A1A_DANRE', db[0]['DR'][0][ENTRY_NAME])
-        self.assertEqual('Q568L5', db[0]['DR'][1]['accession_number'])
-        self.assertEqual('A1A1B_DANRE', db[0]['DR'][1][ENTRY_NAME])
-        self.assertEqual('Q24857', db[0]['DR'][2]['accession_number'])
-        self.assertEqual('ADH3_ENTHI', db[0]['DR'][2][ENTRY_NAME])
-        self.assertEqual('Q04894', db[0]['DR'][3]['accession_number'])
-        self.assertEqual('ADH6_YEAST', db[0]['DR'][3][ENTRY_NAME])
+        entry = db['1.1.1.2']
+        self.assertIsInstance(entry, ExpasyEntry)
+        self.assertFalse(entry.deleted)
+        self.assertFalse(entry.transferred)
+        self.assertEqual('1.1.1.2', entry.expasy_id)
+        self.assertEqual('Alcohol dehydrogenase (NADP(+))', entry.name)
+        self.assertEqual('1.1.1.-', entry.parent_id)
+        self.assertIn('Aldehyde reductase (NADPH)', entry.synonyms)
+        self.assertIn('PDOC00061', entry.prosite_ids)
+        proteins = list(entry.proteins)
+        self.assertEqual(26, len(proteins))
+        self.assertEqual(('Q6AZW2', 'A1A1A_DANRE'), proteins[0])
+        self.assertEqual(('Q568L5', 'A1A1B_DANRE'), proteins[1])
+        self.assertEqual(('Q24857', 'ADH3_ENTHI'), proteins[2])
+        self.assertEqual(('Q04894', 'ADH6_YEAST'), proteins[3])
+        #
+        entry = db['1.1.1.5']
+        self.assertFalse(entry.deleted)
+        self.assertTrue(entry.transferred)
+        self.assertEqual(('1.1.1.303', '1.1.1.304'), entry.alt_ids)
+        #
+        entry = db['1.1.1.74']
+        self.assertTrue(entry.deleted)
+
+    def test_wrapped(self):
+        """Test that descriptions wrapped onto several ``DE`` lines are joined before they are parsed."""
+        db = get_expasy_database(path=WRAPPED_DATABASE_TEST_FILE)
+        self.assertEqual('(+)-borneol dehydrogenase (NAD(+) or NADP(+))', db['1.1.1.198'].name)
         self.assertEqual(
-            '-!- Some members of this group oxidize only primary alcohols; others act also on secondary alcohols.-!- May be identical with EC 1.1.1.19, EC 1.1.1.33 and EC 1.1.1.55.-!- Re-specific with respect to NADPH.',
-            db[0]['CC'])
+            ('Retinol dehydrogenase (NADP-dependent, all-trans-retinal forming)', 'RDH11'),
+            db['1.1.1.300'].synonyms,
+        )
         #
-        self.assertEqual('1.1.1.5', db[1]['ID'])
-        self.assertEqual(False, db[1]['DELETED'])
-        self.assertEqual(2, len(db[1]['TRANSFERRED']))
-        self.assertIn('1.1.1.303', db[1]['TRANSFERRED'])
-        self.assertIn('1.1.1.304', db[1]['TRANSFERRED'])
+        entry = db['1.1.1.200']
+        self.assertTrue(entry.transferred)
+        self.assertIsNone(entry.name)
+        self.assertEqual(('1.1.1.198', '1.1.1.227', '1.1.1.228'), entry.alt_ids)
         #
-        self.assertEqual('1.1.1.74', db[2]['ID'])
-        self.assertEqual(True, db[2]['DELETED'])
+        entry = db['1.1.1.201']
+        self.assertIsNone(entry.name)
+        self.assertEqual(('1.1.1.198', '1.1.1.227', '1.1.1.228', '1.1.1.229'), entry.alt_ids)
+
+    def test_dict_round_trip(self):
+        """Test that entries can be converted to their dictionary form and back."""
+        entry = self.database['1.1.1.2']
+        data = entry.to_dict()
+        self.assertEqual('1.1.1.2', data['concept']['identifier'])
+        self.assertEqual('1.1.1.-', data['parent']['identifier'])
+        self.assertEqual({'namespace': 'uniprot', 'name': 'A1A1A_DANRE', 'identifier': 'Q6AZW2'}, data['proteins'][0])
+        self.assertEqual([{'namespace': 'prosite', 'identifier': 'PDOC00061'}], data['domains'])
+        self.assertEqual(entry, ExpasyEntry.from_dict(data))
+
+    def test_slots(self):
+        """Test that entries do not carry a per-instance dictionary."""
+        self.assertFalse(hasattr(self.database['1.1.1.2'], '__dict__'))
+
+
+class TestIterEntries(unittest.TestCase):
+    def test_stream(self):
+        """Test that entries are yielded lazily, one per record."""
+        with open(DATABASE_TEST_FILE) as file:
+            entries = iter_expasy_entries(file)
+            self.assertIsInstance(entries, types.GeneratorType)
+            first = next(entries)
+            self.assertEqual('1.1.1.2', first.expasy_id)
+            self.assertEqual(['1.1.1.5', '1.1.1.74'], [entry.expasy_id for entry in entries])
+
+    def test_missing_terminator(self):
+        """Test that a final record without a ``//`` terminator is still yielded."""
+        lines = ['ID   1.1.1.1\n', 'DE   Alcohol dehydrogenase.\n']
+        entries = list(iter_expasy_entries(lines))
+        self.assertEqual(1, len(entries))
+        self.assertEqual('Alcohol dehydrogenase', entries[0].name)
+
+
+class TestParallelParse(unittest.TestCase):
+    def test_ranges(self):
+        """Test that the byte ranges cover the file and each ends on a record boundary."""
+        ranges = get_record_aligned_ranges(DATABASE_TEST_FILE, 8)
+        self.assertLess(1, len(ranges))
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(os.path.getsize(DATABASE_TEST_FILE), ranges[-1][1])
+
+        with open(DATABASE_TEST_FILE, 'rb') as file:
+            for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(stop, start)
+                file.seek(stop - 3)
+                self.assertEqual(b'//\n', file.read(3))
+
+    def test_parallel_matches_serial(self):
+        """Test that parsing with a process pool gives the same entries in the same order."""
+        serial = list(iter_expasy_database(path=DATABASE_TEST_FILE))
+        parallel = list(iter_expasy_database(path=DATABASE_TEST_FILE, workers=2))
+        self.assertEqual(serial, parallel)
 
 
 class TestPopulateDatabase(PopulatedDatabaseMixin):
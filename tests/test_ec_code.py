@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the EC code value type."""
+
+import pickle
+import unittest
+
+from bio2bel_expasy.ec_code import ECCode
+
+
+class TestECCode(unittest.TestCase):
+    def test_canonical(self):
+        """Test that codes are canonicalized and interned."""
+        code = ECCode('1. 1. 1.-')
+        self.assertEqual('1.1.1.-', code)
+        self.assertIsInstance(code, str)
+        self.assertIs(code, ECCode('1.1.1.-'))
+        self.assertIs(code, ECCode('1.1.1'))
+        self.assertIs(code, ECCode(code))
+        self.assertEqual(hash('1.1.1.-'), hash(code))
+        self.assertIn(code, {'1.1.1.-'})
+
+    def test_spellings_not_kept(self):
+        """Test that only canonical forms are kept, so new spellings of known codes don't grow the table."""
+        code = ECCode('1.1.1.2')
+        size = len(ECCode._instances)
+        for spelling in ['1.1.1.02', '1. 1. 1.2', '01.1.1.2', '1.1.1.002']:
+            self.assertIs(code, ECCode(spelling))
+            self.assertNotIn(spelling, ECCode._instances)
+        self.assertEqual(size, len(ECCode._instances))
+
+    def test_numbers(self):
+        """Test the parsed numbers and levels."""
+        self.assertEqual((1,), ECCode('1.-.-.-').numbers)
+        self.assertEqual(1, ECCode('1.-.-.-').level)
+        self.assertEqual((1, 14), ECCode('1.14.-.-').numbers)
+        self.assertEqual(2, ECCode('1.14.-.-').level)
+        self.assertEqual((1, 14, 99), ECCode('1.14.99.-').numbers)
+        self.assertEqual(3, ECCode('1.14.99.-').level)
+        self.assertEqual((1, 14, 99, 1), ECCode('1.14.99.1').numbers)
+        self.assertEqual(4, ECCode('1.14.99.1').level)
+
+    def test_preliminary(self):
+        """Test codes with a preliminary serial number."""
+        code = ECCode('3.5.1.n3')
+        self.assertEqual('3.5.1.n3', code)
+        self.assertTrue(code.preliminary)
+        self.assertEqual(4, code.level)
+        self.assertEqual('3.5.1.-', code.parent)
+        self.assertFalse(ECCode('3.5.1.3').preliminary)
+        self.assertLess(ECCode('3.5.1.100'), code)
+
+    def test_hierarchy(self):
+        """Test parents and ancestors."""
+        code = ECCode('1.1.1.2')
+        self.assertIs(ECCode('1.1.1.-'), code.parent)
+        self.assertEqual(('1.1.1.-', '1.1.-.-', '1.-.-.-'), code.ancestors)
+        self.assertIsNone(ECCode('1.-.-.-').parent)
+        self.assertEqual((), ECCode('1.-.-.-').ancestors)
+        self.assertTrue(ECCode('1.1.-.-').is_ancestor_of(code))
+        self.assertFalse(ECCode('1.2.-.-').is_ancestor_of(code))
+        self.assertFalse(code.is_ancestor_of(code))
+
+    def test_ordering(self):
+        """Test that codes sort numerically."""
+        codes = list(map(ECCode, ['1.10.-.-', '1.2.-.-', '1.-.-.-', '1.2.1.10', '1.2.1.9', '1.2.1.-', '10.-.-.-']))
+        self.assertEqual(
+            ['1.-.-.-', '1.2.-.-', '1.2.1.-', '1.2.1.9', '1.2.1.10', '1.10.-.-', '10.-.-.-'],
+            sorted(codes),
+        )
+
+    def test_invalid(self):
+        """Test that invalid codes are rejected."""
+        for value in ('', '-.-.-.-', '1.-.1.-', 'a.b.c.d', '1.1.1.1.1', 'Alcohol dehydrogenase', '1.n1.-.-', None, 1):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ECCode(value)
+
+    def test_pickle(self):
+        """Test that codes survive pickling as the same interned instance."""
+        code = ECCode('1.1.1.2')
+        self.assertIs(code, pickle.loads(pickle.dumps(code)))
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the integer columns of the numbers of EC codes."""
+
+import unittest
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.ec_code import ECCode
+from bio2bel_expasy.models import Enzyme
+from tests.constants import DATABASE_TEST_FILE, TREE_TEST_FILE
+
+CODES = [
+    '1.-.-.-',
+    '1.2.-.-',
+    '1.2.3.-',
+    '1.2.3.4',
+    '1.2.3.10',
+    '1.2.3.n2',
+    '1.2.30.-',
+    '1.10.-.-',
+    '1.10.1.-',
+    '2.-.-.-',
+    '2.1.-.-',
+]
+
+
+def _ids(enzymes):
+    return [enzyme.expasy_id for enzyme in enzymes]
+
+
+class TestNumberColumns(unittest.TestCase):
+    """Tests that every loader fills in the number columns."""
+
+    def assertNumbers(self, manager: Manager):
+        """Assert that the number columns of every enzyme match its code."""
+        enzymes = manager.session.query(Enzyme).all()
+        self.assertTrue(enzymes)
+        for enzyme in enzymes:
+            with self.subTest(expasy_id=enzyme.expasy_id):
+                code = ECCode(enzyme.expasy_id)
+                self.assertEqual(code.level, enzyme.level)
+                self.assertEqual(code.numbers, (
+                    enzyme.class_number,
+                    enzyme.subclass_number,
+                    enzyme.subsubclass_number,
+                    enzyme.serial_number,
+                )[:code.level])
+                self.assertEqual(code.preliminary, enzyme.preliminary)
+
+    def test_loaders(self):
+        """Test the bulk loaders, the models, and loading in batches."""
+        for kwargs in [dict(bulk=True), dict(bulk=False), dict(batch_size=2)]:
+            with self.subTest(**kwargs):
+                manager = Manager(connection='sqlite://')
+                manager.populate_tree(path=TREE_TEST_FILE, **kwargs)
+                manager.populate_database(path=DATABASE_TEST_FILE, **kwargs)
+                self.assertNumbers(manager)
+
+
+class TestNumericOrder(unittest.TestCase):
+    """Tests the queries over the number columns."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Add enzymes whose codes sort differently as strings."""
+        cls.manager = Manager(connection='sqlite://')
+        cls.manager.create_all()
+        enzymes = {}
+        for code in map(ECCode, reversed(CODES)):
+            enzymes[code] = Enzyme(expasy_id=code)
+        for code, enzyme in enzymes.items():
+            enzyme.parent = enzymes.get(code.parent)
+        cls.manager.session.add_all(enzymes.values())
+        cls.manager.session.commit()
+
+    def test_iter(self):
+        """Test iterating in numeric order."""
+        self.assertEqual(CODES, _ids(self.manager.iter_enzymes()))
+        self.assertEqual(['1.2.3.-', '1.2.30.-', '1.10.1.-'], _ids(self.manager.iter_enzymes(level=3)))
+
+    def test_prefix(self):
+        """Test getting an enzyme and everything below it."""
+        self.assertEqual(
+            ['1.2.-.-', '1.2.3.-', '1.2.3.4', '1.2.3.10', '1.2.3.n2', '1.2.30.-'],
+            _ids(self.manager.get_enzymes_by_prefix('1.2')),
+        )
+        self.assertEqual(_ids(self.manager.get_enzymes_by_prefix('1.2')),
+                         _ids(self.manager.get_enzymes_by_prefix('1.2.-.-')))
+        self.assertEqual(['1.2.3.4', '1.2.3.10', '1.2.3.n2'], _ids(self.manager.get_enzymes_by_prefix('1.2.3', 4)))
+        self.assertEqual(['1.2.3.n2'], _ids(self.manager.get_enzymes_by_prefix('1.2.3.n2')))
+        self.assertEqual([], self.manager.get_enzymes_by_prefix('1.3'))
+        self.assertEqual([], self.manager.get_enzymes_by_prefix('nope'))
+
+    def test_range(self):
+        """Test that a range starts at the first code and ends after everything below the second."""
+        self.assertEqual(
+            ['1.2.3.10', '1.2.3.n2', '1.2.30.-', '1.10.-.-', '1.10.1.-'],
+            _ids(self.manager.get_enzymes_in_range('1.2.3.10', '1.10')),
+        )
+        self.assertEqual(['1.2.3.4', '1.2.3.10'], _ids(self.manager.get_enzymes_in_range('1.2.3.1', '1.2.3.10')))
+        self.assertEqual(['1.-.-.-', '2.-.-.-'], _ids(self.manager.get_enzymes_in_range('1', '2', level=1)))
+        self.assertEqual([], self.manager.get_enzymes_in_range('2', '1'))
+
+    def test_children(self):
+        """Test that children are in numeric order."""
+        self.assertEqual(['1.2.-.-', '1.10.-.-'], _ids(self.manager.get_children_by_expasy_id('1.-.-.-')))
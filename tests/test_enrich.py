@@ -5,9 +5,12 @@
 import unittest
 
 from bio2bel_expasy.constants import MODULE_NAME, PROSITE, UNIPROT
+from bio2bel_expasy.ec_code import ECCode
 from bio2bel_expasy.enrich import enrich_prosite_classes
+from bio2bel_expasy.models import Enzyme, Prosite, Protein, clear_node_caches, get_node_cache_info
 from bio2bel_expasy.parser.tree import normalize_expasy_id
 from pybel import BELGraph
+from pybel.constants import NAMESPACE
 from pybel.dsl import protein
 from tests.constants import PopulatedDatabaseMixin
 
@@ -43,6 +46,12 @@ test_protein_b = uniprot(name='A1A1B_DANRE', identifier='Q568L5')
 class TestEnrich(PopulatedDatabaseMixin):
     """Tests that the enrichment functions work properly"""
 
+    def test_look_up_enzyme(self):
+        """Test looking up the enzyme of a node, which is skipped if the node has neither an identifier nor a name."""
+        self.assertEqual('1.1.1.2', self.manager.look_up_enzyme(test_enzyme).expasy_id)
+        self.assertIsNone(self.manager.look_up_enzyme(test_protein_a))
+        self.assertIsNone(self.manager.look_up_enzyme({NAMESPACE: MODULE_NAME}))
+
     def test_enrich_enzyme_with_proteins(self):
         """Test that the edges from the enzyme to its proteins are added."""
         graph = BELGraph()
@@ -115,5 +124,126 @@ class TestEnrich(PopulatedDatabaseMixin):
         self.assertIn(test_prosite, graph)
 
 
+class TestEnrichStatements(PopulatedDatabaseMixin):
+    """Tests the number of statements each enrichment method sends, with the hierarchy already loaded."""
+
+    def setUp(self):
+        self.manager.get_hierarchy()
+        self.manager.read_cache.clear()
+
+    def test_enzyme_with_proteins(self):
+        """Test that the proteins are loaded with the enzyme."""
+        graph = BELGraph()
+        node = graph.add_node_from_data(test_enzyme)
+        with self.assertStatementCount(1):
+            self.manager.enrich_enzyme_with_proteins(graph, node)
+        with self.assertStatementCount(2):
+            self.manager.enrich_enzyme_with_proteins(graph, node, loading='selectin')
+
+    def test_hierarchy(self):
+        """Test that parents and children are added from the hierarchy, without statements."""
+        graph = BELGraph()
+        node = graph.add_node_from_data(test_subsubclass)
+        with self.assertStatementCount(0):
+            self.manager.enrich_enzyme_parents(graph, node)
+            self.manager.enrich_enzyme_children(graph, node)
+        self.assertIn(test_class, graph)
+        self.assertIn(test_enzyme, graph)
+
+    def test_hierarchy_with_proteins(self):
+        """Test that the proteins of the whole subtree are looked up at once, and match the snapshot."""
+        graph = BELGraph()
+        node = graph.add_node_from_data(test_class)
+        with self.assertStatementCount(1):
+            self.manager.enrich_enzyme_children(graph, node, proteins=True)
+        self.assertIn(test_enzyme, graph[test_protein_a])
+        self.assertIn(test_enzyme, graph[test_protein_b])
+        self.assertEqual(45, graph.number_of_edges())  # 19 in the hierarchy and 26 to proteins
+
+        snapshot_graph = BELGraph()
+        self.manager.snapshot().enrich_enzyme_children(snapshot_graph, node, proteins=True)
+        self.assertEqual(set(graph.edges()), set(snapshot_graph.edges()))
+
+        graph = BELGraph()
+        node = graph.add_node_from_data(test_enzyme)
+        self.manager.enrich_enzyme_children(graph, node, proteins=True)
+        self.assertIn(test_enzyme, graph[test_protein_a], msg='the proteins of the enzyme itself should be added')
+
+    def test_enzymes(self):
+        """Test that only the entries need statements, for their proteins."""
+        graph = BELGraph()
+        graph.add_node_from_data(test_class)
+        graph.add_node_from_data(test_enzyme)
+        with self.assertStatementCount(1):
+            self.manager.enrich_enzymes(graph)
+
+    def test_enzymes_with_prosites(self):
+        """Test that the ProSites of all enzymes are looked up at once."""
+        graph = BELGraph()
+        graph.add_node_from_data(test_class)
+        graph.add_node_from_data(test_subsubclass)
+        graph.add_node_from_data(test_enzyme)
+        with self.assertStatementCount(2):
+            self.manager.enrich_enzymes_with_prosites(graph)
+        self.assertIn(test_prosite, graph)
+
+    def test_proteins_with_enzyme_families(self):
+        """Test that the proteins are looked up at once, then cached."""
+        graph = BELGraph()
+        graph.add_node_from_data(test_protein_a)
+        graph.add_node_from_data(test_protein_b)
+        with self.assertStatementCount(1):
+            self.manager.enrich_proteins_with_enzyme_families(graph)
+        with self.assertStatementCount(0):
+            self.manager.enrich_proteins_with_enzyme_families(graph)
+
+    def test_proteins_with_enzyme_families_size(self):
+        """Test that the number of statements depends on the number of chunks of proteins, not on the graph size."""
+        graph = BELGraph()
+        graph.add_node_from_data(test_protein_a)
+        for i in range(1200):
+            graph.add_node_from_data(uniprot(identifier=f'P{i:05}'))
+
+        self.manager.read_cache.clear()
+        with self.assertStatementCount(2):  # one per chunk of 900
+            self.manager.enrich_proteins_with_enzyme_families(graph)
+        self.assertEqual(1, graph.number_of_edges())
+        self.assertIn(test_protein_a, graph[test_enzyme])
+
+
+class TestInternedNodes(PopulatedDatabaseMixin):
+    """Tests that enrichment reuses the same node objects."""
+
+    def test_interned(self):
+        """Test that the same node is returned for the same identifier, however it is given."""
+        node = Enzyme.bel_from_expasy_id('1.1.1.2')
+        self.assertEqual(test_enzyme, node)
+        self.assertIs(node, Enzyme.bel_from_expasy_id(ECCode('1.1.1.2')))
+        self.assertIs(
+            Protein.bel_from_uniprot_id('Q6AZW2', 'A1A1A_DANRE'),
+            Protein.bel_from_uniprot_id('Q6AZW2', entry_name='A1A1A_DANRE'),
+        )
+
+    def test_graphs_share_nodes(self):
+        """Test that enriching two graphs adds the same node objects to both."""
+        graphs = [BELGraph(), BELGraph()]
+        for graph in graphs:
+            graph.add_node_from_data(test_enzyme)
+            self.manager.enrich_enzymes(graph)
+
+        def get_node(graph, data):
+            return next(node for node in graph if node == data)
+
+        for data in [test_protein_a, test_subsubclass]:
+            self.assertIs(get_node(graphs[0], data), get_node(graphs[1], data))
+
+    def test_clear(self):
+        """Test that the caches can be cleared."""
+        Prosite.bel_from_prosite_id('PDOC00061')
+        clear_node_caches()
+        for model, info in get_node_cache_info().items():
+            self.assertEqual(0, info.currsize, msg=model)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the nested-interval index over the EC hierarchy."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bio2bel_expasy.hierarchy import HierarchyIndex, get_expasy_hierarchy
+from bio2bel_expasy.parser.closure import get_expasy_closed_tree
+from tests.constants import DATABASE_TEST_FILE, PopulatedDatabaseMixin, TREE_TEST_FILE
+
+
+class TestHierarchyIndex(unittest.TestCase):
+    """Tests for :class:`HierarchyIndex`."""
+
+    def setUp(self):
+        """Build a small index."""
+        self.index = HierarchyIndex.from_codes([
+            '1.-.-.-', '1.1.-.-', '1.1.1.-', '1.1.1.2', '1.1.1.10', '1.10.-.-', '1.2.-.-', '2.-.-.-',
+            '3.1.1.1',  # no ancestors present
+        ])
+
+    def test_order(self):
+        """Test that codes are laid out in numeric pre-order."""
+        self.assertEqual(
+            ['1.-.-.-', '1.1.-.-', '1.1.1.-', '1.1.1.2', '1.1.1.10', '1.2.-.-', '1.10.-.-', '2.-.-.-', '3.1.1.1'],
+            list(self.index),
+        )
+
+    def test_is_ancestor(self):
+        """Test ancestry checks."""
+        self.assertTrue(self.index.is_ancestor('1.-.-.-', '1.1.1.10'))
+        self.assertTrue(self.index.is_ancestor('1.1.1.-', '1.1.1.2'))
+        self.assertFalse(self.index.is_ancestor('1.1.1.2', '1.1.1.-'))
+        self.assertFalse(self.index.is_ancestor('1.1.1.2', '1.1.1.2'))
+        self.assertFalse(self.index.is_ancestor('1.2.-.-', '1.1.1.2'))
+        self.assertFalse(self.index.is_ancestor('1.-.-.-', '2.-.-.-'))
+        self.assertFalse(self.index.is_ancestor('1.-.-.-', '9.9.9.9'))
+
+    def test_descendants(self):
+        """Test descendant lookups."""
+        self.assertEqual(['1.1.1.-', '1.1.1.2', '1.1.1.10'], list(self.index.descendants('1.1.-.-')))
+        self.assertEqual(6, len(self.index.descendants('1.-.-.-')))
+        self.assertEqual((), self.index.descendants('1.1.1.2'))
+        self.assertEqual((), self.index.descendants('9.9.9.9'))
+
+    def test_children(self):
+        """Test direct children lookups."""
+        self.assertEqual(['1.1.-.-', '1.2.-.-', '1.10.-.-'], self.index.children('1.-.-.-'))
+        self.assertEqual(['1.1.1.2', '1.1.1.10'], self.index.children('1.1.1.-'))
+        self.assertEqual([], self.index.children('2.-.-.-'))
+
+    def test_ancestors(self):
+        """Test parent and ancestor lookups."""
+        self.assertEqual('1.1.1.-', self.index.parent('1.1.1.2'))
+        self.assertIsNone(self.index.parent('1.-.-.-'))
+        self.assertIsNone(self.index.parent('3.1.1.1'))
+        self.assertEqual(['1.1.1.-', '1.1.-.-', '1.-.-.-'], self.index.ancestors('1.1.1.10'))
+        self.assertEqual([], self.index.ancestors('9.9.9.9'))
+
+    def test_state(self):
+        """Test that the index survives a round trip through its state."""
+        index = HierarchyIndex.from_state(self.index.to_state())
+        self.assertEqual(list(self.index), list(index))
+        self.assertEqual(self.index.ancestors('1.1.1.10'), index.ancestors('1.1.1.10'))
+        self.assertEqual(list(self.index.descendants('1.-.-.-')), list(index.descendants('1.-.-.-')))
+
+
+class TestExpasyHierarchy(unittest.TestCase):
+    """Tests for the index built from the ExPASy files."""
+
+    def test_files(self):
+        """Test the index over the test files."""
+        index = get_expasy_hierarchy(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        self.assertIn('1.1.1.2', index)
+        self.assertEqual(['1.1.1.-', '1.1.-.-', '1.-.-.-'], index.ancestors('1.1.1.2'))
+        self.assertEqual(19, len(index.descendants('1.-.-.-')))
+
+    def test_closure(self):
+        """Test the closure built on the index."""
+        closure = get_expasy_closed_tree(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        self.assertEqual(37, len(closure))
+        self.assertEqual(46, len(closure['1.-.-.-']))
+        self.assertEqual(27, len(closure['1.1.1.2']))
+        self.assertIn(('uniprot', 'Q6AZW2', 'A1A1A_DANRE'), closure['1.-.-.-'])
+
+    def test_persisted(self):
+        """Test that the closure of the downloaded files uses the index persisted for them."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with mock.patch('bio2bel_expasy.hierarchy.EXPASY_HIERARCHY_PATH', os.path.join(directory, 'hierarchy.index')), \
+                mock.patch('bio2bel_expasy.hierarchy.download_expasy_tree', return_value=TREE_TEST_FILE), \
+                mock.patch('bio2bel_expasy.hierarchy.download_expasy_database', return_value=DATABASE_TEST_FILE), \
+                mock.patch('bio2bel_expasy.parser.closure.download_expasy_tree', return_value=TREE_TEST_FILE), \
+                mock.patch('bio2bel_expasy.parser.closure.download_expasy_database', return_value=DATABASE_TEST_FILE):
+            index = get_expasy_hierarchy()
+            with mock.patch.object(HierarchyIndex, 'from_codes', side_effect=AssertionError('rebuilt')):
+                self.assertEqual(list(index), list(get_expasy_hierarchy()))
+                closure = get_expasy_closed_tree()
+
+        self.assertEqual(get_expasy_closed_tree(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE), closure)
+
+
+class TestManagerHierarchy(PopulatedDatabaseMixin):
+    """Tests for the index over the database."""
+
+    def test_manager(self):
+        """Test that the manager's index matches the database."""
+        index = self.manager.get_hierarchy()
+        self.assertEqual(self.manager.count_enzymes(), len(index))
+        self.assertIs(index, self.manager.get_hierarchy())
+        self.assertEqual(
+            sorted(child.expasy_id for child in self.manager.get_children_by_expasy_id('1.1.-.-')),
+            sorted(index.children('1.1.-.-')),
+        )
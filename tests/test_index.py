@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for random access to the ExPASy database."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bio2bel_expasy.ec_code import ECCode
+from bio2bel_expasy.parser.cache import cache_statistics
+from bio2bel_expasy.parser.database import get_expasy_database
+from bio2bel_expasy.parser.index import ExpasyFile, build_expasy_index
+from tests.constants import DATABASE_TEST_FILE
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.directory, 'enzyme.index')
+        self.expasy_file = ExpasyFile(path=DATABASE_TEST_FILE, index_path=self.index_path)
+
+    def tearDown(self):
+        self.expasy_file.close()
+        shutil.rmtree(self.directory)
+
+    def test_index(self):
+        """Test that all records are indexed."""
+        self.assertEqual(['1.1.1.2', '1.1.1.5', '1.1.1.74'], list(self.expasy_file))
+        self.assertIn('1.1.1.2', self.expasy_file)
+        self.assertIn('1. 1. 1.2', self.expasy_file)
+        self.assertNotIn('1.1.1.3', self.expasy_file)
+        self.assertNotIn('not a code', self.expasy_file)
+
+    def test_spellings(self):
+        """Test that entries are found by any spelling of their EC code."""
+        with ExpasyFile(path=DATABASE_TEST_FILE, index_path=self.index_path) as persisted:
+            for expasy_file in self.expasy_file, persisted:
+                self.assertTrue(all(isinstance(key, ECCode) for key in expasy_file))
+                self.assertIn('1.1.1.02', expasy_file)
+                self.assertEqual(expasy_file.get_range('1.1.1.2'), expasy_file.get_range('1.1.1.02'))
+                self.assertEqual('1.1.1.2', expasy_file.get('1.1.01.2').expasy_id)
+
+    def test_get(self):
+        """Test that entries parsed on demand match the full parse."""
+        database = get_expasy_database(path=DATABASE_TEST_FILE)
+        for expasy_id, entry in database.items():
+            self.assertEqual(entry, self.expasy_file.get(expasy_id))
+        self.assertIsNone(self.expasy_file.get('1.1.1.3'))
+
+    def test_persisted(self):
+        """Test that the index is reused on the next open."""
+        cache_statistics.clear()
+        with ExpasyFile(path=DATABASE_TEST_FILE, index_path=self.index_path) as expasy_file:
+            self.assertEqual(3, len(expasy_file))
+        self.assertEqual(1, cache_statistics['hit'])
+
+    def test_invalid(self):
+        """Test that the file is closed when it can't be indexed, like when it's empty or has an invalid code."""
+        path = os.path.join(self.directory, 'enzyme.dat')
+        for content, message in [(b'', 'is empty'), (b'ID   1.1.1.2\n//\nID   not a code\n//\n', 'invalid EC code')]:
+            with open(path, 'wb') as file:
+                file.write(content)
+
+            opened = []
+
+            def _open(*args, **kwargs):
+                opened.append(open(*args, **kwargs))
+                return opened[-1]
+
+            with self.subTest(content=content), mock.patch('bio2bel_expasy.parser.index.open', _open, create=True):
+                with self.assertRaisesRegex(ValueError, message):
+                    ExpasyFile(path=path, index_path=os.path.join(self.directory, 'invalid.index'))
+                self.assertEqual(1, len(opened))
+                self.assertTrue(opened[0].closed)
+
+    def test_missing_terminator(self):
+        """Test that a record without a ``//`` line ends where the next record starts."""
+        buffer = b'CC   header\n//\nID   1.1.1.1\nDE   One.\nID   1.1.1.3\nDE   Three.\n//\n'
+        index = build_expasy_index(buffer)
+        self.assertEqual(b'ID   1.1.1.1\nDE   One.\n', buffer[slice(*index['1.1.1.1'])])
+        self.assertEqual(b'ID   1.1.1.3\nDE   Three.\n//\n', buffer[slice(*index['1.1.1.3'])])
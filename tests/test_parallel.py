@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for enriching many graphs at once."""
+
+import pickle
+
+from pybel import BELGraph
+
+from bio2bel_expasy.enrich import enrich_graphs
+from tests.constants import PopulatedDatabaseMixin
+from tests.test_enrich import expasy, test_class, test_enzyme, test_protein_a, test_subsubclass, uniprot
+
+
+def _make_graphs():
+    nodes = [
+        [test_class],
+        [test_subsubclass, test_protein_a],
+        [test_enzyme],
+        [expasy(name='2.1.3.-'), uniprot(identifier='P00000')],
+        [],
+    ]
+    graphs = []
+    for graph_nodes in nodes:
+        graph = BELGraph()
+        for node in graph_nodes:
+            graph.add_node_from_data(node)
+        graphs.append(graph)
+    return graphs
+
+
+def _contents(graph):
+    return list(graph.nodes(data=True)), list(graph.edges(keys=True, data=True))
+
+
+class TestEnrichGraphs(PopulatedDatabaseMixin):
+    """Tests that enriching graphs in parallel gives the same graphs as enriching them serially."""
+
+    def test_parallel(self):
+        """Test enriching in worker processes with a snapshot, against the manager enriching one graph at a time."""
+        expected = _make_graphs()
+        for graph in expected:
+            self.manager.enrich_enzymes(graph)
+
+        for workers in [None, 1, 2]:
+            with self.subTest(workers=workers):
+                graphs = _make_graphs()
+                report = enrich_graphs(graphs, manager=self.manager, workers=workers)
+                for graph, expected_graph in zip(graphs, expected):
+                    self.assertEqual(_contents(expected_graph), _contents(graph))
+
+                self.assertEqual(5, report.graphs)
+                self.assertEqual(6, report.nodes)
+                self.assertEqual(sum(graph.number_of_edges() for graph in expected), report.edges)
+                self.assertLess(0, report.nodes_per_second)
+
+    def test_snapshot(self):
+        """Test that a snapshot can be sent to a worker process, and enriches graphs the same way."""
+        snapshot = pickle.loads(pickle.dumps(self.manager.snapshot()))
+        graphs, expected = _make_graphs(), _make_graphs()
+        snapshot.enrich_graphs(graphs, workers=2)
+        self.manager.enrich_graphs(expected)
+        self.assertEqual([_contents(graph) for graph in expected], [_contents(graph) for graph in graphs])
+
+    def test_views(self):
+        """Test that the views and attributes of a graph enriched in parallel follow its new contents."""
+        graphs = _make_graphs()
+        graph = graphs[0]
+        graph.graph['name'] = 'test'
+        nodes, edges, pred, degree = graph.nodes, graph.edges, graph.pred, graph.degree  # taken before enriching
+
+        self.manager.enrich_graphs(graphs, workers=2)
+        self.assertEqual('test', graph.graph['name'])
+        self.assertIn(test_enzyme, nodes)
+        self.assertEqual(graph.number_of_edges(), len(edges))
+
+        node = graph.add_node_from_data(uniprot(identifier='P99999'))
+        graph.add_is_a(node, test_class)
+        for view in [nodes, graph.nodes]:
+            self.assertIn(node, view)
+        for view in [edges, graph.edges]:
+            self.assertIn((node, test_class), view())
+        for view in [pred, graph.pred]:
+            self.assertIn(node, view[test_class])
+        self.assertEqual(1, degree[node])
+        self.assertEqual(1, len(graph.adj[node][test_class]))
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the read cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.read_cache import EnzymeRecord, LRUCache, ProteinRecord
+from bio2bel_expasy.utils import count_statements
+from tests.constants import DATABASE_TEST_FILE, PopulatedDatabaseMixin, TREE_TEST_FILE
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get_or_load('a', None))
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(1, cache.info().evictions)
+
+    def test_counters(self):
+        """Test that hits and misses are counted, including for cached None results."""
+        cache = LRUCache()
+        loads = []
+
+        def load(key):
+            loads.append(key)
+
+        self.assertIsNone(cache.get_or_load('a', load))
+        self.assertIsNone(cache.get_or_load('a', load))
+        self.assertEqual(['a'], loads)
+        self.assertEqual((1, 1, 0, 1), cache.info()[:4])
+
+    def test_many(self):
+        """Test that the misses are loaded at once, and that keys left out by the loader are cached as None."""
+        cache = LRUCache()
+        cache.put('a', 1)
+        loads = []
+
+        def load_many(keys):
+            loads.append(keys)
+            return {'b': 2}
+
+        self.assertEqual({'a': 1, 'b': 2, 'c': None}, cache.get_or_load_many(['a', 'b', 'c', 'b'], load_many))
+        self.assertEqual([['b', 'c']], loads)
+        self.assertEqual({'b': 2, 'c': None}, cache.get_or_load_many(['b', 'c'], load_many))
+        self.assertEqual(1, len(loads))
+
+    def test_ttl(self):
+        """Test that entries expire after their time to live."""
+        timer = FakeTimer()
+        cache = LRUCache(ttl=10, timer=timer)
+        cache.put('a', 1)
+
+        timer.now = 9
+        self.assertIn('a', cache)
+        timer.now = 10
+        self.assertNotIn('a', cache)
+        self.assertEqual(2, cache.get_or_load('a', lambda key: 2))
+
+    def test_disabled(self):
+        """Test that a cache of size zero never holds anything."""
+        cache = LRUCache(maxsize=0)
+        cache.put('a', 1)
+        self.assertEqual(0, len(cache))
+
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=-1)
+
+
+class TestManagerReadCache(PopulatedDatabaseMixin):
+    def setUp(self):
+        self.manager.read_cache.clear()
+
+    def test_enzyme_record(self):
+        """Test that an enzyme record is copied from the database."""
+        record = self.manager.get_enzyme_record('1.1.1.2')
+        self.assertIsInstance(record, EnzymeRecord)
+        self.assertEqual('1.1.1.2', record.expasy_id)
+        self.assertEqual('Alcohol dehydrogenase (NADP(+))', record.description)
+        self.assertEqual('1.1.1.-', record.parent_id)
+        self.assertEqual(self.manager.get_enzyme_by_id('1.1.1.2').as_bel(), record.as_bel())
+
+        self.assertIsNone(self.manager.get_enzyme_record('1.1.1.999'))
+        self.assertIsNone(self.manager.get_enzyme_record('not an EC code'))
+
+    def test_protein_record(self):
+        """Test that a protein record holds the identifiers of its enzymes."""
+        record = self.manager.get_protein_record('Q6AZW2')
+        self.assertIsInstance(record, ProteinRecord)
+        self.assertEqual('A1A1A_DANRE', record.entry_name)
+        self.assertEqual(('1.1.1.2',), record.expasy_ids)
+
+        record = self.manager.get_prosite_record('PDOC00061')
+        self.assertIn('1.1.1.2', record.expasy_ids)
+
+    def test_protein_records(self):
+        """Test that looking up many protein records agrees with looking them up one at a time."""
+        uniprot_ids = ['Q6AZW2', 'Q568L5', 'P75691', 'P00000']
+        records = self.manager.get_protein_records(uniprot_ids)
+        self.assertEqual({'Q6AZW2', 'Q568L5', 'P75691'}, set(records))
+
+        self.manager.read_cache.clear()
+        for uniprot_id, record in records.items():
+            self.assertEqual(self.manager.get_protein_record(uniprot_id), record)
+
+    def test_hits(self):
+        """Test that repeated lookups, including of unknown identifiers, don't query the database."""
+        before = self.manager.cache_info()
+        for _ in range(2):
+            self.manager.get_enzyme_record('1.1.1.2')
+            self.manager.get_protein_record('Q6AZW2')
+            self.manager.get_protein_record('P00000')
+
+        info = self.manager.cache_info()
+        self.assertEqual(3, info.hits - before.hits)
+        self.assertEqual(3, info.misses - before.misses)
+
+        self.manager.session.close()
+        with count_statements(self.manager.engine) as counter:
+            record = self.manager.get_enzyme_record('1.1.1.2')
+            self.assertIsNone(self.manager.get_protein_record('P00000'))
+        self.assertEqual(0, counter.count)
+        self.assertEqual('1.1.1.-', record.parent_id, msg='records should stay usable after the session closes')
+
+
+class TestInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.manager = Manager(connection='sqlite://')
+        self.manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_update(self):
+        """Test that an update clears the cached records."""
+        self.assertEqual(('1.1.1.2',), self.manager.get_protein_record('Q6AZW2').expasy_ids)
+        self.assertIsNone(self.manager.get_enzyme_record('1.1.1.3'))
+
+        database_path = os.path.join(self.directory, 'enzyme.dat')
+        with open(DATABASE_TEST_FILE) as source, open(database_path, 'w') as file:
+            file.write(source.read())
+            file.write('ID   1.1.1.3\nDE   New enzyme.\nDR   Q6AZW2, A1A1A_DANRE;\n//\n')
+        self.manager.update(tree_path=TREE_TEST_FILE, database_path=database_path)
+
+        self.assertEqual('New enzyme', self.manager.get_enzyme_record('1.1.1.3').description)
+        self.assertEqual(('1.1.1.2', '1.1.1.3'), self.manager.get_protein_record('Q6AZW2').expasy_ids)
+
+    def test_drop(self):
+        """Test that dropping the database clears the cached records."""
+        self.assertIsNotNone(self.manager.get_enzyme_record('1.1.1.2'))
+        self.manager.drop_all()
+        self.assertEqual(0, len(self.manager.read_cache))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the synonyms and the full-text search over enzymes."""
+
+import unittest
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Synonym
+from bio2bel_expasy.search import drop_search_index
+from tests.constants import DATABASE_TEST_FILE, PopulatedDatabaseMixin, TREE_TEST_FILE, WRAPPED_DATABASE_TEST_FILE
+
+
+def _ids(enzymes):
+    return [enzyme.expasy_id for enzyme in enzymes]
+
+
+class TestSynonyms(unittest.TestCase):
+    """Tests that every loader stores the synonyms and builds the search index."""
+
+    def test_loaders(self):
+        """Test the bulk loaders, the models, and loading in batches."""
+        for kwargs in [dict(bulk=True), dict(bulk=False), dict(batch_size=2)]:
+            with self.subTest(**kwargs):
+                manager = Manager(connection='sqlite://')
+                manager.populate_tree(path=TREE_TEST_FILE, **kwargs)
+                manager.populate_database(path=DATABASE_TEST_FILE, **kwargs)
+
+                enzyme = manager.get_enzyme_by_id('1.1.1.2')
+                self.assertEqual(['Aldehyde reductase (NADPH)'], [synonym.name for synonym in enzyme.synonyms])
+                self.assertEqual(1, manager.session.query(Synonym).count())
+                self.assertEqual([enzyme], manager.search_enzymes('aldehyde reductase'))
+
+    def test_wrapped(self):
+        """Test that synonyms wrapped onto several lines are stored and searched whole."""
+        manager = Manager(connection='sqlite://')
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=WRAPPED_DATABASE_TEST_FILE)
+
+        enzyme = manager.get_enzyme_by_id('1.1.1.300')
+        self.assertEqual(
+            ['RDH11', 'Retinol dehydrogenase (NADP-dependent, all-trans-retinal forming)'],
+            sorted(synonym.name for synonym in enzyme.synonyms),
+        )
+        self.assertEqual([enzyme], manager.search_enzymes('all-trans-retinal forming'))
+
+    def test_unpopulated(self):
+        """Test searching before a release is loaded, or one loaded before the index existed."""
+        manager = Manager(connection='sqlite://')
+        manager.create_all()
+        self.assertEqual([], manager.search_enzymes('alcohol'))
+
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        with manager.engine.begin() as connection:
+            drop_search_index(connection)
+        manager._search_indexed = False
+        self.assertEqual(['1.1.1.2'], _ids(manager.search_enzymes('Aldehyde reductase')))
+
+    def test_loading_again(self):
+        """Test that loading the same release again with the models doesn't duplicate synonyms."""
+        manager = Manager(connection='sqlite://')
+        manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        manager.populate_database(path=DATABASE_TEST_FILE, bulk=False)
+        self.assertEqual(1, manager.session.query(Synonym).count())
+
+
+class TestSearch(PopulatedDatabaseMixin):
+    """Tests for searching enzymes by their names and synonyms."""
+
+    def test_names(self):
+        """Test matching names, with stemming and in any order."""
+        self.assertEqual(['1.-.-.-'], _ids(self.manager.search_enzymes('oxidoreductase')))
+        self.assertEqual(['1.1.1.2'], _ids(self.manager.search_enzymes('Dehydrogenases, alcohol')))
+
+    def test_synonyms(self):
+        """Test matching synonyms."""
+        self.assertEqual(['1.1.1.2'], _ids(self.manager.search_enzymes('aldehyde reductase')))
+
+    def test_ranking(self):
+        """Test that enzymes with the words in their names come first, and that the limit is kept."""
+        enzymes = _ids(self.manager.search_enzymes('acceptor', limit=100))
+        self.assertLess(10, len(enzymes))
+        self.assertEqual(enzymes[:3], _ids(self.manager.search_enzymes('acceptor', limit=3)))
+
+        enzymes = _ids(self.manager.search_enzymes('aldehyde'))
+        self.assertEqual('1.1.1.2', enzymes[-1], msg='names should rank above synonyms')
+
+    def test_no_matches(self):
+        """Test text without matches, and that punctuation and search syntax are ignored."""
+        for text in ['nothing like this', '', '()*"', 'NEAR(alcohol']:
+            with self.subTest(text=text):
+                self.assertEqual([], self.manager.search_enzymes(text))
+
+        self.assertEqual(['2.1.3.-'], _ids(self.manager.search_enzymes('carboxy AND')), msg='AND is not an operator')
+
+    def test_fallback(self):
+        """Test the substring match used when the database has no full-text search."""
+        self.manager._search_supported = False
+        try:
+            self.assertEqual(['1.1.1.2'], _ids(self.manager.search_enzymes('Aldehyde reductase')))
+            self.assertEqual(['1.-.-.-'], _ids(self.manager.search_enzymes('oxidoreductase')))
+            for text in ['Aldehyde_reductase', 'Aldehyde%reductase', 'Aldehyde\\%reductase']:
+                with self.subTest(text=text):
+                    self.assertEqual([], self.manager.search_enzymes(text), msg='wildcards should match themselves')
+        finally:
+            self.manager._search_supported = None
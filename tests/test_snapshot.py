@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the in-memory snapshot."""
+
+from pybel import BELGraph
+
+from bio2bel_expasy.utils import count_statements
+from tests.constants import PopulatedDatabaseMixin
+from tests.test_enrich import test_class, test_enzyme, test_protein_a, test_protein_b, test_subsubclass
+
+EXPASY_IDS = ['1.-.-.-', '1.1.-.-', '1.1.1.-', '1.1.1.2', '1. 1. 1.2', '1.1.1.999', 'nope']
+UNIPROT_IDS = ['Q6AZW2', 'Q568L5', 'P75691', 'P00000']
+PROSITE_IDS = ['PDOC00061', 'PDOC99999']
+
+
+def _ids(instances):
+    if instances is None:
+        return
+    return [str(instance) for instance in instances]
+
+
+def _edges(graph):
+    return {(u, v) for u, v in graph.edges()}
+
+
+class TestSnapshot(PopulatedDatabaseMixin):
+    @classmethod
+    def populate(cls):
+        super().populate()
+        cls.snapshot = cls.manager.snapshot()
+
+    def test_summary(self):
+        self.assertEqual(self.manager.summarize(), self.snapshot.summarize())
+
+    def test_enzymes(self):
+        """Test that the enzyme lookups agree with the manager."""
+        for expasy_id in EXPASY_IDS:
+            with self.subTest(expasy_id=expasy_id):
+                for name in [
+                    'get_children_by_expasy_id',
+                    'get_descendants_by_expasy_id',
+                    'get_proteins_under_class',
+                    'get_prosites_by_expasy_id',
+                    'get_proteins_by_expasy_id',
+                ]:
+                    self.assertEqual(
+                        _ids(getattr(self.manager, name)(expasy_id)),
+                        _ids(getattr(self.snapshot, name)(expasy_id)),
+                        msg=name,
+                    )
+
+                enzyme = self.manager.get_enzyme_by_id(expasy_id)
+                record = self.snapshot.get_enzyme_by_id(expasy_id)
+                if enzyme is None:
+                    self.assertIsNone(record)
+                else:
+                    self.assertEqual(str(enzyme), str(record))
+                    self.assertEqual(str(self.manager.get_parent_by_expasy_id(expasy_id)),
+                                     str(self.snapshot.get_parent_by_expasy_id(expasy_id)))
+
+    def test_proteins_and_prosites(self):
+        """Test that the protein and ProSite lookups agree with the manager."""
+        for uniprot_id in UNIPROT_IDS:
+            with self.subTest(uniprot_id=uniprot_id):
+                self.assertEqual(self.manager.get_protein_record(uniprot_id),
+                                 self.snapshot.get_protein_by_uniprot_id(uniprot_id))
+                self.assertEqual(_ids(self.manager.get_enzymes_by_uniprot_id(uniprot_id)),
+                                 _ids(self.snapshot.get_enzymes_by_uniprot_id(uniprot_id)))
+
+        for prosite_id in PROSITE_IDS:
+            with self.subTest(prosite_id=prosite_id):
+                self.assertEqual(self.manager.get_prosite_record(prosite_id),
+                                 self.snapshot.get_prosite_by_id(prosite_id))
+                self.assertEqual(_ids(self.manager.get_enzymes_by_prosite_id(prosite_id)),
+                                 _ids(self.snapshot.get_enzymes_by_prosite_id(prosite_id)))
+
+        self.assertEqual(
+            {key: _ids(value) for key, value in self.manager.get_enzymes_by_uniprot_ids(UNIPROT_IDS).items()},
+            {key: _ids(value) for key, value in self.snapshot.get_enzymes_by_uniprot_ids(UNIPROT_IDS).items()},
+        )
+
+    def test_enrich(self):
+        """Test that the enrichment methods add the same edges as the manager, without any statements."""
+        for name in ['enrich_enzymes', 'enrich_enzymes_with_prosites', 'enrich_proteins_with_enzyme_families']:
+            with self.subTest(name=name):
+                manager_graph, snapshot_graph = BELGraph(), BELGraph()
+                for graph in manager_graph, snapshot_graph:
+                    for node in [test_class, test_subsubclass, test_enzyme, test_protein_a, test_protein_b]:
+                        graph.add_node_from_data(node)
+
+                getattr(self.manager, name)(manager_graph)
+                with count_statements(self.manager.engine) as counter:
+                    getattr(self.snapshot, name)(snapshot_graph)
+
+                self.assertEqual(0, counter.count)
+                self.assertTrue(_edges(snapshot_graph))
+                self.assertEqual(_edges(manager_graph), _edges(snapshot_graph))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.snapshot.expasy_ids = ()
+        with self.assertRaises(AttributeError):
+            self.snapshot.new_attribute = 1
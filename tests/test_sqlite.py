@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the SQLite bulk-load profile."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.bulk import TABLES
+from bio2bel_expasy.models import Enzyme
+from bio2bel_expasy.sqlite import bulk_load_profile
+from tests.constants import DATABASE_TEST_FILE, TREE_TEST_FILE
+
+
+class TestSqliteProfile(unittest.TestCase):
+    """Tests for loading with the SQLite bulk-load profile."""
+
+    def setUp(self):
+        """Make an empty SQLite database in a file."""
+        self.directory = tempfile.mkdtemp()
+        self.manager = Manager(connection=f'sqlite:///{os.path.join(self.directory, "test.db")}')
+
+    def tearDown(self):
+        """Remove the database."""
+        self.manager.session.close()
+        shutil.rmtree(self.directory)
+
+    def get_indexes(self):
+        """Get the names of the indexes in the database."""
+        return {
+            name
+            for name, in self.manager.session.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+
+    def get_pragmas(self):
+        """Get the settings that the profile changes."""
+        return {
+            name: self.manager.session.execute(f'PRAGMA {name}').scalar()
+            for name in ('journal_mode', 'synchronous', 'temp_store')
+        }
+
+    def test_opt_in(self):
+        """Test that populating doesn't use the profile unless asked to."""
+        with mock.patch('bio2bel_expasy.manager.bulk_load_profile') as profile:
+            self.manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE)
+        profile.assert_not_called()
+
+    def test_profile(self):
+        """Test that the profile gives the same content as loading without it, with the indexes in place."""
+        expected_manager = Manager(connection='sqlite://')
+        expected_manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE, sqlite_profile=False)
+
+        pragmas = self.get_pragmas()
+        self.manager.populate(tree_path=TREE_TEST_FILE, database_path=DATABASE_TEST_FILE, sqlite_profile=True)
+
+        self.assertEqual(expected_manager.summarize(), self.manager.summarize())
+        self.assertEqual(expected_manager._get_loaded_state().proteins, self.manager._get_loaded_state().proteins)
+        self.assertLessEqual({index.name for table in TABLES for index in table.indexes}, self.get_indexes())
+        self.assertEqual(pragmas, self.get_pragmas())
+        self.assertEqual({'test.db'}, set(os.listdir(self.directory)), msg='the journal should not be left in WAL')
+        self.assertLess(0, self.manager.session.execute('SELECT COUNT(*) FROM sqlite_stat1').scalar())
+
+    def test_rollback(self):
+        """Test that a failed load is rolled back along with the dropped indexes."""
+        indexes, pragmas = self.get_indexes(), self.get_pragmas()
+        with self.assertRaises(RuntimeError):
+            with bulk_load_profile(self.manager.session, TABLES):
+                row = {'id': 1, 'expasy_id': '1.-.-.-', **Enzyme.get_number_columns('1.-.-.-')}
+                self.manager.session.execute(Enzyme.__table__.insert(), [row])
+                self.assertNotIn('ix_ec-code_enzyme_expasy_id', self.get_indexes())
+                raise RuntimeError
+
+        self.assertEqual(0, self.manager.count_enzymes())
+        self.assertEqual(indexes, self.get_indexes())
+        self.assertEqual(pragmas, self.get_pragmas())
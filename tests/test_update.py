@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for incremental updates between releases."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pybel import BELGraph
+from sqlalchemy.orm import aliased
+
+from bio2bel_expasy import Manager
+from bio2bel_expasy.models import Enzyme, enzyme_closure
+from tests.constants import DATABASE_TEST_FILE, TREE_TEST_FILE, TemporaryCacheClsMixin
+from tests.test_read_cache import FakeTimer
+
+EXTRA_ENTRY = """ID   1.2.1.1
+DE   Old enzyme.
+DR   Q6AZW2, A1A1A_DANRE;  P99999, OLD_HUMAN  ;
+//
+"""
+
+TRANSFERRED_ENTRY = """ID   1.2.1.1
+DE   Transferred entry: 1.1.1.3.
+//
+"""
+
+NEW_ENTRY = """ID   1.1.1.3
+DE   New enzyme.
+AN   Newer enzyme.
+PR   PROSITE; PDOC00099;
+DR   Q04894, ADH6_YEAST ;  P88888, NEW_HUMAN  ;
+//
+"""
+
+
+def _get_closure(manager):
+    ancestor, descendant = aliased(Enzyme), aliased(Enzyme)
+    query = manager.session.query(ancestor.expasy_id, descendant.expasy_id, enzyme_closure.c.depth) \
+        .join(enzyme_closure, enzyme_closure.c.ancestor_id == ancestor.id) \
+        .join(descendant, enzyme_closure.c.descendant_id == descendant.id)
+    return set(query)
+
+
+def _write(path, text):
+    with open(path, 'w') as file:
+        file.write(text)
+
+
+def _write_releases(directory):
+    """Write an old release, with an extra entry, and a new one, in which it is transferred and others change."""
+    with open(TREE_TEST_FILE) as file:
+        tree = file.read()
+    with open(DATABASE_TEST_FILE) as file:
+        database = file.read()
+
+    old_tree_path = os.path.join(directory, 'old_enzclass.txt')
+    old_database_path = os.path.join(directory, 'old_enzyme.dat')
+    _write(old_tree_path, tree)
+    _write(old_database_path, database + EXTRA_ENTRY)
+
+    new_tree_path = os.path.join(directory, 'new_enzclass.txt')
+    new_database_path = os.path.join(directory, 'new_enzyme.dat')
+    _write(new_tree_path, tree.replace(
+        '1. 2. 7.-    With an iron-sulfur protein as acceptor.\n',
+        '',
+    ).replace(
+        '1. 2.99.-    With other acceptors.\n',
+        '1. 2.99.-    With other acceptors.\n1. 3. -.-   Acting on the CH-CH group of donors.\n',
+    ))
+    _write(new_database_path, database.replace(
+        'DE   Alcohol dehydrogenase (NADP(+)).',
+        'DE   Alcohol dehydrogenase (NADP(+)), renamed.',
+    ).replace(
+        'AN   Aldehyde reductase (NADPH).',
+        'AN   Aldehyde reductase (NADPH), renamed.',
+    ).replace(
+        'Q568L5, A1A1B_DANRE;',
+        'Q568L5, A1A1C_DANRE;',
+    ).replace(
+        'P75691, YAHK_ECOLI ;',
+        'P77777, NEW_ECOLI  ;',
+    ) + TRANSFERRED_ENTRY + NEW_ENTRY)
+    return old_tree_path, old_database_path, new_tree_path, new_database_path
+
+
+class TestUpdate(TemporaryCacheClsMixin):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+
+        old_tree_path, old_database_path, cls.new_tree_path, cls.new_database_path = _write_releases(cls.directory)
+
+        cls.manager.populate(tree_path=old_tree_path, database_path=old_database_path)
+        cls.delta = cls.manager.update(tree_path=cls.new_tree_path, database_path=cls.new_database_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+        super().tearDownClass()
+
+    def test_delta(self):
+        """Test that the changes are reported."""
+        self.assertEqual(['1.1.1.3', '1.3.-.-'], self.delta['added'])
+        self.assertEqual(['1.2.7.-'], self.delta['deleted'])
+        self.assertEqual(['1.2.1.1'], self.delta['transferred'])
+        self.assertEqual(['1.1.1.2'], self.delta['descriptions'])
+        self.assertEqual(['1.1.1.2'], self.delta['synonyms'])
+        self.assertEqual([], self.delta['prosites'])
+        self.assertEqual(['1.1.1.2'], self.delta['proteins'])
+
+    def test_applied(self):
+        """Test that the changes were written."""
+        self.assertIsNone(self.manager.get_enzyme_by_id('1.2.1.1'))
+        self.assertIsNone(self.manager.get_enzyme_by_id('1.2.7.-'))
+        self.assertIsNone(self.manager.get_protein_by_uniprot_id('P99999'), msg='orphan protein was not removed')
+        self.assertIsNone(self.manager.get_protein_by_uniprot_id('P75691'), msg='orphan protein was not removed')
+
+        enzyme = self.manager.get_enzyme_by_id('1.1.1.3')
+        self.assertEqual('New enzyme', enzyme.description)
+        self.assertEqual('1.1.1.-', enzyme.parent.expasy_id)
+        self.assertEqual(['PDOC00099'], [prosite.prosite_id for prosite in enzyme.prosites])
+        self.assertEqual(['Newer enzyme'], [synonym.name for synonym in enzyme.synonyms])
+        self.assertEqual([enzyme], self.manager.search_enzymes('newer'), msg='search index was not rebuilt')
+
+        enzyme = self.manager.get_enzyme_by_id('1.1.1.2')
+        self.assertEqual('Alcohol dehydrogenase (NADP(+)), renamed', enzyme.description)
+        self.assertEqual('A1A1C_DANRE', self.manager.get_protein_by_uniprot_id('Q568L5').entry_name)
+
+        enzyme = self.manager.get_enzyme_by_id('1.3.-.-')
+        self.assertEqual('1.-.-.-', enzyme.parent.expasy_id)
+
+    def test_matches_fresh_populate(self):
+        """Test that the updated database has the same content as one populated from scratch with the new release."""
+        fresh_manager = Manager(connection='sqlite://')
+        fresh_manager.populate(tree_path=self.new_tree_path, database_path=self.new_database_path)
+
+        expected = fresh_manager._get_loaded_state()
+        actual = self.manager._get_loaded_state()
+        self.assertEqual(expected.descriptions, actual.descriptions)
+        self.assertEqual(expected.prosites, actual.prosites)
+        self.assertEqual(expected.proteins, actual.proteins)
+        self.assertEqual(expected.synonyms, actual.synonyms)
+        self.assertEqual(fresh_manager.summarize(), self.manager.summarize())
+        self.assertEqual(_get_closure(fresh_manager), _get_closure(self.manager))
+
+    def test_noop(self):
+        """Test that updating to the loaded release changes nothing."""
+        delta = self.manager.update(tree_path=self.new_tree_path, database_path=self.new_database_path)
+        self.assertFalse(any(delta.values()))
+
+
+class TestServingManager(unittest.TestCase):
+    """Tests a manager that serves lookups while another one updates the same database."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        old_tree_path, old_database_path, self.new_tree_path, self.new_database_path = _write_releases(self.directory)
+        connection = f'sqlite:///{os.path.join(self.directory, "expasy.db")}'
+
+        self.writer = Manager(connection=connection)
+        self.writer.populate(tree_path=old_tree_path, database_path=old_database_path)
+
+        self.timer = FakeTimer()
+        self.server = Manager(connection=connection, cache_ttl=10)
+        self.server.read_cache.timer = self.timer
+
+    def tearDown(self):
+        self.writer.session.close()
+        self.server.session.close()
+        shutil.rmtree(self.directory)
+
+    def test_hierarchy_expires(self):
+        """Test that the index follows another manager's update once it expires, and that it's safe until then."""
+        self.assertIn('1.2.1.1', self.server.get_hierarchy())
+        self.writer.update(tree_path=self.new_tree_path, database_path=self.new_database_path)
+        self.server.session.rollback()  # end the read transaction, as a request would
+
+        graph = BELGraph()
+        node = graph.add_node_from_data(Enzyme.bel_from_expasy_id('1.2.1.1'))
+        self.server.enrich_enzyme_with_proteins(graph, node)
+        self.assertEqual(0, graph.number_of_edges(), msg='the deleted enzyme should have no proteins')
+
+        self.timer.now = 10
+        self.assertNotIn('1.2.1.1', self.server.get_hierarchy())
+        self.server.enrich_enzymes(graph)
+        self.assertEqual(0, graph.number_of_edges(), msg='the deleted enzyme should have no parents')
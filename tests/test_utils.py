@@ -2,7 +2,10 @@
 
 import unittest
 
+from sqlalchemy import create_engine
+
 from bio2bel_expasy.parser.tree import normalize_expasy_id
+from bio2bel_expasy.utils import StatementCounter, count_statements, get_loader_options
 
 
 class TestCanonicalize(unittest.TestCase):
@@ -20,3 +23,32 @@ class TestCanonicalize(unittest.TestCase):
 
     def test_class(self):
         self.assertEqual('1.-.-.-', normalize_expasy_id('1. -. -.-'))
+
+
+class TestStatementCounter(unittest.TestCase):
+    def test_count(self):
+        engine = create_engine('sqlite://')
+        counter = StatementCounter(engine)
+        engine.execute('CREATE TABLE t (x INTEGER)')
+        engine.execute('INSERT INTO t (x) VALUES (?)', [(1,), (2,), (3,)])
+
+        with count_statements(engine) as inner:
+            engine.execute('SELECT x FROM t')
+        engine.execute('SELECT x FROM t')
+
+        self.assertEqual({'create': 1, 'insert': 1, 'select': 2}, dict(counter.counts))
+        self.assertEqual(4, counter.count)
+        self.assertEqual({'select': 1}, dict(inner.counts), msg='the inner counter should stop when its context ends')
+
+        counter.reset()
+        self.assertEqual(0, counter.count)
+
+
+class TestLoaderOptions(unittest.TestCase):
+    def test_strategies(self):
+        from bio2bel_expasy.models import Enzyme
+
+        self.assertEqual([], get_loader_options(None, Enzyme.proteins))
+        self.assertEqual(2, len(get_loader_options('joined', Enzyme.parent, Enzyme.proteins)))
+        with self.assertRaises(ValueError):
+            get_loader_options('subquery', Enzyme.proteins)